@@ -0,0 +1,64 @@
+import os, sys, argparse
+
+# the app imports its packages (monitor, ui, utils) as top-level modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="SpartaMonitor", description="Sparta system monitor")
+    parser.add_argument("--headless", action="store_true",
+                        help="run the collectors without a window and print JSON snapshots")
+    parser.add_argument("--interval", type=float,
+                        help="base seconds between snapshots (default: refresh_rate in config.json)")
+    parser.add_argument("--output", help="append snapshots to this file instead of stdout")
+    parser.add_argument("--count", type=int, help="stop after this many snapshots")
+    parser.add_argument("--exporter", metavar="[HOST:]PORT",
+                        help="serve OpenMetrics on this address (overrides config.json)")
+    parser.add_argument("--history", metavar="SERIES",
+                        help="print stored history for a series (e.g. cpu.percent) and exit")
+    parser.add_argument("--since", default="1h", help="history window, e.g. 30m, 24h, 7d")
+    parser.add_argument("--agent", metavar="HOST:PORT",
+                        help="run headless and stream snapshots to an aggregator (or unix:/path)")
+    parser.add_argument("--hostname", help="name this agent reports (default: the machine's hostname)")
+    parser.add_argument("--aggregate", metavar="[HOST:]PORT",
+                        help="accept agents on this address and add them to the dashboard; a bare port "
+                             "is loopback only (or unix:/path)")
+    parser.add_argument("--record", metavar="FILE",
+                        help="also record every snapshot to this compressed file for later replay")
+    parser.add_argument("--replay", metavar="FILE",
+                        help="feed a recording to the window (or --headless) instead of live sampling")
+    parser.add_argument("--speed", default="1", help="replay speed: 1, 10, ... or max (default: 1)")
+    parser.add_argument("--replay-from", metavar="OFFSET",
+                        help="start the replay this far into the recording, e.g. 90s, 15m")
+    args = parser.parse_args(argv)
+
+    from utils.config import load_config, parse_duration
+    config = load_config()
+    if args.exporter:
+        host, _, port = args.exporter.rpartition(":")
+        config["exporter"] = {"enabled": True, "host": host or "127.0.0.1", "port": int(port)}
+    if args.record:
+        config["recording"] = dict(config.get("recording", {}), path=args.record)
+    if args.replay:
+        config["replay"] = dict(config.get("replay", {}), path=args.replay, speed=args.speed)
+        if args.replay_from:
+            config["replay"]["from"] = args.replay_from
+    if args.aggregate:
+        config["fleet"] = dict(config.get("fleet", {}), listen=args.aggregate)
+
+    if args.history:
+        from headless import print_history
+        print_history(args.history, parse_duration(args.since), config)
+    elif args.agent:
+        from headless import agent
+        agent(args.agent, interval=args.interval, hostname=args.hostname, config=config)
+    elif args.headless:
+        from headless import run
+        run(interval=args.interval, output=args.output, count=args.count, config=config)
+    else:
+        from main import SpartaMonitorApp
+        SpartaMonitorApp(config, interval=args.interval).mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# Per-tick render cost of a page chart: full redraw (the old draw_idle path)
+# versus LiveChart's cached-background blit, plus the GPU small-multiples chart
+# at growing device counts, and the per-core CPU heatmap at growing core
+# counts. Runs on Agg, no display needed.
+#
+#   python bench/bench_chart.py [ticks]
+import os, sys, time, random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+import numpy as np
+
+from ui._matplot_widget import LiveChart, SmallMultiplesChart, HeatmapChart
+
+N_POINTS = 120
+
+
+def _data():
+    return [random.uniform(0, 100) for _ in range(N_POINTS)], [random.uniform(0, 100) for _ in range(N_POINTS)]
+
+
+def bench_full(ticks):
+    chart = LiveChart(N_POINTS, series=("read", "write"))
+    for line in chart.lines:
+        line.set_animated(False)
+    canvas = FigureCanvasAgg(chart.fig)
+    canvas.draw()
+    start = time.perf_counter()
+    for _ in range(ticks):
+        for line, y in zip(chart.lines, _data()):
+            line.set_ydata(y)
+        canvas.draw()
+    return (time.perf_counter() - start) / ticks
+
+
+def bench_blit(ticks):
+    chart = LiveChart(N_POINTS, series=("read", "write"))
+    chart.bind(FigureCanvasAgg(chart.fig))
+    start = time.perf_counter()
+    for _ in range(ticks):
+        chart.update(*_data())
+    return (time.perf_counter() - start) / ticks
+
+
+def _walk(rng, n_devices):
+    # random walk, closer to real utilisation traces than white noise
+    return np.clip(50 + np.cumsum(rng.normal(0, 3, (n_devices, N_POINTS)), axis=1), 0, 100)
+
+
+def bench_small_multiples(ticks, n_devices):
+    chart = SmallMultiplesChart(n_devices, N_POINTS, metrics=("load", "mem", "temp"))
+    chart.bind(FigureCanvasAgg(chart.fig))
+    rng = np.random.default_rng(0)
+    data = [[_walk(rng, n_devices) for _ in range(3)] for _ in range(8)]
+    start = time.perf_counter()
+    for i in range(ticks):
+        chart.update(*data[i % len(data)])
+    return (time.perf_counter() - start) / ticks
+
+
+def bench_chart_per_device(ticks, n_devices):
+    # the alternative: one blitting chart per device
+    charts = []
+    for _ in range(n_devices):
+        chart = LiveChart(N_POINTS, series=("load", "mem", "temp"), height=3.2 / max(1, n_devices // 4))
+        chart.bind(FigureCanvasAgg(chart.fig))
+        charts.append(chart)
+    rng = np.random.default_rng(0)
+    data = [[_walk(rng, n_devices) for _ in range(3)] for _ in range(8)]
+    start = time.perf_counter()
+    for i in range(ticks):
+        load, mem, temp = data[i % len(data)]
+        for d, chart in enumerate(charts):
+            chart.update(load[d], mem[d], temp[d])
+    return (time.perf_counter() - start) / ticks
+
+
+def bench_heatmap(ticks, n_cores):
+    chart = HeatmapChart(n_cores, N_POINTS)
+    chart.bind(FigureCanvasAgg(chart.fig))
+    rng = np.random.default_rng(0)
+    data = [_walk(rng, n_cores) for _ in range(8)]
+    start = time.perf_counter()
+    for i in range(ticks):
+        chart.update(data[i % len(data)])
+    return (time.perf_counter() - start) / ticks
+
+
+if __name__ == "__main__":
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    full = bench_full(ticks)
+    blit = bench_blit(ticks)
+    print(f"full redraw : {full * 1000:.2f} ms/tick")
+    print(f"blit update : {blit * 1000:.2f} ms/tick")
+    print(f"speedup     : {full / blit:.1f}x")
+    for n in (1, 8, 32):
+        batched = bench_small_multiples(ticks, n)
+        separate = bench_chart_per_device(ticks, n)
+        print(f"gpu x{n:<3}     : {batched * 1000:.2f} ms/tick batched, {separate * 1000:.2f} ms/tick one chart per device")
+    for n in (8, 64, 192, 512):
+        print(f"cpu x{n:<4}    : {bench_heatmap(ticks, n) * 1000:.2f} ms/tick heatmap")
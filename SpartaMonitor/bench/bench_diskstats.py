@@ -0,0 +1,65 @@
+# /proc/diskstats parsing: the DiskStatsReader fast path against psutil on
+# this machine, and against a straightforward line-by-line parser on a
+# synthetic table with many devices.
+#
+#   python bench/bench_diskstats.py [--devices 1000] [--rounds 500]
+import os, sys, time, argparse, tempfile, collections
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import psutil
+from monitor import diskstats
+
+Disk = collections.namedtuple("Disk", "read_count write_count read_bytes write_bytes read_time write_time "
+                                      "busy_time weighted_time in_flight")
+
+
+def per_line(path):
+    # what a psutil-style parser does: read, split lines, one namedtuple per device
+    with open(path, "rb") as f:
+        lines = f.read().splitlines()
+    out = {}
+    for line in lines:
+        p = line.split()
+        v = [int(x) for x in p[3:14]]
+        out[p[2].decode()] = Disk(v[0], v[4], v[2] * 512, v[6] * 512, v[3], v[7], v[9], v[10], v[8])
+    return out
+
+
+def timed(fn, rounds):
+    fn()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--devices", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=500)
+    args = parser.parse_args()
+
+    if diskstats.available():
+        reader = diskstats.DiskStatsReader()
+        n = len(reader.read()[0])
+        print(f"this host ({n} devices)")
+        print(f"  DiskStatsReader : {timed(reader.read, args.rounds):8.1f} us")
+        print(f"  psutil          : {timed(lambda: psutil.disk_io_counters(perdisk=True, nowrap=False), args.rounds):8.1f} us")
+        reader.close()
+
+    with tempfile.NamedTemporaryFile("w", suffix=".diskstats", delete=False) as f:
+        for i in range(args.devices):
+            f.write(f"   8 {i} nvme{i}n1 {i * 7} 12 {i * 1000} 345 {i * 3} 4 {i * 900} 77 {i % 4} "
+                    f"{i * 5} {i * 9} 0 0 0 0 0 0\n")
+    try:
+        reader = diskstats.DiskStatsReader(f.name)
+        reader.whole = lambda name: True  # synthetic names are not in /sys/block
+        print(f"synthetic ({args.devices} devices)")
+        fast = timed(reader.read, args.rounds)
+        slow = timed(lambda: per_line(f.name), args.rounds)
+        print(f"  DiskStatsReader : {fast:8.1f} us ({fast / args.devices:.2f} us/device)")
+        print(f"  per-line parser : {slow:8.1f} us ({slow / args.devices:.2f} us/device)")
+        reader.close()
+    finally:
+        os.remove(f.name)
@@ -0,0 +1,86 @@
+# Aggregator cost with many agents. A child process simulates N agents that
+# each send a perturbed copy of one real snapshot at 1 Hz; the parent runs the
+# aggregator and reports its own CPU use, i.e. what the monitoring window pays.
+#
+#   python bench/bench_fleet.py [--agents 500] [--seconds 20]
+import os, sys, time, random, asyncio, argparse, resource, multiprocessing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from monitor import fleet
+from monitor.collector import Collector
+
+
+def _jitter(snap, rng):
+    snap = dict(snap, t=time.time())
+    cpu = dict(snap["cpu"])
+    cpu["percent"] = round(rng.uniform(0, 100), 1)
+    cpu["per_core"] = [round(rng.uniform(0, 100), 1) for _ in cpu["per_core"]]
+    snap["cpu"] = cpu
+    snap["memory"] = dict(snap["memory"], percent=round(rng.uniform(20, 80), 1))
+    snap["network"] = {k: rng.uniform(0, 1e6) if k.endswith("bps") else v for k, v in snap["network"].items()}
+    top = [dict(p, cpu_percent=round(rng.uniform(0, 5), 1)) for p in snap["processes"]["top"][:10]]
+    snap["processes"] = dict(snap["processes"], top=top + snap["processes"]["top"][10:])
+    return snap
+
+
+async def _agent(i, address, base, seconds, sent):
+    rng = random.Random(i)
+    reader, writer = await asyncio.open_connection(*address)
+    writer.write(fleet._frame(fleet.HELLO, f"host-{i:04d}".encode()))
+    enc = fleet.DeltaEncoder()
+    await asyncio.sleep(rng.random())  # spread agents across the second
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        data = enc.encode(_jitter(base, rng))
+        sent.append(len(data))
+        writer.write(data)
+        await writer.drain()
+        await asyncio.sleep(1.0)
+    writer.close()
+
+
+def _agents(n, address, seconds, out):
+    base = Collector().sample()
+    sent = []
+
+    async def main():
+        await asyncio.gather(*(_agent(i, address, base, seconds, sent) for i in range(n)))
+    asyncio.run(main())
+    out.put((len(sent), sum(sent) / max(len(sent), 1), max(sent)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--agents", type=int, default=500)
+    parser.add_argument("--seconds", type=float, default=20)
+    args = parser.parse_args()
+
+    agg = fleet.Aggregator("127.0.0.1:0").start()
+    out = multiprocessing.Queue()
+    child = multiprocessing.Process(target=_agents, args=(args.agents, agg.address[1], args.seconds + 2, out))
+    child.start()
+
+    time.sleep(2)  # connections + first full frames
+    frames0 = agg.frames
+    cpu0 = resource.getrusage(resource.RUSAGE_SELF)
+    wall0 = time.monotonic()
+    time.sleep(args.seconds)
+    cpu1 = resource.getrusage(resource.RUSAGE_SELF)
+    wall = time.monotonic() - wall0
+    frames = agg.frames - frames0
+
+    start = time.perf_counter()
+    snap = agg.snapshot("host-0000")
+    rebuild = time.perf_counter() - start
+
+    n_frames, avg_bytes, max_bytes = out.get()
+    child.join()
+    cpu = (cpu1.ru_utime + cpu1.ru_stime) - (cpu0.ru_utime + cpu0.ru_stime)
+    print(f"agents          : {len(agg.hosts)}")
+    print(f"frames/s        : {frames / wall:.0f}")
+    print(f"aggregator cpu  : {cpu / wall * 100:.1f}% of one core")
+    print(f"per frame       : {cpu / max(frames, 1) * 1e6:.0f} us")
+    print(f"frame size      : {avg_bytes:.0f} B avg, {max_bytes} B first (full resync)")
+    print(f"snapshot rebuild: {rebuild * 1000:.2f} ms for one host")
+    agg.stop()
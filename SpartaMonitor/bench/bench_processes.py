@@ -0,0 +1,37 @@
+# Cost of one ProcessScanner refresh. Optionally spawns idle children first so
+# the scan covers a realistic process count.
+#
+#   python bench/bench_processes.py [--spawn 5000] [--rounds 10]
+import os, sys, time, argparse, subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from monitor.processes import ProcessScanner
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--spawn", type=int, default=0)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    children = [subprocess.Popen(["sleep", "600"]) for _ in range(args.spawn)]
+    try:
+        scanner = ProcessScanner()
+        start = time.perf_counter()
+        scanner.scan()  # cold: builds the Process cache
+        cold = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            result = scanner.scan()
+        warm = (time.perf_counter() - start) / args.rounds
+
+        n = result["count"]
+        print(f"processes   : {n}")
+        print(f"cold scan   : {cold * 1000:.1f} ms")
+        print(f"warm scan   : {warm * 1000:.1f} ms ({warm / n * 1e6:.1f} us/process)")
+    finally:
+        for c in children:
+            c.kill()
+        for c in children:
+            c.wait()
@@ -0,0 +1,89 @@
+# CPU collection cost: the /proc/stat fast path (ProcStatReader + CounterRates)
+# against psutil on this machine, and against a psutil-style per-line parser
+# with per-core percentage loops on a synthetic /proc/stat with many CPUs.
+#
+#   python bench/bench_procstat.py [--cpus 192] [--rounds 500]
+import os, sys, time, argparse, tempfile, collections
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import psutil
+from monitor import cpu, procstat
+from monitor.rates import CounterRates
+
+Times = collections.namedtuple("Times", procstat.FIELDS)
+
+
+def timed(fn, rounds):
+    fn()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def psutil_tick():
+    # what cpu.get_overview used to call every tick
+    psutil.cpu_percent(interval=None)
+    psutil.cpu_percent(interval=None, percpu=True)
+    psutil.cpu_freq()
+    psutil.sensors_temperatures()
+    psutil.cpu_count()
+    psutil.cpu_count(logical=False)
+
+
+class PerLine:
+    # psutil-style: one namedtuple per CPU, percentages computed core by core
+    def __init__(self, path):
+        self.path = path
+        self.prev = None
+
+    def __call__(self):
+        with open(self.path, "rb") as f:
+            lines = [line for line in f.read().splitlines() if line.startswith(b"cpu")]
+        cur = [Times(*(float(x) for x in line.split()[1:11])) for line in lines]
+        out = []
+        if self.prev is not None:
+            for a, b in zip(self.prev, cur):
+                d = [y - x for x, y in zip(a, b)]
+                total = sum(d[:8]) or 1.0
+                out.append({f: v / total * 100 for f, v in zip(procstat.FIELDS, d)})
+        self.prev = cur
+        return out
+
+
+def fast(reader, rates):
+    def tick():
+        names, ticks, _ = reader.read()
+        _, r = rates.update_array(names, ticks)
+        return procstat.shares(r)
+    return tick
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cpus", type=int, default=192)
+    parser.add_argument("--rounds", type=int, default=500)
+    args = parser.parse_args()
+
+    if procstat.available():
+        print(f"this host ({psutil.cpu_count()} CPUs), one collector tick")
+        print(f"  cpu.get_overview : {timed(cpu.get_overview, args.rounds):8.1f} us")
+        print(f"  psutil calls     : {timed(psutil_tick, args.rounds):8.1f} us")
+
+    with tempfile.NamedTemporaryFile("w", suffix=".stat", delete=False) as f:
+        f.write(f"cpu  {' '.join(str(i * 1000) for i in range(1, 11))}\n")
+        for c in range(args.cpus):
+            f.write(f"cpu{c} {' '.join(str(c * 100 + i) for i in range(1, 11))}\n")
+        f.write("intr 123456 " + " 0" * 1000 + "\nctxt 987654\nbtime 1700000000\nprocesses 4242\n"
+                "procs_running 3\nprocs_blocked 1\nsoftirq 1 2 3 4 5 6 7 8 9 10 11\n")
+    try:
+        reader = procstat.ProcStatReader(f.name)
+        print(f"synthetic ({args.cpus} CPUs), read + per-core breakdown")
+        us = timed(fast(reader, CounterRates(procstat.FIELDS)), args.rounds)
+        slow = timed(PerLine(f.name), args.rounds)
+        print(f"  ProcStatReader   : {us:8.1f} us ({us / args.cpus:.2f} us/CPU)")
+        print(f"  per-line parser  : {slow:8.1f} us ({slow / args.cpus:.2f} us/CPU)")
+        reader.close()
+    finally:
+        os.remove(f.name)
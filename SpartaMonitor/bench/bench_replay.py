@@ -0,0 +1,94 @@
+# Record/replay throughput, and replay at max speed as a fixed, repeatable
+# load for the alerting and rendering paths. Without --recording a synthetic
+# one is made from one real snapshot with seeded noise (CPU swings hard enough
+# to fire and clear the default rules), so runs are comparable across changes.
+#
+#   python bench/bench_replay.py [--snapshots 3600] [--recording FILE]
+import os, sys, json, math, time, random, argparse, tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from alerts import Alerts
+from monitor import exporter
+from monitor.collector import Collector
+from monitor.recording import Recorder, Recording, ReplaySource
+from monitor.snapshot import plain
+from monitor.ringbuffer import RecentHistory
+from ui._matplot_widget import LiveChart
+
+
+def synthetic(n, seed=1):
+    rng = random.Random(seed)
+    base = Collector().sample()
+    t0 = 1.7e9
+    for i in range(n):
+        snap = json.loads(json.dumps(base, default=plain))
+        snap["t"] = t0 + i
+        load = 50 + 45 * math.sin(i / 60)
+        snap["cpu"]["percent"] = round(min(100.0, max(0.0, load + rng.uniform(-5, 5))), 1)
+        snap["cpu"]["per_core"] = [round(min(100.0, max(0.0, load + rng.uniform(-20, 20))), 1)
+                                   for _ in snap["cpu"]["per_core"]]
+        snap["memory"]["percent"] = round(40 + 10 * math.sin(i / 300), 1)
+        snap["network"]["tx_rate_bps"] = rng.uniform(0, 1e7)
+        snap["network"]["rx_rate_bps"] = rng.uniform(0, 1e7)
+        yield snap
+
+
+def rate(n, seconds):
+    return f"{n / seconds:10.0f} snapshots/s  ({seconds / n * 1e6:7.1f} us each)"
+
+
+def replay(path, *subscribers, history=None):
+    source = ReplaySource(path, speed=None, history=history or RecentHistory(capacity=3600))
+    for cb in subscribers:
+        source.subscribe(cb)
+    start = time.perf_counter()
+    source.start()
+    source.finished.wait()
+    return source, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--snapshots", type=int, default=3600)
+    parser.add_argument("--recording", help="replay this file instead of a synthetic recording")
+    args = parser.parse_args()
+
+    path = args.recording
+    if path is None:
+        snaps = list(synthetic(args.snapshots))
+        path = os.path.join(tempfile.mkdtemp(), "bench.spr")
+        recorder = Recorder(path)
+        start = time.perf_counter()
+        for snap in snaps:
+            recorder.append(snap)
+        recorder.close()
+        elapsed = time.perf_counter() - start
+        raw = sum(len(json.dumps(s, default=plain)) for s in snaps)
+        size = os.path.getsize(path)
+        print(f"record          : {rate(len(snaps), elapsed)}")
+        print(f"  file          : {size / 1024:.0f} KB, {size / len(snaps):.0f} B/snapshot "
+              f"({raw / size:.0f}x smaller than JSON lines)")
+
+    n = len(Recording(path))
+    _, elapsed = replay(path)
+    print(f"replay (decode) : {rate(n, elapsed)}")
+
+    # a fresh engine per pass: each replay starts over at the recording's first timestamp
+    fired = []
+    checker = lambda: Alerts(callback=lambda level, msg: fired.append(msg), config={}).check
+    _, elapsed = replay(path, checker())
+    print(f"  + alerts      : {rate(n, elapsed)}  {len(fired)} alerts")
+
+    _, elapsed = replay(path, checker(), lambda snap: exporter.render(snap))
+    print(f"  + exporter    : {rate(n, elapsed)}")
+
+    # the network page's chart, redrawn every snapshot on an Agg canvas
+    history = RecentHistory(capacity=3600)
+    chart = LiveChart(120, series=("up", "down"), autoscale=True)
+    chart.bind(FigureCanvasAgg(chart.fig))
+    redraw = lambda snap: chart.update(history.series("net.tx_bps", 120), history.series("net.rx_bps", 120))
+    _, elapsed = replay(path, checker(), redraw, history=history)
+    print(f"  + chart       : {rate(n, elapsed)}")
@@ -0,0 +1,64 @@
+# Alert rule cost per tick for a fleet: R rules (spread over per-core CPU,
+# per-disk and scalar metrics, some sustained, some rates) evaluated for H
+# hosts with C cores each, on quiet snapshots where nothing fires. Then the
+# same with each snapshot rebuilt from an aggregator's flat state first, which
+# is what Alerts.watch pays per remote update.
+#
+#   python bench/bench_rules.py [--rules 2000] [--cores 64] [--hosts 50] [--rounds 20]
+import os, sys, time, argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from monitor import fleet
+from rules import Rule, RuleEngine
+
+METRICS = ("cpu.core_percent", "cpu.percent", "mem.percent", "disk.percent", "cpu.iowait_percent")
+
+
+def make_rules(n):
+    rules = []
+    for i in range(n):
+        metric = METRICS[i % len(METRICS)]
+        kind = "rate" if i % 10 == 9 else "value"
+        rules.append(Rule(f"r{i}", metric, 101 + i % 50, clear=95, ticks=1 + i % 8, kind=kind, window=1 + i % 4))
+    return rules
+
+
+def make_snap(t, cores, rng):
+    return {"t": t,
+            "cpu": {"percent": float(rng.random() * 50), "per_core": (rng.random(cores) * 50).tolist(),
+                    "times": {"iowait": 1.0}},
+            "memory": {"percent": 40.0},
+            "disks": [{"mount": f"/mnt/{i}", "percent": 50.0} for i in range(8)]}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rules", type=int, default=2000)
+    parser.add_argument("--cores", type=int, default=64)
+    parser.add_argument("--hosts", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    engine = RuleEngine(make_rules(args.rules), repeat=20)
+    hosts = [f"host{i}" for i in range(args.hosts)]
+    snaps = [make_snap(0.0, args.cores, rng) for _ in hosts]
+    flats = [fleet.flatten(s) for s in snaps]
+
+    def tick(t, rebuild):
+        for host, snap, flat in zip(hosts, snaps, flats):
+            if rebuild:
+                snap = fleet.unflatten(flat)
+            snap["t"] = t
+            engine.evaluate(snap, host)
+
+    for label, rebuild in (("engine only      ", False), ("+ unflatten (watch)", True)):
+        for i in range(10):  # fill the rings
+            tick(float(i), rebuild)
+        start = time.perf_counter()
+        for i in range(args.rounds):
+            tick(100.0 + i, rebuild)
+        ms = (time.perf_counter() - start) / args.rounds * 1000
+        print(f"{label}: {ms:8.1f} ms per tick ({args.rules} rules x {args.cores} cores x {args.hosts} hosts)")
@@ -0,0 +1,59 @@
+# Cost of leaving self-instrumentation on: one histogram observation, the
+# "monitor" report backend, Scheduler.run() on a no-op task with and without
+# a stats registry (the per-collector-call overhead), one real round of
+# collector calls, and a publish to N subscribers with and without timing.
+#
+#   python bench/bench_selfstats.py [--rounds 300] [--subscribers 12]
+import os, sys, time, argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from monitor.collector import Collector, SnapshotSource
+from monitor.scheduler import Scheduler
+from monitor.selfstats import Histogram, Stats
+
+
+def timed(fn, rounds):
+    fn()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def tick(scheduler):
+    def run():
+        for task in scheduler.tasks.values():
+            scheduler.run(task)
+    return run
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=300)
+    parser.add_argument("--subscribers", type=int, default=12)
+    args = parser.parse_args()
+
+    h = Histogram()
+    print(f"Histogram.observe    : {timed(lambda: h.observe(0.00042), 200000) * 1000:8.0f} ns")
+    stats = Stats()
+    noop = {"noop": lambda: 1}
+    a = timed(tick(Scheduler(noop)), args.rounds * 100)
+    b = timed(tick(Scheduler(noop, instrument=stats)), args.rounds * 100)
+    print(f"Scheduler.run (no-op): {a:8.2f} us bare, {b:8.2f} us instrumented ({b - a:+.2f} us per call)")
+
+    backends = Collector()._backends()
+    backends.pop("gpus")  # a missing GPU stack times out differently every run
+    instrumented = Scheduler(backends, instrument=stats)
+    print(f"collector round      : {timed(tick(instrumented), args.rounds):8.1f} us "
+          f"({len(backends)} collectors, instrumented)")
+    print(f"Stats.report         : {timed(stats.report, args.rounds):8.1f} us")
+
+    snap = {"t": 0.0}
+    for timed_subs in (None, stats):
+        src = SnapshotSource(stats=timed_subs)
+        for i in range(args.subscribers):
+            src.subscribe(lambda s: None)
+        label = "timed" if timed_subs else "bare "
+        print(f"publish {label}        : {timed(lambda: src._publish(snap), args.rounds * 10):8.1f} us "
+              f"({args.subscribers} subscribers)")
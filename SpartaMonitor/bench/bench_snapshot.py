@@ -0,0 +1,87 @@
+# Allocations per tick for the per-item parts of a snapshot: the old freshly
+# built dicts against the typed parts in monitor/snapshot.py (Table for
+# per-disk / per-NIC rates, __slots__ records for disks, GPUs and process
+# rows), plus what the alert rules pay to read them back.
+#
+#   python bench/bench_snapshot.py [--devices 64] [--procs 50] [--rounds 2000]
+import os, sys, gc, time, argparse, tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from monitor import snapshot
+from monitor.disk import DISK_FIELDS
+from monitor.snapshot import Table, Proc, Disk
+
+
+def timed(fn, rounds):
+    fn()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def retained(fn):
+    # blocks and bytes still held by one result (what history/latest keep alive)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = fn()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    del result
+    return sum(s.count_diff for s in stats), sum(s.size_diff for s in stats)
+
+
+def old_table(names, rates):
+    # what disk.get_io built per tick
+    rows = rates.tolist()
+    return {name: {k: (None if v != v else v) for k, v in zip(DISK_FIELDS, row)} for name, row in zip(names, rows)}
+
+
+def old_procs(rows):
+    return [{"pid": p, "name": n, "cpu_percent": c, "rss": r, "io_rate": i, "threads": t}
+            for p, n, c, r, i, t in rows]
+
+
+def old_disks(rows):
+    return [{"device": d, "mount": m, "fstype": "ext4", "stale": False, "total": 1 << 40, "used": u,
+             "free": (1 << 40) - u, "percent": pct} for d, m, u, pct in rows]
+
+
+def report(label, old, new, rounds):
+    ob, osz = retained(old)
+    nb, nsz = retained(new)
+    print(f"{label}")
+    print(f"  dicts : {ob:6d} blocks {osz / 1024:8.1f} KiB {timed(old, rounds):8.1f} us")
+    print(f"  typed : {nb:6d} blocks {nsz / 1024:8.1f} KiB {timed(new, rounds):8.1f} us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--devices", type=int, default=64)
+    parser.add_argument("--procs", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    names = [f"dev{i}" for i in range(args.devices)]
+    rates = rng.random((args.devices, len(DISK_FIELDS))) * 1000
+    procs = [(1000 + i, f"proc-{i}", float(i % 7), 1 << 20 + i % 8, 0.0, 1 + i % 4) for i in range(args.procs)]
+    disks = [(f"/dev/sd{i}", f"/mnt/{i}", i << 30, float(i % 100)) for i in range(args.devices)]
+
+    report(f"per-device rates ({args.devices} devices x {len(DISK_FIELDS)} fields)",
+           lambda: old_table(names, rates), lambda: Table(names, DISK_FIELDS, rates.copy()), args.rounds)
+    report(f"process rows ({args.procs})",
+           lambda: old_procs(procs), lambda: [Proc(*p) for p in procs], args.rounds)
+    report(f"partitions ({args.devices})",
+           lambda: old_disks(disks), lambda: [Disk(d, m, "ext4", False, 1 << 40, u, (1 << 40) - u, p)
+                                               for d, m, u, p in disks], args.rounds)
+
+    old, new = old_table(names, rates), Table(names, DISK_FIELDS, rates)
+    print("rule metric read (await_ms per device)")
+    print(f"  dicts : {timed(lambda: {k: v['await_ms'] for k, v in old.items()}, args.rounds):8.1f} us")
+    print(f"  typed : {timed(lambda: snapshot.named(new, 'await_ms'), args.rounds):8.1f} us")
+
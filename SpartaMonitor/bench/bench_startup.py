@@ -0,0 +1,86 @@
+# Startup cost, each round in a fresh interpreter: importing the app (lazy
+# pages vs every page module up front), the first collector snapshot, and,
+# when a display is available, time to the window and to the Dashboard's
+# first painted values (lazy vs building every page at startup).
+#
+#   python bench/bench_startup.py [--rounds 5]
+import os, sys, json, time, argparse, statistics, subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def child(eager):
+    sys.path.insert(0, ROOT)
+    t0 = time.perf_counter()
+    import main
+    out = {"import_main": time.perf_counter() - t0}
+    if eager:
+        import importlib
+        for module, _ in main.PAGES.values():
+            importlib.import_module(module)
+        out["import_pages"] = time.perf_counter() - t0
+
+    from monitor.collector import Collector
+    collector = Collector()
+    start = time.perf_counter()
+    collector.start(prime=False)
+    out["start_returns"] = time.perf_counter() - start
+    while collector.latest is None:
+        time.sleep(0.001)
+    out["first_snapshot"] = time.perf_counter() - start
+    collector.stop()
+
+    try:
+        t0 = time.perf_counter()
+        app = main.SpartaMonitorApp()
+    except Exception as e:  # no display
+        out["window"] = None
+        out["error"] = type(e).__name__
+        print(json.dumps(out))
+        return
+    if eager:
+        for name in main.PAGES:
+            app.show_frame(name)
+        app.show_frame("Dashboard")
+    out["window"] = time.perf_counter() - t0
+    label = app.frames["Dashboard"].cpu_label
+    while label.cget("text") == "Loading...":
+        app.update()
+    out["first_paint"] = time.perf_counter() - t0
+    app.collector.stop()
+    app.ui.stop()
+    app.destroy()
+    print(json.dumps(out))
+
+
+def run(rounds, eager):
+    results = []
+    for _ in range(rounds):
+        argv = [sys.executable, os.path.abspath(__file__), "--child"] + (["--eager"] if eager else [])
+        line = subprocess.run(argv, capture_output=True, text=True, check=True).stdout.strip().splitlines()[-1]
+        results.append(json.loads(line))
+    return results
+
+
+def report(title, results):
+    print(title)
+    for key in results[0]:
+        values = [r[key] for r in results if isinstance(r.get(key), float)]
+        if values:
+            print(f"  {key:<15}: {statistics.median(values) * 1000:8.1f} ms")
+    if results[0].get("window") is None:
+        print(f"  window         : skipped ({results[0].get('error')}, no display)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--eager", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.eager)
+    else:
+        report("lazy pages (default)", run(args.rounds, eager=False))
+        report("every page up front", run(args.rounds, eager=True))
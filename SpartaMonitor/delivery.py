@@ -0,0 +1,170 @@
+import os, json, time, threading, subprocess, collections
+import urllib.request
+
+# Alert delivery. Alerts.check only appends to bounded per-sink queues; every
+# sink drains its own queue on its own thread, in batches and under its own
+# rate limit, so a slow webhook or command never holds up sampling or the
+# other sinks. When a queue is full the oldest alert is dropped and counted.
+#
+# config.json "alerts":
+#   {"queue_size": 256,
+#    "sinks": [{"type": "tray"},
+#              {"type": "jsonl", "path": "~/.sparta_monitor/alerts.jsonl"},
+#              {"type": "webhook", "url": "http://...", "batch_seconds": 5, "max_per_minute": 6},
+#              {"type": "command", "argv": ["notify-send", "Sparta Monitor"]}]}
+#
+# Every sink takes batch_seconds (wait this long to gather a batch),
+# max_batch and max_per_minute (sends, not alerts).
+
+
+class JsonlSink:
+    name = "jsonl"
+
+    def __init__(self, path="~/.sparta_monitor/alerts.jsonl"):
+        self.path = os.path.expanduser(path)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+
+    def send(self, batch):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(a) + "\n" for a in batch))
+
+
+class WebhookSink:
+    name = "webhook"
+
+    def __init__(self, url, timeout=5.0, headers=None):
+        self.url = url
+        self.timeout = timeout
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+
+    def send(self, batch):
+        body = json.dumps({"alerts": batch}).encode("utf-8")
+        req = urllib.request.Request(self.url, data=body, headers=self.headers, method="POST")
+        with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+            resp.read()
+
+
+class CommandSink:
+    # runs argv once per batch; the last message is the final argument and the
+    # whole batch is on stdin as JSON lines
+    name = "command"
+
+    def __init__(self, argv, timeout=10.0):
+        self.argv = list(argv)
+        self.timeout = timeout
+
+    def send(self, batch):
+        text = batch[-1]["message"] if len(batch) == 1 else f"{len(batch)} alerts: {batch[-1]['message']}"
+        subprocess.run(self.argv + [text], input="".join(json.dumps(a) + "\n" for a in batch),
+                       text=True, timeout=self.timeout, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+SINKS = {"jsonl": JsonlSink, "webhook": WebhookSink, "command": CommandSink}
+
+
+class _Worker:
+    def __init__(self, sink, queue_size=256, batch_seconds=1.0, max_batch=50, max_per_minute=60):
+        self.sink = sink
+        self.name = getattr(sink, "name", type(sink).__name__)
+        self.batch_seconds = batch_seconds
+        self.max_batch = max_batch
+        self.min_gap = 60.0 / max_per_minute if max_per_minute else 0.0
+        self.queue = collections.deque(maxlen=queue_size)
+        self.dropped = self.sent = self.failed = 0
+        self._cond = threading.Condition()
+        self._stop = False
+        self._last_send = 0.0
+        self._thread = threading.Thread(target=self._run, name=f"alerts-{self.name}", daemon=True)
+        self._thread.start()
+
+    def offer(self, alert):
+        with self._cond:
+            if len(self.queue) == self.queue.maxlen:
+                self.dropped += 1  # deque drops the oldest
+            self.queue.append(alert)
+            self._cond.notify()
+
+    def _take(self):
+        with self._cond:
+            while not self.queue and not self._stop:
+                self._cond.wait()
+            if self._stop and not self.queue:
+                return None
+        # respect the sink's rate limit, then let a burst accumulate
+        gap = self._last_send + self.min_gap - time.monotonic()
+        with self._cond:
+            if gap > 0:
+                self._cond.wait_for(lambda: self._stop, gap)
+            if self.batch_seconds > 0:
+                self._cond.wait_for(lambda: self._stop or len(self.queue) >= self.max_batch, self.batch_seconds)
+            n = min(len(self.queue), self.max_batch)
+            return [self.queue.popleft() for _ in range(n)]
+
+    def _run(self):
+        while True:
+            batch = self._take()
+            if batch is None:
+                return
+            self._last_send = time.monotonic()
+            try:
+                self.sink.send(batch)
+                self.sent += len(batch)
+            except Exception:
+                self.failed += len(batch)
+
+    def stop(self, timeout=2.0):
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        self._thread.join(timeout)
+
+
+class Delivery:
+    def __init__(self, sinks=(), queue_size=256):
+        self.queue_size = queue_size
+        self.workers = []
+        for sink, options in sinks:
+            self.add(sink, **options)
+
+    @classmethod
+    def from_config(cls, config, tray=None):
+        # tray: the in-app NotificationTray, if there is a window
+        conf = config.get("alerts", {})
+        self = cls(queue_size=conf.get("queue_size", 256))
+        for spec in conf.get("sinks", [{"type": "tray"}]):
+            spec = dict(spec)
+            kind = spec.pop("type")
+            options = {k: spec.pop(k) for k in ("batch_seconds", "max_batch", "max_per_minute") if k in spec}
+            if kind == "tray":
+                if tray is not None:
+                    self.add(tray, **{"batch_seconds": 0.2, **options})
+            elif kind in SINKS:
+                self.add(SINKS[kind](**spec), **options)
+        return self
+
+    def add(self, sink, **options):
+        options.setdefault("queue_size", self.queue_size)
+        self.workers.append(_Worker(sink, **options))
+
+    def publish(self, alert):
+        # called on the collector thread: never blocks
+        for w in self.workers:
+            w.offer(alert)
+
+    def stats(self):
+        return {w.name: {"depth": len(w.queue), "dropped": w.dropped, "sent": w.sent, "failed": w.failed}
+                for w in self.workers}
+
+    def metrics(self):
+        # exporter source: (name, kind, help, value, labels)
+        for w in self.workers:
+            labels = {"sink": w.name}
+            yield "alert_queue_depth", "gauge", "Alerts waiting for a sink.", len(w.queue), labels
+            yield "alerts_dropped", "counter", "Alerts dropped because a sink queue was full.", w.dropped, labels
+            yield "alerts_delivered", "counter", "Alerts handed to a sink.", w.sent, labels
+            yield "alerts_failed", "counter", "Alerts a sink failed to deliver.", w.failed, labels
+
+    def stop(self):
+        for w in self.workers:
+            w.stop()
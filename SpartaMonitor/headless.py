@@ -0,0 +1,100 @@
+import sys, json, time, threading
+
+from alerts import Alerts
+from delivery import Delivery
+from monitor import gpu, fleet
+from monitor.snapshot import plain
+from monitor.collector import Collector
+from monitor.exporter import MetricsExporter
+from monitor.recording import Recorder, ReplaySource
+from monitor.store import MetricStore
+from monitor.ringbuffer import RecentHistory
+
+
+# Display-less mode: runs only the monitor/ collectors and the alert checks and
+# writes one JSON snapshot per line. Must not import customtkinter, tkinter or
+# matplotlib (directly or through ui/).
+def run(interval=None, output=None, count=None, config=None):
+    out = open(output, "a", buffering=1, encoding="utf-8") if output else sys.stdout
+    fired = []
+
+    def on_alert(level, msg):
+        fired.append({"level": level, "message": msg})
+        print(f"[{level.upper()}] {msg}", file=sys.stderr, flush=True)
+
+    gpu.configure((config or {}).get("gpu"))
+    delivery = Delivery.from_config(config or {})
+    alerts = Alerts(callback=on_alert, config=config, delivery=delivery)
+    history = RecentHistory.from_config(config or {})
+    collector = (ReplaySource.from_config(config or {}, history=history)
+                 or Collector.from_config(config or {}, interval=interval, history=history))
+    alerts.boost = collector.boost
+    done = threading.Event()
+    emitted = 0
+
+    def emit(snap):
+        nonlocal emitted
+        alerts.check(snap)
+        record = dict(snap)
+        record["alerts"] = list(fired)
+        record["delivery"] = delivery.stats()
+        fired.clear()
+        out.write(json.dumps(record, default=plain) + "\n")
+        out.flush()
+        emitted += 1
+        if count and emitted >= count:
+            done.set()
+
+    # a replay is someone else's past: keep it out of the local history store
+    store = MetricStore.from_config(config or {}) if isinstance(collector, Collector) else None
+    if store is not None:
+        collector.subscribe(store.append)
+    recorder = Recorder.from_config(config or {})
+    if recorder is not None:
+        collector.subscribe(recorder.append)
+    exporter = MetricsExporter.from_config(collector, config or {})
+    if exporter is not None:
+        exporter.sources.append(delivery.metrics)
+        exporter.start()
+    collector.subscribe(emit)
+    collector.start()
+    try:
+        while not done.wait(0.5):
+            if collector.finished.is_set():
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        collector.stop()
+        delivery.stop()
+        if exporter is not None:
+            exporter.stop()
+        if store is not None:
+            store.close()
+        if recorder is not None:
+            recorder.close()
+        if out is not sys.stdout:
+            out.close()
+
+
+def print_history(series, since, config=None):
+    store = MetricStore.from_config(config or {}) or MetricStore()
+    start = time.time() - since
+    tier, rows = store.query(series, start)
+    print(f"# {series} from tier {tier}: t,min,max,avg")
+    for t, lo, hi, avg in rows:
+        print(f"{t:.0f},{lo:.3f},{hi:.3f},{avg:.3f}")
+
+
+def agent(address, interval=None, hostname=None, config=None):
+    # headless collectors streaming delta-encoded snapshots to an aggregator
+    gpu.configure((config or {}).get("gpu"))
+    collector = Collector.from_config(config or {}, interval=interval)
+    exporter = MetricsExporter.from_config(collector, config or {})
+    if exporter is not None:
+        exporter.start()
+    try:
+        fleet.run_agent(address, collector, hostname=hostname)
+    finally:
+        if exporter is not None:
+            exporter.stop()
@@ -1,20 +1,38 @@
+import importlib
 import customtkinter as ctk
 
+from alerts import Alerts
+from delivery import Delivery
+from monitor import gpu
+from monitor.collector import Collector
+from monitor.exporter import MetricsExporter
+from monitor.recording import Recorder, ReplaySource
+from monitor.store import MetricStore
+from monitor.ringbuffer import RecentHistory
+from utils.config import load_config
+from ui.dispatcher import UIDispatcher
+
 # Existing UI
 from ui.sidebar import Sidebar
 from ui.topbar import TopBarFrame
-from ui.dashboard import DashboardFrame
+from ui.notifications import NotificationTray
 
-# NEW page UIs
-from ui.cpu_page import CPUPage
-from ui.memory_page import MemoryPage
-from ui.disk_page import DiskPage
-from ui.network_page import NetworkPage
-from ui.gpu_page import GPUPage
+# Page UIs, imported and built on first show_frame(): the chart pages pull in
+# matplotlib, which is most of the startup time, and nobody has looked at them yet
+PAGES = {
+    "Dashboard": ("ui.dashboard", "DashboardFrame"),
+    "CPU": ("ui.cpu_page", "CPUPage"),
+    "Memory": ("ui.memory_page", "MemoryPage"),
+    "Disk": ("ui.disk_page", "DiskPage"),
+    "Network": ("ui.network_page", "NetworkPage"),
+    "GPU": ("ui.gpu_page", "GPUPage"),
+    "Processes": ("ui.process_page", "ProcessPage"),
+    "Diagnostics": ("ui.diagnostics_page", "DiagnosticsPage"),
+}
 
 
 class SpartaMonitorApp(ctk.CTk):
-    def __init__(self):
+    def __init__(self, config=None, interval=None):
         super().__init__()
         self.title("Sparta Monitor ⚔️")
         self.geometry("1200x800")
@@ -23,6 +41,40 @@ class SpartaMonitorApp(ctk.CTk):
 
         # ❌ Removed background image
 
+        # One shared sampler feeds every page; widget writes go through the
+        # dispatcher so they land on the Tk main loop
+        self.ui = UIDispatcher(self)
+        self.settings = config if config is not None else load_config()  # not self.config: that is Tk's configure
+        gpu.configure(self.settings.get("gpu"))
+        history = RecentHistory.from_config(self.settings)
+        self.collector = (ReplaySource.from_config(self.settings, history=history)
+                          or Collector.from_config(self.settings, interval=interval, history=history))
+        replaying = not isinstance(self.collector, Collector)
+        self.store = None if replaying else MetricStore.from_config(self.settings)
+        if self.store is not None:
+            self.collector.subscribe(self.store.append)
+        self.recorder = Recorder.from_config(self.settings)
+        if self.recorder is not None:
+            self.collector.subscribe(self.recorder.append)
+        # alerts only enqueue on the collector thread; sinks deliver on their own threads
+        self.tray = NotificationTray(self, self.ui)
+        self.delivery = Delivery.from_config(self.settings, tray=self.tray)
+        self.alerts = Alerts(config=self.settings, delivery=self.delivery)
+        self.alerts.boost = self.collector.boost
+        self.collector.subscribe(self.alerts.check)
+        self.exporter = MetricsExporter.from_config(self.collector, self.settings)
+        if self.exporter is not None:
+            self.exporter.sources.append(self.delivery.metrics)
+            self.exporter.start()
+        # first snapshot is taken on the sampling thread; the dashboard paints when it lands
+        self.collector.start(prime=False)
+        listen = self.settings.get("fleet", {}).get("listen")
+        self.fleet = None
+        if listen:
+            from monitor.fleet import Aggregator
+            self.fleet = Aggregator.from_config(self.settings).start()
+            self.alerts.watch(self.fleet)
+
         # Layout config
         self.grid_rowconfigure(1, weight=1)
         self.grid_columnconfigure(1, weight=1)
@@ -32,7 +84,7 @@ class SpartaMonitorApp(ctk.CTk):
         self.sidebar.grid(row=0, column=0, rowspan=2, sticky="nsw")
 
         # Topbar
-        self.topbar = TopBarFrame(self, fg_color="transparent")
+        self.topbar = TopBarFrame(self, self.collector, self.ui, fg_color="transparent")
         self.topbar.grid(row=0, column=1, sticky="new")
 
         # Container for pages
@@ -40,24 +92,48 @@ class SpartaMonitorApp(ctk.CTk):
         self.container.grid(row=1, column=1, sticky="nsew")
 
         # Pages
-        self.frames = {
-            "Dashboard": DashboardFrame(self.container, fg_color="transparent"),
-            "CPU": CPUPage(self.container, fg_color="transparent"),
-            "Memory": MemoryPage(self.container, fg_color="transparent"),
-            "Disk": DiskPage(self.container, fg_color="transparent"),
-            "Network": NetworkPage(self.container, fg_color="transparent"),
-            "GPU": GPUPage(self.container, fg_color="transparent"),
-        }
-        for f in self.frames.values():
-            f.grid(row=0, column=0, sticky="nsew")
+        self.frames = {}
 
         # Show Dashboard by default
         self.show_frame("Dashboard")
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def on_close(self):
+        # stop producing, deliver queued alerts, then flush what is buffered on
+        # disk (the recorder's last chunk, the store's segment)
+        self.collector.stop()
+        self.delivery.stop()
+        if self.exporter is not None:
+            self.exporter.stop()
+        if self.fleet is not None:
+            self.fleet.stop()
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.store is not None:
+            self.store.close()
+        self.ui.stop()  # no drain scheduled against a destroyed root
+        self.destroy()
+
+    def _build_page(self, name):
+        module, cls = PAGES[name]
+        kwargs = {"fleet": self.fleet} if name == "Dashboard" else {}
+        page = getattr(importlib.import_module(module), cls)(self.container, self.collector, self.ui,
+                                                            fg_color="transparent", **kwargs)
+        page.grid(row=0, column=0, sticky="nsew")
+        self.frames[name] = page
+        return page
 
     def show_frame(self, name: str):
         frame = self.frames.get(name)
+        if frame is None and name in PAGES:
+            frame = self._build_page(name)
         if frame:
+            # only the visible page renders; the rest just keep their history
+            for other in self.frames.values():
+                if other is not frame:
+                    other.set_active(False)
             frame.tkraise()
+            frame.set_active(True)
             if hasattr(self.sidebar, "set_active"):
                 self.sidebar.set_active(name)
 
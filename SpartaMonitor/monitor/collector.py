@@ -0,0 +1,172 @@
+import time, logging, threading
+
+from monitor import cpu, memory, disk, network, gpu, system
+from monitor.selfstats import STATS, name_of
+from monitor.processes import ProcessScanner
+from monitor.scheduler import Scheduler, DEFAULT_INTERVALS
+
+log = logging.getLogger(__name__)
+ERROR_LOG_SECONDS = 60.0  # one traceback per failing subscriber per minute
+
+
+# Publish/subscribe half of a snapshot source, shared by the live Collector
+# and recording.ReplaySource: subscribers get every snapshot in order, and
+# `history` (a RecentHistory ring) is filled before they run. The ring takes
+# at most one snapshot per `history_step` seconds, so it stays one sample per
+# base tick while some key is sampled faster.
+class SnapshotSource:
+    def __init__(self, history=None, stats=STATS):
+        self.history = history
+        self.stats = stats
+        self.latest = None
+        self.history_step = 0.0
+        self._history_t = None
+        self.finished = threading.Event()  # set when a finite source (a replay) runs out
+        self._subs = []
+        self._names = {}  # callback -> name in the "subscriber" stats
+        self._logged = {}  # subscriber name -> time.monotonic() of its last logged error
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback):
+        with self._lock:
+            self._subs.append(callback)
+            self._names[callback] = name_of(callback)
+        # late subscribers get the current snapshot right away
+        if self.latest is not None:
+            callback(self.latest)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subs:
+                self._subs.remove(callback)
+                if callback not in self._subs:
+                    self._names.pop(callback, None)
+
+    def boost(self, key):
+        # sample `key` faster for a while; nothing to do for sources that do not sample
+        pass
+
+    def _subscriber_error(self, name):
+        if self.stats is not None:
+            self.stats.incr("subscriber_errors", name)
+        now = time.monotonic()
+        if now - self._logged.get(name, -ERROR_LOG_SECONDS) >= ERROR_LOG_SECONDS:
+            self._logged[name] = now
+            log.exception("snapshot subscriber %s failed (logged at most once per %.0f s)", name, ERROR_LOG_SECONDS)
+
+    def _publish(self, snap):
+        if self.history is not None:
+            t = snap.get("t") or 0.0
+            # 3/4 of a step: a tick that wakes a little early still counts
+            if self._history_t is None or t - self._history_t >= 0.75 * self.history_step:
+                self._history_t = t
+                self.history.append(snap)
+        self.latest = snap
+        with self._lock:
+            subs = list(self._subs)
+        names = self._names
+        for cb in subs:
+            start = time.perf_counter()
+            try:
+                cb(snap)
+            except Exception:
+                # one broken subscriber must not stop sampling for the rest
+                self._subscriber_error(names.get(cb, "?"))
+            if self.stats is not None:
+                self.stats.observe("subscriber", names.get(cb, "?"), time.perf_counter() - start)
+
+
+# One sampling thread for the whole app: every tick takes a single timestamped
+# snapshot from the monitor/ backends and hands it to all subscribers, so pages
+# never poll psutil themselves and always agree with each other. Each backend
+# runs on its own interval (see scheduler.py); a snapshot carries the newest
+# value of every key and is published whenever any backend ran. Its "sampled"
+# section is {key: time that value was taken}, so consumers can tell a fresh
+# reading from one carried over from an earlier snapshot.
+class Collector(SnapshotSource):
+    def __init__(self, interval=1.0, history=None, sampling=None):
+        super().__init__(history)
+        self.interval = interval
+        self.history_step = interval
+        self.processes = ProcessScanner()
+        # `interval` is the base tick; slow-changing keys default to longer ones,
+        # and config "sampling.intervals" sets any key explicitly (seconds)
+        sampling = dict(sampling or {})
+        intervals = {k: v * interval for k, v in DEFAULT_INTERVALS.items()}
+        intervals.update(sampling.pop("intervals", {}))
+        self.scheduler = Scheduler(self._backends(), intervals=intervals, instrument=self.stats, **sampling)
+        self.scheduler.volatility("cpu", lambda v: v["percent"], 15.0)
+        self.scheduler.volatility("memory", lambda v: v["percent"], 5.0)
+        self.scheduler.volatility("gpus", lambda v: max((g["load_percent"] for g in v), default=0.0), 20.0)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def boost(self, key):
+        self.scheduler.boost(key)
+
+    def _backends(self):
+        return {
+            "cpu": cpu.get_overview,
+            "memory": memory.get_overview,
+            "pressure": memory.get_pressure,
+            "disks": disk.get_disks,
+            "disk_io": disk.get_io,
+            "network": network.get_overview,
+            "interfaces": network.get_interfaces,
+            "gpus": gpu.get_gpus,
+            "system": system.get_overview,
+            "processes": self.processes.scan,
+            "monitor": self._report,
+        }
+
+    def _report(self):
+        # self-instrumentation plus the scheduler's view: interval and backoff per key, total load
+        report = self.stats.report()
+        for key, s in self.scheduler.stats().items():
+            report["collectors"].setdefault(key, {}).update(interval_s=round(s["interval"], 3), backoff=s["backoff"])
+        report["load_percent"] = round(self.scheduler.load() * 100, 2)
+        return report
+
+    @classmethod
+    def from_config(cls, config, interval=None, history=None):
+        # interval: --interval override, else config "refresh_rate" (ms)
+        if interval is None:
+            interval = config.get("refresh_rate", 1000) / 1000.0
+        return cls(interval=interval, history=history, sampling=config.get("sampling"))
+
+    def sample(self):
+        # every backend at once, bypassing the scheduler
+        snap = {"t": time.time()}
+        snap.update((key, self.scheduler.run(task)) for key, task in self.scheduler.tasks.items())
+        snap["sampled"] = dict.fromkeys(self.scheduler.tasks, snap["t"])
+        return snap
+
+    def start(self, prime=True):
+        if self._thread is not None:
+            return
+        # prime=True samples synchronously so callers see a snapshot as soon as
+        # start() returns; the app passes False so the window is not held up
+        # and the first snapshot is published from the sampling thread
+        if prime:
+            self._publish(self.sample())
+        self.scheduler.start()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def _run(self):
+        if self.latest is None:
+            self._publish(self.sample())
+        while not self._stop.wait(max(0.0, self.scheduler.next_wakeup() - time.monotonic())):
+            results = self.scheduler.run_due()
+            if results:
+                snap = dict(self.latest, **results)
+                snap["t"] = time.time()
+                snap["sampled"] = dict(self.latest.get("sampled") or {}, **dict.fromkeys(results, snap["t"]))
+                self._publish(snap)
@@ -1,22 +1,97 @@
+import math, time
+import numpy as np
 import psutil
 
-def get_overview():
-    percent = psutil.cpu_percent(interval=None)
-    freq = psutil.cpu_freq()
-    per_core = psutil.cpu_percent(interval=None, percpu=True) or []
+from monitor import procstat
+from monitor.rates import CounterRates
+from monitor.snapshot import Table
+
+# Busy % plus the time breakdown (user, system, iowait, steal, ...) for the
+# whole machine and per core. On Linux a single /proc/stat read per tick
+# (procstat.py) feeds all of it, along with context switches, interrupts and
+# the run queue. Elsewhere psutil.cpu_times() is used, and there is no run
+# queue. Frequency, temperature and core counts change rarely but cost more
+# to read than all of that, so they are cached.
+#
+# The per-core breakdown is a Table (cores x CORE_MODES) over the shares array
+# itself, so a many-core host pays one column gather per tick rather than a
+# list per mode; rows are named "0", "1", ... like the per_core entities.
+MODES = ("user", "nice", "system", "idle", "iowait", "irq", "softirq", "steal", "guest")
+CORE_MODES = ("user", "nice", "system", "iowait", "irq", "softirq", "steal")
+SLOW_SECONDS = 5.0  # freq / temperature refresh
+
+_ticks = CounterRates(procstat.FIELDS)
+_events = CounterRates(("ctxt", "intr"))
+_reader = None
+_use_proc = procstat.available()
+_counts = None
+_core_cols = None  # (row names, CORE_MODES columns of procstat.FIELDS) for the core count
+_slow = {"t": -math.inf, "freq_mhz": None, "temp_c": None}
+
+
+def _temp():
     try:
         temps = psutil.sensors_temperatures()
-        # pick first CPU-related sensor if available
+        # pick first CPU-related sensor if available, else whatever comes first
         cpu_temps = next((v for k, v in temps.items() if "cpu" in k.lower() or "core" in k.lower()), [])
-        temp_c = cpu_temps[0].current if cpu_temps else None
+        if not cpu_temps and temps:
+            cpu_temps = next(iter(temps.values()))
+        return cpu_temps[0].current if cpu_temps else None
     except Exception:
-        temp_c = None
+        return None
+
+
+def _slow_fields():
+    now = time.monotonic()
+    if now - _slow["t"] >= SLOW_SECONDS:
+        freq = psutil.cpu_freq()
+        _slow.update(t=now, freq_mhz=freq.current if freq else None, temp_c=_temp())
+    return _slow["freq_mhz"], _slow["temp_c"]
+
+
+def _sample():
+    # -> (row names, tick table, {ctxt, intr, procs_running, procs_blocked}); row 0 is the total
+    global _reader, _use_proc
+    if _use_proc:
+        try:
+            if _reader is None:
+                _reader = procstat.ProcStatReader()
+            return _reader.read()
+        except (OSError, ValueError, IndexError):
+            _use_proc = False
+    per_cpu = psutil.cpu_times(percpu=True)
+    rows = np.array([[getattr(t, f, 0.0) for f in procstat.FIELDS] for t in per_cpu], dtype=np.float64)
+    stats = psutil.cpu_stats()
+    names = ["cpu"] + [f"cpu{i}" for i in range(len(per_cpu))]
+    return names, np.vstack([rows.sum(axis=0), rows]), {
+        "ctxt": stats.ctx_switches, "intr": stats.interrupts, "procs_running": None, "procs_blocked": None}
+
+
+def get_overview():
+    global _counts, _core_cols
+    names, ticks, counters = _sample()
+    _, rates = _ticks.update_array(names, ticks)
+    busy, pct = procstat.shares(rates)
+    _, events = _events.update_array(["all"], np.array([[counters["ctxt"], counters["intr"]]], dtype=np.float64))
+    if _counts is None:
+        _counts = (psutil.cpu_count(), psutil.cpu_count(logical=False) or psutil.cpu_count())
+    freq, temp_c = _slow_fields()
 
+    pct = np.round(pct, 1)
+    col = {f: i for i, f in enumerate(procstat.FIELDS)}
+    if _core_cols is None or len(_core_cols[0]) != len(pct) - 1:
+        _core_cols = ([str(i) for i in range(len(pct) - 1)], [col[m] for m in CORE_MODES])
     return {
-        "percent": percent,
-        "per_core": per_core,
-        "cores_logical": psutil.cpu_count(),
-        "cores_physical": psutil.cpu_count(logical=False) or psutil.cpu_count(),
-        "freq_mhz": freq.current if freq else None,
+        "percent": round(float(busy[0]), 1),
+        "per_core": np.round(busy[1:], 1).tolist(),
+        "times": {m: float(pct[0, col[m]]) for m in MODES},
+        "per_core_times": Table(_core_cols[0], CORE_MODES, pct[1:, _core_cols[1]]),
+        "ctx_switches_ps": float(events[0, 0]),
+        "interrupts_ps": float(events[0, 1]),
+        "procs_running": counters["procs_running"],
+        "procs_blocked": counters["procs_blocked"],
+        "cores_logical": _counts[0],
+        "cores_physical": _counts[1],
+        "freq_mhz": freq,
         "temp_c": temp_c,
     }
@@ -1,7 +1,73 @@
+import queue, threading, time
+from concurrent import futures
+
+import numpy as np
 import psutil
 
-def get_disks():
-    disks = []
+from monitor import diskstats
+from monitor.rates import CounterRates
+from monitor.snapshot import Disk, Table
+
+# per-disk counters -> rates, shared by every consumer of the snapshot. On
+# Linux the counters come straight from /proc/diskstats (see diskstats.py);
+# elsewhere from psutil, which has no in-flight or weighted-time counters.
+_rates = CounterRates(diskstats.COUNTERS)
+_reader = None
+_use_proc = diskstats.available()
+DISK_FIELDS = ("read_Bps", "write_Bps", "read_iops", "write_iops", "await_ms", "util_percent",
+               "queue_depth", "in_flight")
+
+# Filesystem usage. statvfs() on a dead network mount can block for minutes,
+# so each mount is queried on a small pool of daemon threads with a per-mount
+# timeout. A mount whose call has not come back is reported "stale" with its
+# last known usage (None if it never answered) and is not queried again until
+# that call returns, so a hung mount ties up at most one worker and costs the
+# sampler no wait after the first timeout. Usage is cached for `max_age`
+# seconds; the mount list itself is re-read every call.
+STATVFS_TIMEOUT = 1.0
+STATVFS_WORKERS = 4
+
+
+class _StatPool:
+    def __init__(self, workers=STATVFS_WORKERS):
+        self._jobs = queue.Queue()
+        for i in range(workers):
+            threading.Thread(target=self._work, name=f"statvfs-{i}", daemon=True).start()
+
+    def _work(self):
+        while True:
+            fn, arg, fut = self._jobs.get()
+            if not fut.set_running_or_notify_cancel():
+                continue
+            try:
+                fut.set_result(fn(arg))
+            except BaseException as e:
+                fut.set_exception(e)
+
+    def submit(self, fn, arg):
+        fut = futures.Future()
+        self._jobs.put((fn, arg, fut))
+        return fut
+
+
+_pool = None
+_usage = {}  # mount -> [usage or None, time.monotonic() of usage, in-flight future or None]
+
+
+def _usage_of(mount, now, max_age):
+    # -> a new future for `mount` if the cache is stale and no call is in flight, else None
+    global _pool
+    entry = _usage.setdefault(mount, [None, 0.0, None])
+    if entry[2] is not None or (entry[0] is not None and now - entry[1] < max_age):
+        return None
+    if _pool is None:
+        _pool = _StatPool()
+    entry[2] = _pool.submit(psutil.disk_usage, mount)
+    return entry[2]
+
+
+def get_disks(timeout=STATVFS_TIMEOUT, max_age=5.0):
+    parts = []
     seen = set()
     for p in psutil.disk_partitions(all=False):
         # skip duplicates and pseudo filesystems
@@ -9,19 +75,77 @@ def get_disks():
         if key in seen:
             continue
         seen.add(key)
-        try:
-            usage = psutil.disk_usage(p.mountpoint)
-        except Exception:
-            # some mounts might be inaccessible
+        parts.append(p)
+
+    now = time.monotonic()
+    # only wait on calls started now: one still running from an earlier call
+    # is reported stale right away
+    submitted = {p.mountpoint: _usage_of(p.mountpoint, now, max_age) for p in parts}
+    waiting = [f for f in submitted.values() if f is not None]
+    if waiting:
+        futures.wait(waiting, timeout=timeout)
+
+    disks = []
+    for p in parts:
+        entry = _usage[p.mountpoint]
+        fut = entry[2]
+        if fut is not None and fut.done():
+            entry[2] = None
+            try:
+                entry[0], entry[1] = fut.result(), now
+            except Exception:
+                # some mounts might be inaccessible
+                entry[0] = None
+                continue
+        usage = entry[0]
+        stale = entry[2] is not None
+        if usage is None and not stale:
             continue
-        disks.append({
-            "device": p.device,
-            "mount": p.mountpoint,
-            "fstype": p.fstype,
-            "total": usage.total,
-            "used": usage.used,
-            "free": usage.free,
-            "percent": usage.percent,
-        })
+        if usage is None:
+            disks.append(Disk(p.device, p.mountpoint, p.fstype, stale, None, None, None, None))
+        else:
+            disks.append(Disk(p.device, p.mountpoint, p.fstype, stale,
+                              usage.total, usage.used, usage.free, usage.percent))
+
+    # unmounted filesystems: forget them once nothing is in flight
+    for mount in [m for m, e in _usage.items() if m not in submitted and e[2] is None]:
+        del _usage[mount]
     return disks
-    
\ No newline at end of file
+
+
+def _sample():
+    # -> (names, rates, in-flight or None), updating the shared rate engine
+    global _reader, _use_proc
+    if _use_proc:
+        try:
+            if _reader is None:
+                _reader = diskstats.DiskStatsReader()
+            names, counters, in_flight = _reader.read()
+            return (*_rates.update_array(names, counters), in_flight)
+        except (OSError, ValueError):
+            _use_proc = False  # unreadable or unexpected format: psutil from now on
+    counters = psutil.disk_io_counters(perdisk=True, nowrap=False) or {}
+    return (*_rates.update(counters), None)
+
+
+def get_io():
+    # totals and per-disk rates (bytes/s, IOPS, average latency, busy %, queue)
+    names, r, in_flight = _sample()
+    rc, wc, rb, wb, rt, wt, bt, wq = r.T
+    ops = rc + wc
+    await_ms = np.divide(rt + wt, ops, out=np.zeros_like(ops), where=ops > 0)
+    util = np.minimum(bt / 10.0, 100.0)  # busy ms per second -> %
+    queue = wq / 1000.0                   # weighted busy ms per second -> average queue size
+    if in_flight is None:
+        in_flight = np.full(len(names), np.nan)
+    table = np.column_stack((rb, wb, rc, wc, await_ms, util, queue, in_flight))
+    # skip devices that have never done I/O (unused loop/zram devices)
+    raw = _rates.counters
+    used = raw[:, 0] + raw[:, 1] > 0
+    return {
+        "read_rate_Bps": float(np.nansum(rb)),
+        "write_rate_Bps": float(np.nansum(wb)),
+        "read_bytes": int(np.nansum(raw[:, 2])),
+        "write_bytes": int(np.nansum(raw[:, 3])),
+        "per_disk": Table([n for n, u in zip(names, used.tolist()) if u], DISK_FIELDS, table[used]),
+    }
@@ -0,0 +1,209 @@
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Optional Prometheus/OpenMetrics endpoint. The payload is rendered once per
+# collector tick and cached as bytes; scrapes only copy those bytes out, so
+# the number of concurrent scrapers does not change the monitor's cost.
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PREFIX = "sparta_"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+class _Families:
+    # collects samples grouped into metric families, in first-seen order
+    def __init__(self):
+        self._families = {}
+
+    def add(self, name, kind, help_text, value, labels=None):
+        if value is None:
+            return
+        fam = self._families.get(name)
+        if fam is None:
+            fam = self._families[name] = (kind, help_text, [])
+        sample = PREFIX + name + ("_total" if kind == "counter" else "")
+        value = value if isinstance(value, int) else float(value)
+        fam[2].append(f"{sample}{_labels(labels)} {value!r}")
+
+    def text(self):
+        out = []
+        for name, (kind, help_text, samples) in self._families.items():
+            out.append(f"# TYPE {PREFIX}{name} {kind}")
+            out.append(f"# HELP {PREFIX}{name} {help_text}")
+            out.extend(samples)
+        return out
+
+
+def _s(ms):
+    return None if ms is None else ms / 1000.0
+
+
+def render(snap, extra=()):
+    m = _Families()
+    g, c = "gauge", "counter"
+
+    cpu = snap.get("cpu") or {}
+    m.add("cpu_usage_percent", g, "Total CPU utilisation.", cpu.get("percent"))
+    for i, v in enumerate(cpu.get("per_core") or []):
+        m.add("cpu_core_usage_percent", g, "Per-core CPU utilisation.", v, {"core": i})
+    for mode, v in (cpu.get("times") or {}).items():
+        m.add("cpu_mode_percent", g, "Share of CPU time by mode.", v, {"mode": mode})
+    m.add("context_switches_per_second", g, "Context switches per second.", cpu.get("ctx_switches_ps"))
+    m.add("interrupts_per_second", g, "Interrupts per second.", cpu.get("interrupts_ps"))
+    m.add("procs_running", g, "Runnable tasks (run queue length).", cpu.get("procs_running"))
+    m.add("procs_blocked", g, "Tasks blocked on I/O.", cpu.get("procs_blocked"))
+    m.add("cpu_frequency_mhz", g, "Current CPU frequency.", cpu.get("freq_mhz"))
+    m.add("cpu_temperature_celsius", g, "CPU temperature.", cpu.get("temp_c"))
+
+    mem = snap.get("memory") or {}
+    for key in ("total", "available", "used"):
+        m.add(f"memory_{key}_bytes", g, f"Memory {key}.", mem.get(key))
+    m.add("memory_usage_percent", g, "Memory utilisation.", mem.get("percent"))
+    swap = mem.get("swap") or {}
+    for key in ("total", "used", "free"):
+        m.add(f"swap_{key}_bytes", g, f"Swap {key}.", swap.get(key))
+    m.add("swap_usage_percent", g, "Swap utilisation.", swap.get("percent"))
+    for key, v in (mem.get("detail") or {}).items():
+        if key.startswith("hugepages_"):
+            m.add(f"memory_{key}", g, f"Huge pages ({key[10:]}).", v)
+        else:
+            m.add(f"memory_{key}_bytes", g, f"Memory: {key.replace('_', ' ')}.", v)
+    vm = mem.get("vm") or {}
+    m.add("page_faults_per_second", g, "Page faults per second.", vm.get("faults_ps"))
+    m.add("major_page_faults_per_second", g, "Major page faults per second.", vm.get("major_faults_ps"))
+    m.add("swap_in_pages_per_second", g, "Pages swapped in per second.", vm.get("swap_in_ps"))
+    m.add("swap_out_pages_per_second", g, "Pages swapped out per second.", vm.get("swap_out_ps"))
+    m.add("oom_kills", c, "Processes killed by the OOM killer.", vm.get("oom_kills"))
+    for resource, kinds in (snap.get("pressure") or {}).items():
+        for kind, avgs in kinds.items():
+            for window in ("avg10", "avg60", "avg300"):
+                m.add("pressure_stall_percent", g, "Share of time tasks stalled on a resource (PSI).",
+                      avgs.get(window), {"resource": resource, "kind": kind, "window": window[3:] + "s"})
+
+    for d in snap.get("disks") or []:
+        labels = {"device": d["device"], "mountpoint": d["mount"], "fstype": d["fstype"]}
+        for key in ("total", "used", "free"):
+            m.add(f"disk_{key}_bytes", g, f"Filesystem {key} space.", d.get(key), labels)
+        m.add("disk_usage_percent", g, "Filesystem utilisation.", d.get("percent"), labels)
+        m.add("disk_stale", g, "1 while the filesystem is not answering statvfs.", int(d.get("stale", False)), labels)
+    io = snap.get("disk_io") or {}
+    m.add("disk_read_bytes", c, "Bytes read from all disks.", io.get("read_bytes"))
+    m.add("disk_written_bytes", c, "Bytes written to all disks.", io.get("write_bytes"))
+
+    for name, nic in (snap.get("interfaces") or {}).items():
+        m.add("network_receive_bytes", c, "Bytes received per interface.", nic.get("bytes_recv"), {"interface": name})
+        m.add("network_transmit_bytes", c, "Bytes sent per interface.", nic.get("bytes_sent"), {"interface": name})
+
+    for gpu in snap.get("gpus") or []:
+        labels = {"gpu": gpu["id"], "name": gpu["name"]}
+        m.add("gpu_utilization_percent", g, "GPU utilisation.", gpu.get("load_percent"), labels)
+        m.add("gpu_memory_used_bytes", g, "GPU memory used.", gpu["mem_used_mb"] * 1024 * 1024, labels)
+        m.add("gpu_memory_total_bytes", g, "GPU memory total.", gpu["mem_total_mb"] * 1024 * 1024, labels)
+        m.add("gpu_temperature_celsius", g, "GPU temperature.", gpu.get("temp_c"), labels)
+
+    # the monitor's own cost (quantiles since start, from selfstats histograms)
+    own = snap.get("monitor") or {}
+    proc = own.get("process") or {}
+    m.add("monitor_resident_memory_bytes", g, "Monitor process RSS.", proc.get("rss"))
+    m.add("monitor_threads", g, "Monitor process threads.", proc.get("threads"))
+    m.add("monitor_cpu_percent", g, "Monitor process CPU use.", proc.get("cpu_percent"))
+    m.add("monitor_sampling_load_percent", g, "Sampling work as a share of one core.", own.get("load_percent"))
+    for key, st in (own.get("collectors") or {}).items():
+        m.add("monitor_collector_runs", c, "Collector calls.", st.get("count"), {"collector": key})
+        m.add("monitor_collector_seconds", c, "Wall time spent in a collector.", _s(st.get("total_ms")),
+              {"collector": key})
+        m.add("monitor_collector_cpu_seconds", c, "CPU time spent in a collector.", _s(st.get("cpu_total_ms")),
+              {"collector": key})
+        for q in ("p50", "p99"):
+            m.add("monitor_collector_call_seconds", g, "Collector call wall time quantile.", _s(st.get(f"{q}_ms")),
+                  {"collector": key, "quantile": q[1:]})
+        m.add("monitor_collector_jitter_seconds", g, "p99 distance from the scheduled deadline.",
+              _s(st.get("jitter_p99_ms")), {"collector": key})
+        m.add("monitor_missed_deadlines", c, "Times a collector fell a whole interval behind.", st.get("missed"),
+              {"collector": key})
+        m.add("monitor_collector_interval_seconds", g, "Current sampling interval.", st.get("interval_s"),
+              {"collector": key})
+        m.add("monitor_collector_backoff", g, "Interval multiplier from the sampling budget.", st.get("backoff"),
+              {"collector": key})
+    for group, label in (("subscribers", "subscriber"), ("draw", "owner"), ("ui", "stage")):
+        for name, st in (own.get(group) or {}).items():
+            for q in ("p50", "p99"):
+                m.add(f"monitor_{label}_seconds", g, f"Monitor {label} time quantile.", _s(st.get(f"{q}_ms")),
+                      {label: name, "quantile": q[1:]})
+
+    system = snap.get("system") or {}
+    m.add("uptime_seconds", g, "Host uptime.", system.get("uptime_seconds"))
+    m.add("processes", g, "Number of processes.", (snap.get("processes") or {}).get("count"))
+    m.add("snapshot_timestamp_seconds", g, "When the snapshot was taken.", snap.get("t"))
+
+    for source in extra:
+        for name, kind, help_text, value, labels in source():
+            m.add(name, kind, help_text, value, labels)
+
+    return "\n".join(m.text()) + "\n# EOF\n"
+
+
+class MetricsExporter:
+    def __init__(self, collector, host="127.0.0.1", port=9877):
+        self.collector = collector
+        self.host = host
+        self.port = port
+        # extra sources: callables returning (name, kind, help, value, labels) tuples
+        self.sources = []
+        self._payload = b"# EOF\n"
+        self._server = None
+
+    @classmethod
+    def from_config(cls, collector, config):
+        exp = config.get("exporter", {})
+        if not exp.get("enabled", False):
+            return None
+        return cls(collector, host=exp.get("host", "127.0.0.1"), port=exp.get("port", 9877))
+
+    def on_snapshot(self, snap):
+        # serialise once per tick; scrapes share the bytes
+        self._payload = render(snap, self.sources).encode("utf-8")
+
+    def start(self):
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = exporter._payload
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, fmt, *args):
+                pass
+
+        class Server(ThreadingHTTPServer):
+            daemon_threads = True
+            request_queue_size = 128  # many scrapers may connect at once
+
+        self._server = Server((self.host, self.port), Handler)
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        self.collector.subscribe(self.on_snapshot)
+        return self
+
+    def stop(self):
+        self.collector.unsubscribe(self.on_snapshot)
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
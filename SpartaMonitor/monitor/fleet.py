@@ -0,0 +1,395 @@
+import time, socket, struct, asyncio, threading
+from array import array
+from collections.abc import Mapping
+
+from monitor.snapshot import Table
+
+# Remote agents and an aggregator for monitoring a fleet from one window.
+#
+# Agents flatten each collector snapshot into path -> scalar fields and send
+# only the fields that changed since the previous frame. Field paths are
+# assigned small integer ids once per connection (DEFS frames), so a DELTA
+# frame is just typed arrays of (id, value) pairs. The id of a removed path is
+# reused for a later new path, so ids stay within u16 however many paths come
+# and go over a long connection.
+#
+# Frame:  magic "SPMW" | version u8 | type u8 | payload length u32 | payload
+#   HELLO  hostname (utf-8)
+#   DEFS   count u16, then per key: id u16, length u16, utf-8 path
+#   DELTA  t f64, then groups in this order, each "count u16 | ids u16[count] | values":
+#          floats f64[], ints i64[], bools u8[], strings (len u16 + utf-8 each),
+#          nones (no values), empty containers u8[] (0 list, 1 dict), removed (no values)
+
+MAGIC = b"SPMW"
+VERSION = 1
+HEADER = struct.Struct("<4sBBI")
+HELLO, DEFS, DELTA = 1, 2, 3
+MAX_KEYS = 1 << 16  # key ids are u16
+MAX_FRAME = 16 << 20  # the aggregator drops a connection that announces a bigger payload
+
+SEP = "\x1f"   # between path segments
+IDX = "\x1e"   # marks a list index segment
+
+_EMPTY_LIST, _EMPTY_DICT = ("empty", 0), ("empty", 1)
+
+
+def flatten(obj, prefix="", out=None):
+    out = {} if out is None else out
+    if isinstance(obj, Table):
+        # same paths as the {device: {field: value}} dicts it replaced; NaN as None
+        if not obj.names:
+            out[prefix] = _EMPTY_DICT
+        for name, row in zip(obj.names, obj.data.tolist()):
+            base = f"{prefix}{SEP}{name}" if prefix else str(name)
+            for field, v in zip(obj.fields, row):
+                out[f"{base}{SEP}{field}"] = v if v == v else None
+    elif isinstance(obj, (dict, Mapping)):
+        if not obj:
+            out[prefix] = _EMPTY_DICT
+        for k, v in obj.items():
+            flatten(v, f"{prefix}{SEP}{k}" if prefix else str(k), out)
+    elif isinstance(obj, (list, tuple)):
+        if not obj:
+            out[prefix] = _EMPTY_LIST
+        for i, v in enumerate(obj):
+            flatten(v, f"{prefix}{SEP}{IDX}{i}" if prefix else f"{IDX}{i}", out)
+    else:
+        out[prefix] = obj
+    return out
+
+
+def unflatten(flat, paths=None):
+    # paths: optional cache of path -> parsed keys, reused across snapshots
+    paths = {} if paths is None else paths
+    root = {}
+    for path, value in flat.items():
+        keys = paths.get(path)
+        if keys is None:
+            keys = paths[path] = tuple(_key(part) for part in path.split(SEP))
+        node = root
+        for key in keys[:-1]:
+            node = node.setdefault(key, {})
+        if value == _EMPTY_LIST:
+            value = []
+        elif value == _EMPTY_DICT:
+            value = {}
+        node[keys[-1]] = value
+    return _lists(root)
+
+
+def _key(part):
+    return int(part[1:]) if part[:1] == IDX else part
+
+
+def _lists(node):
+    # dicts keyed by consecutive ints back into lists
+    if not isinstance(node, dict):
+        return node
+    items = {k: _lists(v) for k, v in node.items()}
+    if items and all(isinstance(k, int) for k in items):
+        return [items[i] for i in sorted(items)]
+    return items
+
+
+def _frame(kind, payload):
+    return HEADER.pack(MAGIC, VERSION, kind, len(payload)) + payload
+
+
+def _group(ids, values=b""):
+    return struct.pack("<H", len(ids)) + array("H", ids).tobytes() + values
+
+
+class DeltaEncoder:
+    # per-connection agent state: key ids and the last value sent for each key
+    def __init__(self):
+        self.ids = {}
+        self.sent = {}
+        self.free = []  # ids of removed keys; the decoder has dropped them, so they can be redefined
+        self._next = 0
+
+    def encode(self, snap):
+        flat = flatten(snap)
+        new_keys = [k for k in flat if k not in self.ids]
+        if len(new_keys) > len(self.free) + MAX_KEYS - self._next:
+            raise ValueError(f"more than {MAX_KEYS} live fields")
+        frames = []
+        if new_keys:
+            parts = [struct.pack("<H", len(new_keys))]
+            for key in new_keys:
+                if self.free:
+                    self.ids[key] = self.free.pop()
+                else:
+                    self.ids[key], self._next = self._next, self._next + 1
+                raw = key.encode("utf-8")
+                parts.append(struct.pack("<HH", self.ids[key], len(raw)) + raw)
+            frames.append(_frame(DEFS, b"".join(parts)))
+
+        floats, ints, bools, strings, nones, empties = [], [], [], [], [], []
+        sent = self.sent
+        for key, value in flat.items():
+            if key in sent and sent[key] == value and type(sent[key]) is type(value):
+                continue
+            sent[key] = value
+            kid = self.ids[key]
+            if value is None:
+                nones.append(kid)
+            elif isinstance(value, bool):
+                bools.append((kid, value))
+            elif isinstance(value, int) and -(1 << 63) <= value < (1 << 63):
+                ints.append((kid, value))
+            elif isinstance(value, (int, float)):
+                floats.append((kid, float(value)))
+            elif isinstance(value, tuple):
+                empties.append((kid, value[1]))
+            else:
+                strings.append((kid, str(value)))
+        gone = [k for k in sent if k not in flat]
+        removed = [self.ids[k] for k in gone]
+        for key in gone:
+            del sent[key]
+            del self.ids[key]
+        # after this frame, not before: a DEFS in the same frame would be undone by the removal
+        self.free.extend(removed)
+
+        payload = [
+            struct.pack("<d", snap.get("t") or time.time()),
+            _group([i for i, _ in floats], array("d", [v for _, v in floats]).tobytes()),
+            _group([i for i, _ in ints], array("q", [v for _, v in ints]).tobytes()),
+            _group([i for i, _ in bools], bytes(int(v) for _, v in bools)),
+            _group([i for i, _ in strings], b"".join(
+                struct.pack("<H", len(raw)) + raw for raw in (s.encode("utf-8") for _, s in strings))),
+            _group(nones),
+            _group([i for i, _ in empties], bytes(v for _, v in empties)),
+            _group(removed),
+        ]
+        frames.append(_frame(DELTA, b"".join(payload)))
+        return b"".join(frames)
+
+
+class DeltaDecoder:
+    # per-connection aggregator state: id -> key and the reconstructed flat snapshot
+    def __init__(self):
+        self.keys = {}
+        self.flat = {}
+        self.paths = {}  # unflatten() cache
+        self.t = None
+
+    def snapshot(self):
+        return unflatten(self.flat, self.paths)
+
+    def apply_defs(self, payload):
+        (count,), off = struct.unpack_from("<H", payload), 2
+        for _ in range(count):
+            kid, n = struct.unpack_from("<HH", payload, off)
+            off += 4
+            self.keys[kid] = payload[off:off + n].decode("utf-8")
+            off += n
+
+    def _ids(self, payload, off):
+        (n,) = struct.unpack_from("<H", payload, off)
+        off += 2
+        ids = array("H")
+        ids.frombytes(payload[off:off + 2 * n])
+        return [self.keys[i] for i in ids], off + 2 * n
+
+    def apply_delta(self, payload):
+        (self.t,) = struct.unpack_from("<d", payload)
+        flat, off = self.flat, 8
+
+        for code in ("d", "q"):
+            keys, off = self._ids(payload, off)
+            vals = array(code)
+            vals.frombytes(payload[off:off + 8 * len(keys)])
+            off += 8 * len(keys)
+            flat.update(zip(keys, vals))
+
+        keys, off = self._ids(payload, off)
+        flat.update(zip(keys, (bool(b) for b in payload[off:off + len(keys)])))
+        off += len(keys)
+
+        keys, off = self._ids(payload, off)
+        for key in keys:
+            (n,) = struct.unpack_from("<H", payload, off)
+            flat[key] = payload[off + 2:off + 2 + n].decode("utf-8")
+            off += 2 + n
+
+        keys, off = self._ids(payload, off)
+        flat.update(dict.fromkeys(keys))
+
+        keys, off = self._ids(payload, off)
+        flat.update(zip(keys, (_EMPTY_DICT if b else _EMPTY_LIST for b in payload[off:off + len(keys)])))
+        off += len(keys)
+
+        keys, off = self._ids(payload, off)
+        for key in keys:
+            flat.pop(key, None)
+
+
+def parse_address(addr, default_host="127.0.0.1"):
+    # "host:port", ":port", "port" or "unix:/path/to.sock"
+    if addr.startswith("unix:"):
+        return ("unix", addr[5:])
+    host, _, port = addr.rpartition(":")
+    return ("tcp", (host or default_host, int(port)))
+
+
+# --- agent -------------------------------------------------------------------
+
+async def _send_loop(address, snapshots, hostname, stop):
+    kind, target = address
+    while not stop.is_set():
+        try:
+            if kind == "unix":
+                reader, writer = await asyncio.open_unix_connection(target)
+            else:
+                reader, writer = await asyncio.open_connection(*target)
+        except OSError:
+            await asyncio.sleep(2)
+            continue
+        encoder = DeltaEncoder()  # fresh ids and a full resync per connection
+        try:
+            writer.write(_frame(HELLO, hostname.encode("utf-8")))
+            while not stop.is_set():
+                snap = await snapshots.get()
+                writer.write(encoder.encode(snap))
+                await writer.drain()
+        except (OSError, ConnectionError, ValueError, struct.error):
+            # a snapshot that cannot be encoded drops the connection too, so
+            # the next one resyncs from a fresh encoder instead of killing the agent
+            await asyncio.sleep(1)
+        finally:
+            writer.close()
+
+
+def run_agent(address, collector, hostname=None):
+    # blocks; streams every collector snapshot to the aggregator at `address`
+    loop = asyncio.new_event_loop()
+    snapshots = asyncio.Queue(maxsize=1)
+    stop = threading.Event()
+
+    def push(snap):
+        def put():
+            if snapshots.full():
+                snapshots.get_nowait()  # only the newest snapshot matters
+            snapshots.put_nowait(snap)
+        loop.call_soon_threadsafe(put)
+
+    collector.subscribe(push)
+    collector.start()
+    try:
+        loop.run_until_complete(_send_loop(parse_address(address), snapshots,
+                                           hostname or socket.gethostname(), stop))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        collector.stop()
+        loop.close()
+
+
+# --- aggregator --------------------------------------------------------------
+
+class Aggregator:
+    # Accepts many agents on one asyncio loop (own thread). Keeps each host's
+    # flattened state; snapshot(host) rebuilds the nested dict on demand, for
+    # the host being viewed and for the alert rules (Alerts.watch). A host that has sent nothing for
+    # `ttl` seconds is dropped, and subscribers are told (snapshot() -> None).
+    def __init__(self, address, ttl=300.0):
+        self.address = parse_address(address)  # a bare port listens on loopback only
+        self.ttl = ttl
+        self.hosts = {}        # hostname -> DeltaDecoder
+        self.seen = {}         # hostname -> time.monotonic() of its last frame
+        self.frames = 0
+        self._subs = []
+        self._loop = None
+        self._server = None
+        self._ready = threading.Event()
+
+    @classmethod
+    def from_config(cls, config, listen=None):
+        fleet = config.get("fleet", {})
+        return cls(listen or fleet.get("listen"), ttl=fleet.get("host_ttl", 300))
+
+    def subscribe(self, callback):
+        # callback(hostname) after each update from that host, and once when it expires
+        self._subs.append(callback)
+
+    def _notify(self, host):
+        for cb in self._subs:
+            try:
+                cb(host)
+            except Exception:
+                pass
+
+    def snapshot(self, host):
+        dec = self.hosts.get(host)
+        if dec is None:
+            return None
+        snap = unflatten(dict(dec.flat), dec.paths)
+        snap["t"] = dec.t
+        return snap
+
+    async def _handle(self, reader, writer):
+        host = None
+        dec = DeltaDecoder()
+        try:
+            while True:
+                magic, version, kind, length = HEADER.unpack(await reader.readexactly(HEADER.size))
+                if magic != MAGIC or version != VERSION or length > MAX_FRAME:
+                    break
+                payload = await reader.readexactly(length)
+                if kind == HELLO:
+                    host = payload.decode("utf-8")
+                    self.hosts[host] = dec
+                    self.seen[host] = time.monotonic()
+                elif kind == DEFS:
+                    dec.apply_defs(payload)
+                elif kind == DELTA and host is not None:
+                    dec.apply_delta(payload)
+                    self.frames += 1
+                    self.hosts[host] = dec  # back after an expiry
+                    self.seen[host] = time.monotonic()
+                    self._notify(host)
+        except (asyncio.IncompleteReadError, ConnectionError, KeyError, ValueError, struct.error):
+            pass  # a malformed frame (bad ids, truncated groups, UnicodeDecodeError) ends the connection
+        finally:
+            writer.close()
+
+    async def _serve(self):
+        kind, target = self.address
+        if kind == "unix":
+            self._server = await asyncio.start_unix_server(self._handle, target)
+        else:
+            self._server = await asyncio.start_server(self._handle, *target, backlog=1024)
+            self.address = ("tcp", self._server.sockets[0].getsockname()[:2])
+        self._ready.set()
+        reaper = asyncio.ensure_future(self._expire())
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        finally:
+            reaper.cancel()
+
+    async def _expire(self):
+        while True:
+            await asyncio.sleep(max(1.0, self.ttl / 4))
+            cutoff = time.monotonic() - self.ttl
+            for host in [h for h, t in self.seen.items() if t < cutoff]:
+                del self.seen[host]
+                self.hosts.pop(host, None)
+                self._notify(host)
+
+    def start(self):
+        def run():
+            self._loop = asyncio.new_event_loop()
+            try:
+                self._loop.run_until_complete(self._serve())
+            except asyncio.CancelledError:
+                pass
+        threading.Thread(target=run, daemon=True).start()
+        self._ready.wait(5)
+        return self
+
+    def stop(self):
+        if self._loop is not None and self._server is not None:
+            self._loop.call_soon_threadsafe(self._server.close)
@@ -1,22 +1,256 @@
-def get_gpus():
-    try:
-        import GPUtil
-    except Exception:
-        return []
+import os, time, shutil, threading, subprocess
+
+from monitor.snapshot import GPU
+
+# GPU sampling goes through one shared backend instead of forking nvidia-smi on
+# every call:
+#   replay  - FakeBackend replaying recorded nvidia-smi CSV (no GPU needed)
+#   nvml    - in-process NVML via pynvml, when installed
+#   smi     - one long-lived `nvidia-smi --query-gpu ... -lms N` stream
+#   gputil  - GPUtil, polled at most once per interval (last resort; it runs
+#             nvidia-smi per poll, so it is only used when that exists)
+#
+# A recording for the replay backend is just the stream's stdout:
+#   nvidia-smi --query-gpu=index,name,utilization.gpu,memory.total,memory.used,temperature.gpu \
+#       --format=csv,noheader,nounits -l 1 > gpus.csv
+
+QUERY_FIELDS = "index,name,utilization.gpu,memory.total,memory.used,temperature.gpu"
 
+_settings = {"backend": "auto", "replay": None, "interval_ms": 1000}
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def _num(text):
     try:
-        gpus = GPUtil.getGPUs()
-    except Exception:
+        return float(text)
+    except ValueError:
+        return None  # "[N/A]", "[Not Supported]"
+
+
+def parse_smi_line(line):
+    parts = [p.strip() for p in line.split(",")]
+    if len(parts) != 6 or not parts[0].isdigit():
+        return None
+    idx, name, util, mem_total, mem_used, temp = parts
+    return GPU(int(idx), name, _num(util) or 0.0, int(_num(mem_total) or 0), int(_num(mem_used) or 0), _num(temp))
+
+
+class _Batcher:
+    # nvidia-smi prints one line per GPU per interval. A batch is complete at
+    # the highest device index seen so far, so it goes out as soon as its last
+    # line arrives; until that index is known (the first batch), or if a GPU
+    # drops out, a batch also ends when the index stops increasing. One line
+    # can do both (a single GPU), so feed() returns a list of batches.
+    def __init__(self):
+        self._rows = []
+        self._last = None
+
+    def feed(self, line):
+        row = parse_smi_line(line)
+        if row is None:
+            return []
+        done = []
+        if self._rows and row["id"] <= self._rows[-1]["id"]:
+            done.append(self._rows)
+            self._rows = []
+            self._last = done[-1][-1]["id"]
+        self._rows.append(row)
+        if self._last is not None and row["id"] >= self._last:
+            done.append(self._rows)
+            self._rows = []
+            self._last = row["id"]
+        return done
+
+    def flush(self):
+        done, self._rows = self._rows, []
+        return done
+
+
+class NullBackend:
+    name = "none"
+
+    def get(self):
         return []
 
-    result = []
-    for g in gpus:
-        result.append({
-            "id": g.id,
-            "name": g.name,
-            "load_percent": float(g.load) * 100.0 if g.load is not None else 0.0,
-            "mem_total_mb": int(g.memoryTotal),
-            "mem_used_mb": int(g.memoryUsed),
-            "temp_c": getattr(g, "temperature", None),
-        })
-    return result
+    def close(self):
+        pass
+
+
+class NvmlBackend(NullBackend):
+    name = "nvml"
+
+    def __init__(self):
+        import pynvml
+        pynvml.nvmlInit()
+        self._nvml = pynvml
+        self._handles = [pynvml.nvmlDeviceGetHandleByIndex(i) for i in range(pynvml.nvmlDeviceGetCount())]
+        self._names = [pynvml.nvmlDeviceGetName(h) for h in self._handles]
+
+    def get(self):
+        nvml, result = self._nvml, []
+        for i, h in enumerate(self._handles):
+            try:
+                util = nvml.nvmlDeviceGetUtilizationRates(h)
+                mem = nvml.nvmlDeviceGetMemoryInfo(h)
+                temp = nvml.nvmlDeviceGetTemperature(h, nvml.NVML_TEMPERATURE_GPU)
+            except nvml.NVMLError:
+                continue
+            name = self._names[i]
+            result.append(GPU(i, name.decode() if isinstance(name, bytes) else name, float(util.gpu),
+                              int(mem.total // (1024 * 1024)), int(mem.used // (1024 * 1024)), float(temp)))
+        return result
+
+    def close(self):
+        try:
+            self._nvml.nvmlShutdown()
+        except Exception:
+            pass
+
+
+class SmiStreamBackend(NullBackend):
+    name = "smi"
+
+    def __init__(self, interval_ms=1000, exe="nvidia-smi"):
+        self.cmd = [exe, f"--query-gpu={QUERY_FIELDS}", "--format=csv,noheader,nounits", f"-lms={interval_ms}"]
+        self.latest = []
+        self._proc = None
+        self._next_start = 0.0
+        self._start()
+
+    def _start(self):
+        self._proc = subprocess.Popen(self.cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                      text=True, bufsize=1)
+        threading.Thread(target=self._read, args=(self._proc,), daemon=True).start()
+
+    def _read(self, proc):
+        batcher = _Batcher()
+        for line in proc.stdout:
+            for batch in batcher.feed(line):
+                self.latest = batch
+        proc.wait()
+
+    def get(self):
+        # restart a dead stream, at most every 10 s
+        if self._proc.poll() is not None and time.monotonic() >= self._next_start:
+            self._next_start = time.monotonic() + 10
+            try:
+                self._start()
+            except OSError:
+                self.latest = []
+        return self.latest
+
+    def close(self):
+        if self._proc and self._proc.poll() is None:
+            self._proc.terminate()
+
+
+class GPUtilBackend(NullBackend):
+    name = "gputil"
+
+    def __init__(self, interval_ms=1000):
+        import GPUtil
+        self._gputil = GPUtil
+        self._interval = interval_ms / 1000.0
+        self._cached, self._at = [], None
+
+    def get(self):
+        now = time.monotonic()
+        if self._at is None or now - self._at >= self._interval:
+            self._at = now
+            try:
+                gpus = self._gputil.getGPUs()
+            except Exception:
+                gpus = []
+            self._cached = [GPU(g.id, g.name, float(g.load) * 100.0 if g.load is not None else 0.0,
+                                int(g.memoryTotal), int(g.memoryUsed), getattr(g, "temperature", None))
+                            for g in gpus]
+        return self._cached
+
+
+class FakeBackend(NullBackend):
+    """Replays recorded nvidia-smi CSV output, one batch per get() call, looping.
+
+    Every interval of the recording is one batch, for one GPU or several
+    (python -m doctest monitor/gpu.py):
+
+    >>> one = [f"0, T4, {k}, 100, 10, 40" for k in range(4)]
+    >>> [[g.load_percent for g in b] for b in FakeBackend(lines=one).batches]
+    [[0.0], [1.0], [2.0], [3.0]]
+    >>> two = [f"{i}, T4, {k}, 100, 10, 40" for k in range(3) for i in range(2)]
+    >>> [[(g.id, g.load_percent) for g in b] for b in FakeBackend(lines=two).batches]
+    [[(0, 0.0), (1, 0.0)], [(0, 1.0), (1, 1.0)], [(0, 2.0), (1, 2.0)]]
+    """
+    name = "replay"
+
+    def __init__(self, path=None, lines=None, loop=True):
+        if lines is None:
+            with open(path, encoding="utf-8") as f:
+                lines = f.readlines()
+        batcher = _Batcher()
+        self.batches = [b for line in lines for b in batcher.feed(line)]
+        last = batcher.flush()
+        if last:
+            self.batches.append(last)
+        self.loop = loop
+        self._pos = 0
+
+    def get(self):
+        if not self.batches:
+            return []
+        if self._pos >= len(self.batches):
+            if not self.loop:
+                return self.batches[-1]
+            self._pos = 0
+        batch = self.batches[self._pos]
+        self._pos += 1
+        return batch
+
+
+def _make_backend():
+    kind = _settings.get("backend", "auto")
+    replay = _settings.get("replay") or os.environ.get("SPARTA_GPU_REPLAY")
+    interval_ms = int(_settings.get("interval_ms", 1000))
+
+    if replay and kind in ("auto", "replay"):
+        return FakeBackend(os.path.expanduser(replay))
+    if kind in ("auto", "nvml"):
+        try:
+            return NvmlBackend()
+        except Exception:
+            pass
+    if kind in ("auto", "smi"):
+        exe = shutil.which("nvidia-smi")
+        if exe:
+            try:
+                return SmiStreamBackend(interval_ms, exe)
+            except OSError:
+                pass
+    if kind in ("auto", "gputil") and shutil.which("nvidia-smi"):
+        try:
+            return GPUtilBackend(interval_ms)
+        except Exception:
+            pass
+    return NullBackend()
+
+
+def configure(settings):
+    # call before the first get_gpus(); resets any running backend
+    global _backend
+    with _backend_lock:
+        _settings.update(settings or {})
+        if _backend is not None:
+            _backend.close()
+            _backend = None
+
+
+def get_backend():
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = _make_backend()
+        return _backend
+
+
+def get_gpus():
+    return list(get_backend().get())
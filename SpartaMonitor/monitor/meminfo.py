@@ -0,0 +1,69 @@
+import os, re
+
+from monitor import procfs
+
+# Linux fast paths for memory detail, one read per file per tick:
+#   /proc/meminfo            "Name:   value kB" lines -> {name: bytes} (HugePages_* are counts)
+#   /proc/vmstat             cumulative event counters (faults, swap-in/out, OOM kills)
+#   /proc/pressure/{cpu,memory,io}
+#                            PSI: share of wall time some / all non-idle tasks were
+#                            stalled on the resource, as 10/60/300 s averages plus a
+#                            cumulative stall total in microseconds
+# meminfo alone also gives what psutil.virtual_memory() and swap_memory()
+# report, so the collector does not read it a second time through psutil.
+
+MEMINFO = "/proc/meminfo"
+VMSTAT = "/proc/vmstat"
+PRESSURE = "/proc/pressure"
+RESOURCES = ("cpu", "memory", "io")
+
+# vmstat counters handed to CounterRates, in this order
+VM_COUNTERS = ("pgfault", "pgmajfault", "pswpin", "pswpout", "oom_kill")
+
+_MEMINFO_LINE = re.compile(rb"^([\w()]+):\s+(\d+)( kB)?", re.M)
+_PSI_LINE = re.compile(rb"(some|full) avg10=([\d.]+) avg60=([\d.]+) avg300=([\d.]+) total=(\d+)")
+
+
+def available():
+    return procfs.available(MEMINFO) and procfs.available(VMSTAT)
+
+
+def pressure_available():
+    return procfs.available(os.path.join(PRESSURE, "memory"))
+
+
+class MemInfoReader(procfs.ProcFile):
+    def __init__(self, path=MEMINFO):
+        super().__init__(path, 1 << 12)
+
+    def read(self):
+        return {k.decode(): int(v) * 1024 if kb else int(v) for k, v, kb in _MEMINFO_LINE.findall(self.raw())}
+
+
+class VmStatReader(procfs.ProcFile):
+    def __init__(self, path=VMSTAT):
+        super().__init__(path, 1 << 13)
+
+    def read(self):
+        # -> [value or None for each of VM_COUNTERS]
+        data = self.raw().tobytes()
+        return [procfs.field(data, key.encode()) for key in VM_COUNTERS]
+
+
+class PressureReader:
+    # one ProcFile per resource; kernels without PSI (or with it disabled) have none
+    def __init__(self, root=PRESSURE):
+        self.files = {r: procfs.ProcFile(os.path.join(root, r), 256)
+                      for r in RESOURCES if procfs.available(os.path.join(root, r))}
+
+    def read(self):
+        # -> {resource: {"some"|"full": (avg10, avg60, avg300, total µs)}}
+        out = {}
+        for resource, f in self.files.items():
+            out[resource] = {kind.decode(): (float(a10), float(a60), float(a300), int(total))
+                             for kind, a10, a60, a300, total in _PSI_LINE.findall(f.raw())}
+        return out
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
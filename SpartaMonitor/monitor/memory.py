@@ -1,17 +1,111 @@
+import mmap
+import numpy as np
 import psutil
 
-def get_overview():
-    vm = psutil.virtual_memory()
-    sw = psutil.swap_memory()
+from monitor import meminfo
+from monitor.rates import CounterRates
+
+# Memory usage plus the detail behind it: what "used" is made of (page cache,
+# buffers, slab, dirty/writeback, hugepages), fault and swap-in/out rates,
+# and, in get_pressure(), the kernel's PSI stall percentages. On Linux it all
+# comes from /proc (see meminfo.py); elsewhere psutil supplies what it can.
+DETAIL = {  # snapshot key -> /proc/meminfo name
+    "cached": "Cached", "buffers": "Buffers", "shmem": "Shmem", "anon": "AnonPages", "mapped": "Mapped",
+    "slab": "Slab", "slab_reclaimable": "SReclaimable", "dirty": "Dirty", "writeback": "Writeback",
+    "page_tables": "PageTables", "committed": "Committed_AS", "commit_limit": "CommitLimit",
+    "hugepages_total": "HugePages_Total", "hugepages_free": "HugePages_Free", "hugepage_size": "Hugepagesize",
+}
+_VM_KEYS = {"pgfault": "faults_ps", "pgmajfault": "major_faults_ps", "pswpin": "swap_in_ps",
+            "pswpout": "swap_out_ps"}
+
+_vm_rates = CounterRates(meminfo.VM_COUNTERS)
+_psi_rates = CounterRates(("some", "full"))
+_readers = None
+_use_proc = meminfo.available()
+_psi = None
+_use_psi = meminfo.pressure_available()
+
+
+def _percent(part, total):
+    return round(part / total * 100, 1) if total else 0.0
+
+
+def _from_proc():
+    global _readers
+    if _readers is None:
+        _readers = (meminfo.MemInfoReader(), meminfo.VmStatReader())
+    info = _readers[0].read()
+    vm = np.array([[np.nan if v is None else v for v in _readers[1].read()]], dtype=np.float64)
+
+    # same arithmetic as psutil.virtual_memory() / swap_memory() on Linux
+    total = info["MemTotal"]
+    avail = info.get("MemAvailable", info["MemFree"])
+    sw_total, sw_free = info.get("SwapTotal", 0), info.get("SwapFree", 0)
+    detail = {k: info.get(name) for k, name in DETAIL.items()}
+    oom = vm[0, meminfo.VM_COUNTERS.index("oom_kill")]
     return {
-        "total": vm.total,
-        "available": vm.available,
-        "used": vm.used,
-        "percent": vm.percent,
-        "swap": {
-            "total": sw.total,
-            "used": sw.used,
-            "free": sw.free,
-            "percent": sw.percent,
-        }
-    }
+        "total": total, "available": avail, "used": total - avail, "percent": _percent(total - avail, total),
+        "swap": {"total": sw_total, "used": sw_total - sw_free, "free": sw_free,
+                 "percent": _percent(sw_total - sw_free, sw_total)},
+        "detail": detail,
+    }, vm, None if oom != oom else int(oom)
+
+
+def _from_psutil():
+    vm, sw = psutil.virtual_memory(), psutil.swap_memory()
+    detail = {k: getattr(vm, k, None) for k in DETAIL}
+    # psutil counts swap traffic in bytes; the rates are in pages like vmstat's
+    pages = [np.nan, np.nan, sw.sin / mmap.PAGESIZE, sw.sout / mmap.PAGESIZE, np.nan]
+    return {
+        "total": vm.total, "available": vm.available, "used": vm.used, "percent": vm.percent,
+        "swap": {"total": sw.total, "used": sw.used, "free": sw.free, "percent": sw.percent},
+        "detail": detail,
+    }, np.array([pages], dtype=np.float64), None
+
+
+def get_overview():
+    global _use_proc
+    out = None
+    if _use_proc:
+        try:
+            out, counters, oom = _from_proc()
+        except (OSError, KeyError, ValueError):
+            _use_proc = False
+    if out is None:
+        out, counters, oom = _from_psutil()
+    _, rates = _vm_rates.update_array(["vm"], counters)
+    out["vm"] = {"oom_kills": oom}
+    for name, key in _VM_KEYS.items():
+        v = rates[0, meminfo.VM_COUNTERS.index(name)]
+        out["vm"][key] = None if v != v else float(v)
+    return out
+
+
+def get_pressure():
+    # {resource: {"some"|"full": {"avg10", "avg60", "avg300", "now"}}} in %, or None without PSI.
+    # "now" is the stall share since the previous sample, from the cumulative totals
+    global _psi, _use_psi
+    if not _use_psi:
+        return None
+    try:
+        if _psi is None:
+            _psi = meminfo.PressureReader()
+        psi = _psi.read()
+    except OSError:
+        _use_psi = False
+        return None
+    names = list(psi)
+    totals = np.array([[psi[r].get(k, (0, 0, 0, np.nan))[3] for k in ("some", "full")] for r in names],
+                      dtype=np.float64)
+    _, rates = _psi_rates.update_array(names, totals)
+    out = {}
+    for i, resource in enumerate(names):
+        out[resource] = {}
+        for j, kind in enumerate(("some", "full")):
+            if kind not in psi[resource]:
+                continue
+            a10, a60, a300, _ = psi[resource][kind]
+            # µs of stall per second of wall time -> %
+            out[resource][kind] = {"avg10": a10, "avg60": a60, "avg300": a300,
+                                   "now": round(min(100.0, float(rates[i, j]) / 1e4), 2)}
+    return out
@@ -0,0 +1,85 @@
+from monitor.snapshot import column
+
+# Flat scalar series derived from a collector snapshot. The history store and
+# the in-memory ring buffers both record these, in this order.
+SERIES = (
+    "cpu.percent",
+    "mem.percent",
+    "swap.percent",
+    "disk.max_percent",
+    "disk.read_Bps",
+    "disk.write_Bps",
+    "net.tx_bps",
+    "net.rx_bps",
+    "disk.iops",
+    "disk.await_ms",
+    "disk.util_percent",
+    "cpu.iowait",
+    "cpu.steal",
+    "cpu.ctx_switches_ps",
+    "cpu.procs_running",
+    "mem.cache_percent",
+    "mem.major_faults_ps",
+    "mem.swap_io_ps",
+    "psi.cpu_some",
+    "psi.memory_some",
+    "psi.memory_full",
+    "psi.io_some",
+    "psi.io_full",
+    "monitor.cpu_percent",
+    "monitor.rss_mb",
+)
+
+_NAN = float("nan")
+
+
+def _num(v):
+    return _NAN if v is None else v
+
+
+def _share(part, total):
+    return part / total * 100 if part is not None and total else _NAN
+
+
+def _psi(psi, resource, kind):
+    return _num(((psi.get(resource) or {}).get(kind) or {}).get("avg10"))
+
+
+def values(snap) -> list:
+    cpu = snap.get("cpu") or {}
+    mem = snap.get("memory") or {}
+    disks = snap.get("disks") or []
+    io = snap.get("disk_io") or {}
+    net = snap.get("network") or {}
+    per_disk = io.get("per_disk") or {}
+    iops = column(per_disk, "read_iops") + column(per_disk, "write_iops")
+    vm = mem.get("vm") or {}
+    psi = snap.get("pressure") or {}
+    own = (snap.get("monitor") or {}).get("process") or {}
+    return [
+        cpu.get("percent", _NAN),
+        mem.get("percent", _NAN),
+        (mem.get("swap") or {}).get("percent", _NAN),
+        max((d["percent"] for d in disks if d.get("percent") is not None), default=_NAN),
+        io.get("read_rate_Bps", _NAN),
+        io.get("write_rate_Bps", _NAN),
+        net.get("tx_rate_bps", _NAN),
+        net.get("rx_rate_bps", _NAN),
+        float(iops.sum()) if len(iops) else _NAN,
+        float(column(per_disk, "await_ms").max()) if len(iops) else _NAN,
+        float(column(per_disk, "util_percent").max()) if len(iops) else _NAN,
+        (cpu.get("times") or {}).get("iowait", _NAN),
+        (cpu.get("times") or {}).get("steal", _NAN),
+        cpu.get("ctx_switches_ps", _NAN),
+        _NAN if cpu.get("procs_running") is None else cpu["procs_running"],
+        _share((mem.get("detail") or {}).get("cached"), mem.get("total")),
+        _num(vm.get("major_faults_ps")),
+        _num(vm.get("swap_in_ps")) + _num(vm.get("swap_out_ps")),
+        _psi(psi, "cpu", "some"),
+        _psi(psi, "memory", "some"),
+        _psi(psi, "memory", "full"),
+        _psi(psi, "io", "some"),
+        _psi(psi, "io", "full"),
+        _num(own.get("cpu_percent")),
+        own["rss"] / 2**20 if own.get("rss") is not None else _NAN,
+    ]
@@ -1,45 +1,45 @@
-import time
+import numpy as np
 import psutil
 
-_last = {
-    "t": None,
-    "bytes_sent": 0,
-    "bytes_recv": 0,
-}
+from monitor.rates import CounterRates
+from monitor.snapshot import Table
+
+# per-NIC counters -> rates, shared by every consumer of the snapshot
+_rates = CounterRates(("bytes_sent", "bytes_recv", "packets_sent", "packets_recv",
+                       "errin", "errout", "dropin", "dropout"))
+NIC_FIELDS = ("tx_bps", "rx_bps", "tx_pps", "rx_pps", "errors_ps", "drops_ps")
 
-def get_overview():
-    # global rates across all interfaces
-    global _last
-    now = time.time()
-    io = psutil.net_io_counters()
-    if _last["t"] is None:
-        _last.update({"t": now, "bytes_sent": io.bytes_sent, "bytes_recv": io.bytes_recv})
-        tx_rate = rx_rate = 0.0
-    else:
-        dt = max(1e-6, now - _last["t"])
-        tx_rate = (io.bytes_sent - _last["bytes_sent"]) * 8.0 / dt  # bits per sec
-        rx_rate = (io.bytes_recv - _last["bytes_recv"]) * 8.0 / dt
-        _last.update({"t": now, "bytes_sent": io.bytes_sent, "bytes_recv": io.bytes_recv})
 
+def get_overview():
+    counters = psutil.net_io_counters(pernic=True, nowrap=False)
+    names, r = _rates.update(counters)
+    tx, rx = r[:, 0] * 8.0, r[:, 1] * 8.0  # bits per sec
+    table = np.column_stack((tx, rx, r[:, 2], r[:, 3], r[:, 4] + r[:, 5], r[:, 6] + r[:, 7]))
     return {
-        "tx_rate_bps": tx_rate,
-        "rx_rate_bps": rx_rate,
-        "bytes_sent": io.bytes_sent,
-        "bytes_recv": io.bytes_recv,
+        "tx_rate_bps": float(tx.sum()),
+        "rx_rate_bps": float(rx.sum()),
+        "bytes_sent": sum(c.bytes_sent for c in counters.values()),
+        "bytes_recv": sum(c.bytes_recv for c in counters.values()),
+        "per_nic": Table(names, NIC_FIELDS, table),
     }
 
+
 def get_interfaces():
+    # byte totals come from the counters get_overview() last fed to the shared
+    # rate engine, not from a second read of every NIC
     addrs = psutil.net_if_addrs()
-    ios = psutil.net_io_counters(pernic=True)
+    if not _rates.devices:
+        get_overview()
+    totals = dict(zip(_rates.devices, _rates.counters[:, :2].tolist()))
     info = {}
     for name, addr_list in addrs.items():
         ipv4 = [a.address for a in addr_list if a.family.name == "AF_INET"]
         ipv6 = [a.address for a in addr_list if a.family.name == "AF_INET6"]
-        io = ios.get(name)
+        sent, recv = totals.get(name, (0, 0))
         info[name] = {
             "ipv4": ipv4,
             "ipv6": ipv6,
-            "bytes_sent": io.bytes_sent if io else 0,
-            "bytes_recv": io.bytes_recv if io else 0,
+            "bytes_sent": int(sent),
+            "bytes_recv": int(recv),
         }
     return info
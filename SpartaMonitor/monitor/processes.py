@@ -0,0 +1,132 @@
+import time, heapq
+import psutil
+
+from monitor.snapshot import Proc
+
+# Incremental process scanner. psutil.Process objects are cached by PID across
+# ticks and evicted when the PID exits. A refresh reads only the sort column for
+# every process, then fetches the remaining columns (under one oneshot()) for
+# the top-N rows that will actually be shown.
+
+SORT_KEYS = ("cpu_percent", "rss", "io_rate", "threads")
+
+_GONE = (psutil.NoSuchProcess, psutil.ZombieProcess)
+
+
+class _Entry:
+    __slots__ = ("proc", "name", "cpu_time", "cpu_t", "io_bytes", "io_t",
+                 "cpu_percent", "rss", "io_rate", "threads")
+
+    def __init__(self, proc, name):
+        self.proc = proc
+        self.name = name
+        self.cpu_time = self.cpu_t = self.io_bytes = self.io_t = None
+        self.cpu_percent = 0.0
+        self.rss = 0
+        self.io_rate = 0.0
+        self.threads = 0
+
+
+class ProcessScanner:
+    def __init__(self, top_n=50, sort_key="cpu_percent"):
+        self.top_n = top_n
+        self.sort_key = sort_key
+        self._procs = {}
+
+    def _new_entry(self, pid):
+        try:
+            proc = psutil.Process(pid)
+        except _GONE:
+            return None
+        try:
+            return _Entry(proc, proc.name())
+        except _GONE:
+            return None
+        except psutil.AccessDenied:
+            return _Entry(proc, f"[{pid}]")
+
+    # --- per-column readers; each updates the entry and assumes oneshot() is active
+    @staticmethod
+    def _read_cpu(e, now):
+        t = e.proc.cpu_times()
+        total = t.user + t.system
+        if e.cpu_time is not None and total >= e.cpu_time and now > e.cpu_t:
+            e.cpu_percent = (total - e.cpu_time) / (now - e.cpu_t) * 100.0
+        else:
+            e.cpu_percent = 0.0  # first sample, or the PID was reused
+        e.cpu_time, e.cpu_t = total, now
+
+    @staticmethod
+    def _read_rss(e, now):
+        e.rss = e.proc.memory_info().rss
+
+    @staticmethod
+    def _read_threads(e, now):
+        e.threads = e.proc.num_threads()
+
+    @staticmethod
+    def _read_io(e, now):
+        try:
+            io = e.proc.io_counters()
+        except (psutil.AccessDenied, AttributeError):
+            return
+        total = io.read_bytes + io.write_bytes
+        if e.io_bytes is not None and total >= e.io_bytes and now > e.io_t:
+            e.io_rate = (total - e.io_bytes) / (now - e.io_t)
+        else:
+            e.io_rate = 0.0
+        e.io_bytes, e.io_t = total, now
+
+    _READERS = {
+        "cpu_percent": _read_cpu,
+        "rss": _read_rss,
+        "io_rate": _read_io,
+        "threads": _read_threads,
+    }
+
+    def _read(self, pid, e, readers, now):
+        try:
+            if len(readers) == 1:
+                # a single attribute gains nothing from oneshot()'s cache setup
+                readers[0](e, now)
+            else:
+                with e.proc.oneshot():
+                    for read in readers:
+                        read(e, now)
+            return True
+        except _GONE:
+            self._procs.pop(pid, None)
+            return False
+        except psutil.AccessDenied:
+            return True
+
+    def scan(self):
+        now = time.monotonic()
+        pids = psutil.pids()
+
+        # evict exited PIDs
+        alive = set(pids)
+        for pid in [p for p in self._procs if p not in alive]:
+            del self._procs[pid]
+
+        sort_key = self.sort_key if self.sort_key in self._READERS else "cpu_percent"
+        first = [self._READERS[sort_key]]
+        for pid in pids:
+            e = self._procs.get(pid)
+            if e is None:
+                e = self._new_entry(pid)
+                if e is None:
+                    continue
+                self._procs[pid] = e
+            self._read(pid, e, first, now)
+
+        top = heapq.nlargest(self.top_n, self._procs.items(), key=lambda kv: getattr(kv[1], sort_key))
+
+        rest = [r for k, r in self._READERS.items() if k != sort_key]
+        rows = []
+        for pid, e in top:
+            if not self._read(pid, e, rest, now):
+                continue
+            rows.append(Proc(pid, e.name, e.cpu_percent, e.rss, e.io_rate, e.threads))
+
+        return {"count": len(self._procs), "sort": sort_key, "top": rows}
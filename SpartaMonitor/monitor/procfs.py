@@ -0,0 +1,42 @@
+import os
+
+# Shared pieces of the Linux procfs fast paths (diskstats.py, procstat.py,
+# meminfo.py): a file kept open and re-read with one preadv() per tick into a
+# reused buffer, and pulling single counters out of the raw bytes.
+
+
+class ProcFile:
+    def __init__(self, path, size=1 << 14):
+        self.path = path
+        self._fd = os.open(path, os.O_RDONLY)
+        self._buf = bytearray(size)
+
+    def raw(self):
+        # procfs regenerates the file on every read at offset 0; grow the
+        # buffer until the whole file fits
+        while True:
+            n = os.preadv(self._fd, [self._buf], 0)
+            if n < len(self._buf):
+                return memoryview(self._buf)[:n]
+            self._buf = bytearray(len(self._buf) * 2)
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+def available(path):
+    return hasattr(os, "preadv") and os.access(path, os.R_OK)
+
+
+def field(data, key):
+    # first number after b"\n<key> ", e.g. the total on the (very long) intr line
+    start = data.find(b"\n" + key + b" ")
+    if start < 0:
+        return None
+    start += len(key) + 2
+    end = start
+    while end < len(data) and 48 <= data[end] <= 57:
+        end += 1
+    return int(data[start:end]) if end > start else None
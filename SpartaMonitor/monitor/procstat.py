@@ -0,0 +1,63 @@
+import numpy as np
+
+from monitor import procfs
+
+# Linux fast path for CPU time: one preadv() of /proc/stat into a reused
+# buffer per tick. The cpu/cpuN lines become one (rows, fields) NumPy table of
+# cumulative ticks; the system-wide counters below them (context switches,
+# interrupts, runnable and blocked tasks) come from the same read.
+#
+# cpu line fields, in USER_HZ ticks:
+#   user nice system idle iowait irq softirq steal guest guest_nice
+# guest and guest_nice are already counted in user and nice, so they are not
+# added to the total. Kernels older than 2.6.33 print fewer fields; the
+# missing ones read as 0.
+
+PATH = "/proc/stat"
+FIELDS = ("user", "nice", "system", "idle", "iowait", "irq", "softirq", "steal", "guest", "guest_nice")
+TOTAL = slice(0, 8)  # user .. steal
+IDLE = (FIELDS.index("idle"), FIELDS.index("iowait"))
+
+
+def available(path=PATH):
+    return procfs.available(path)
+
+
+class ProcStatReader(procfs.ProcFile):
+    def __init__(self, path=PATH, size=1 << 15):
+        super().__init__(path, size)
+        self._rows = None  # number of cpu lines, fixed until a CPU is hotplugged
+        self._names = []
+
+    def read(self):
+        # -> (names, ticks (rows, len(FIELDS)) float64, {ctxt, intr, procs_running, procs_blocked})
+        data = self.raw().tobytes()
+        end = data.find(b"\nintr ")
+        if end < 0:
+            end = data.find(b"\nctxt ")
+        lines = data[:end].split(b"\n")
+        lines = [line for line in lines if line.startswith(b"cpu")]
+        tokens = b" ".join(lines).split()
+        width = len(lines[0].split())
+        if len(lines) != self._rows:
+            self._rows = len(lines)
+            self._names = [line.split(None, 1)[0].decode() for line in lines]
+        del tokens[::width]  # the cpu names
+        table = np.array(list(map(int, tokens)), dtype=np.float64).reshape(len(lines), width - 1)
+        n = min(width - 1, len(FIELDS))
+        ticks = np.zeros((len(lines), len(FIELDS)))
+        ticks[:, :n] = table[:, :n]
+        counters = {"ctxt": procfs.field(data, b"ctxt"), "intr": procfs.field(data, b"intr"),
+                    "procs_running": procfs.field(data, b"procs_running"),
+                    "procs_blocked": procfs.field(data, b"procs_blocked")}
+        return self._names, ticks, counters
+
+
+def shares(rates):
+    # per-row tick rates -> (busy %, per-field % of the row's total)
+    total = rates[:, TOTAL].sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pct = np.where(total[:, None] > 0, rates / total[:, None] * 100.0, 0.0)
+    busy = 100.0 - pct[:, IDLE[0]] - pct[:, IDLE[1]]
+    busy[total <= 0] = 0.0
+    return busy, pct
@@ -0,0 +1,76 @@
+import time
+import numpy as np
+
+# One counter-delta engine for every "bytes so far" style counter (NICs,
+# disks). update() takes a {device: counters} sample, e.g. psutil's
+# net_io_counters(pernic=True, nowrap=False), and turns the whole table into
+# per-second rates with a handful of array operations:
+#   - rows are matched to the previous sample by device name, so hot-plugged
+#     devices start at 0 and vanished ones are evicted;
+#   - a counter that went backwards is treated as a 32-bit wrap when it was in
+#     the top half of the 32-bit range, otherwise as a reset (the new value is
+#     the delta).
+
+WRAP_32 = float(2 ** 32)
+
+
+class CounterRates:
+    def __init__(self, fields):
+        self.fields = tuple(fields)
+        self.devices = []
+        self.rates = np.zeros((0, len(self.fields)))
+        self._index = {}
+        self._prev = np.zeros((0, len(self.fields)))
+        self._cols = None
+        self._t = None
+
+    def _columns(self, sample):
+        # positions of self.fields in the sample's namedtuple; missing -> NaN column
+        names = getattr(sample, "_fields", self.fields)
+        self._cols = [names.index(f) if f in names else None for f in self.fields]
+
+    def update(self, counters, now=None):
+        # -> (devices, rates) with rates shaped (devices, fields), per second
+        devices = list(counters)
+        cur = np.full((len(devices), len(self.fields)), np.nan)
+        if devices:
+            if self._cols is None:
+                self._columns(next(iter(counters.values())))
+            raw = np.array(list(counters.values()), dtype=np.float64)
+            for j, c in enumerate(self._cols):
+                if c is not None:
+                    cur[:, j] = raw[:, c]
+        return self.update_array(devices, cur, now)
+
+    def update_array(self, devices, cur, now=None):
+        # same as update() for a ready (devices, fields) float64 table
+        now = time.monotonic() if now is None else now
+        if devices == self.devices:
+            prev = self._prev
+        else:
+            rows = np.array([self._index.get(d, -1) for d in devices], dtype=np.intp)
+            prev = np.full_like(cur, np.nan)
+            known = rows >= 0
+            prev[known] = self._prev[rows[known]]
+
+        delta = cur - prev
+        back = delta < 0
+        if back.any():
+            wrap = back & (prev >= WRAP_32 / 2) & (prev < WRAP_32) & (cur < WRAP_32)
+            delta = np.where(wrap, delta + WRAP_32, np.where(back, cur, delta))
+        dt = now - self._t if self._t is not None and now > self._t else np.nan
+        # first sighting of a device (or first sample): 0; fields the OS lacks stay NaN
+        rates = np.where(np.isnan(cur), np.nan, np.nan_to_num(delta / dt, nan=0.0))
+
+        if devices != self.devices:
+            self._index = {d: i for i, d in enumerate(devices)}
+        self.devices, self.rates, self._prev, self._t = devices, rates, cur, now
+        return devices, rates
+
+    @property
+    def counters(self):
+        # the latest raw counter table, rows in self.devices order
+        return self._prev
+
+    def column(self, field):
+        return self.rates[:, self.fields.index(field)]
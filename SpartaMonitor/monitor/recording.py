@@ -0,0 +1,210 @@
+import os, time, zlib, struct, threading
+
+from monitor.collector import SnapshotSource
+from monitor.fleet import HEADER, DEFS, DELTA, DeltaEncoder, DeltaDecoder
+from utils.config import parse_duration
+
+# Snapshot recordings for offline analysis and replay.
+#
+# A recording is a file header followed by independently decodable chunks.
+# Each chunk holds a run of snapshots delta-encoded exactly like the fleet
+# wire format (fleet.py: DEFS + DELTA frames, fresh key ids per chunk) and
+# zlib-compressed as one block, so consecutive snapshots, which mostly repeat,
+# compress well. Chunk headers carry the first and last timestamps, which
+# lets a reader index the file by time without decompressing it. A torn
+# trailing chunk (the recorder was killed) is ignored.
+#
+# File:   magic "SPMR" | version u8
+# Chunk:  compressed length u32 | snapshots u32 | first t f64 | last t f64 | zlib(frames)
+
+MAGIC = b"SPMR"
+VERSION = 1
+FILE_HEADER = struct.Struct("<4sB")
+CHUNK = struct.Struct("<IIdd")
+
+
+class Recorder:
+    # collector subscriber: append(snap) buffers, every `chunk_snapshots`
+    # snapshots (or `chunk_seconds`) one compressed chunk is written
+    def __init__(self, path, chunk_snapshots=60, chunk_seconds=60.0, level=6):
+        self.path = os.path.expanduser(path)
+        self.chunk_snapshots = chunk_snapshots
+        self.chunk_seconds = chunk_seconds
+        self.level = level
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._f = open(self.path, "ab")
+        if self._f.tell() == 0:
+            self._f.write(FILE_HEADER.pack(MAGIC, VERSION))
+        self._lock = threading.Lock()
+        self._reset()
+
+    @classmethod
+    def from_config(cls, config):
+        rec = config.get("recording", {})
+        if not rec.get("path"):
+            return None
+        return cls(rec["path"], chunk_snapshots=rec.get("chunk_snapshots", 60),
+                   chunk_seconds=rec.get("chunk_seconds", 60.0), level=rec.get("level", 6))
+
+    def _reset(self):
+        self._encoder = DeltaEncoder()
+        self._frames = []
+        self._t0 = self._t1 = None
+
+    def append(self, snap):
+        with self._lock:
+            if self._f is None:
+                return
+            self._frames.append(self._encoder.encode(snap))
+            t = snap.get("t") or time.time()
+            self._t0 = t if self._t0 is None else self._t0
+            self._t1 = t
+            if len(self._frames) >= self.chunk_snapshots or self._t1 - self._t0 >= self.chunk_seconds:
+                self._write_chunk()
+
+    def _write_chunk(self):
+        if not self._frames:
+            return
+        payload = zlib.compress(b"".join(self._frames), self.level)
+        self._f.write(CHUNK.pack(len(payload), len(self._frames), self._t0, self._t1) + payload)
+        self._f.flush()
+        self._reset()
+
+    def close(self):
+        with self._lock:
+            if self._f is not None:
+                self._write_chunk()
+                self._f.close()
+                self._f = None
+
+
+class Recording:
+    # read side: a time index of the chunks, and snapshots decoded chunk by chunk
+    def __init__(self, path):
+        self.path = os.path.expanduser(path)
+        self.chunks = []  # (offset, length, snapshots, first t, last t)
+        with open(self.path, "rb") as f:
+            head = f.read(FILE_HEADER.size)
+            if len(head) < FILE_HEADER.size or FILE_HEADER.unpack(head)[0] != MAGIC:
+                raise ValueError(f"{self.path}: not a snapshot recording")
+            size = os.fstat(f.fileno()).st_size
+            offset = FILE_HEADER.size
+            while offset + CHUNK.size <= size:
+                f.seek(offset)
+                length, count, t0, t1 = CHUNK.unpack(f.read(CHUNK.size))
+                if offset + CHUNK.size + length > size:
+                    break  # torn trailing chunk
+                self.chunks.append((offset + CHUNK.size, length, count, t0, t1))
+                offset += CHUNK.size + length
+
+    def __len__(self):
+        return sum(c[2] for c in self.chunks)
+
+    @property
+    def start(self):
+        return self.chunks[0][3] if self.chunks else None
+
+    @property
+    def end(self):
+        return self.chunks[-1][4] if self.chunks else None
+
+    def read_chunk(self, i):
+        offset, length = self.chunks[i][:2]
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            data = zlib.decompress(f.read(length))
+        decoder, snaps, off = DeltaDecoder(), [], 0
+        while off + HEADER.size <= len(data):
+            _magic, _version, kind, n = HEADER.unpack_from(data, off)
+            payload = data[off + HEADER.size:off + HEADER.size + n]
+            off += HEADER.size + n
+            if kind == DEFS:
+                decoder.apply_defs(payload)
+            elif kind == DELTA:
+                decoder.apply_delta(payload)
+                snaps.append(decoder.snapshot())
+        return snaps
+
+    def snapshots(self, since=None):
+        # every snapshot in order, optionally from time `since` on
+        for i, (_, _, _, _, t1) in enumerate(self.chunks):
+            if since is not None and t1 < since:
+                continue
+            for snap in self.read_chunk(i):
+                if since is None or snap.get("t", since) >= since:
+                    yield snap
+
+
+def parse_speed(value):
+    # "1", "10", "2.5" -> float; "max" -> None (no pacing)
+    if value is None or str(value).lower() == "max":
+        return None
+    return float(value)
+
+
+# Feeds a recording to the same subscribers as a live Collector (pages,
+# Alerts, exporter, headless output). Snapshots keep their recorded
+# timestamps and are paced by them, divided by `speed`; speed None publishes
+# as fast as subscribers consume, which makes a fixed recording a
+# deterministic load for the rendering and alerting paths. `since` skips to a
+# recorded time; config "replay.from" (--replay-from) gives it as an offset
+# from the start of the recording, e.g. "15m".
+class ReplaySource(SnapshotSource):
+    def __init__(self, path, speed=1.0, history=None, since=None, loop=False):
+        super().__init__(history)
+        self.recording = Recording(path)
+        self.speed = speed
+        self.since = since
+        self.loop = loop
+        self.published = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_config(cls, config, history=None):
+        replay = config.get("replay", {})
+        if not replay.get("path"):
+            return None
+        self = cls(replay["path"], speed=parse_speed(replay.get("speed", 1)), history=history,
+                   loop=replay.get("loop", False))
+        if replay.get("from") and self.recording.start is not None:
+            self.since = self.recording.start + parse_duration(replay["from"])
+        return self
+
+    def start(self, prime=True):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self.finished.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def _run(self):
+        try:
+            while True:
+                self._play()
+                if not self.loop or self._stop.is_set():
+                    break
+        finally:
+            self.finished.set()
+
+    def _play(self):
+        wall0 = t0 = None
+        for snap in self.recording.snapshots(self.since):
+            if self._stop.is_set():
+                return
+            t = snap.get("t")
+            if self.speed is not None and t is not None:
+                if t0 is None:
+                    wall0, t0 = time.monotonic(), t
+                delay = wall0 + (t - t0) / self.speed - time.monotonic()
+                if delay > 0 and self._stop.wait(delay):
+                    return
+            self._publish(snap)
+            self.published += 1
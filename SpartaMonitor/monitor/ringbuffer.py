@@ -0,0 +1,100 @@
+import os, zlib
+import numpy as np
+
+from monitor.metrics import SERIES, values
+
+# Fixed-size ring of float64 samples laid out as (channels, 2 * capacity).
+# Every sample is written twice, at i and i + capacity, so the newest `capacity`
+# samples are always one contiguous slice: view() hands out an ordered NumPy
+# view with no per-tick allocation. With path= the storage is an np.memmap, so
+# a restarted monitor picks up where it left off and another process can map
+# the same file read-only.
+#
+# File layout: 8 x uint64 header [magic, capacity, channels, count, tag, 0, 0, 0]
+# then the data; tag identifies the channel layout so a stale file is reset.
+
+MAGIC = int.from_bytes(b"SPRB0001", "little")
+HEADER_WORDS = 8  # 64 bytes, keeps the float data aligned
+
+
+class RingBuffer:
+    def __init__(self, capacity, channels=1, path=None, tag=0):
+        self.capacity = capacity
+        self.channels = channels
+        self.path = path
+        n_data = channels * 2 * capacity
+        if path is None:
+            self._meta = np.zeros(HEADER_WORDS, dtype=np.uint64)
+            self._data = np.zeros((channels, 2 * capacity), dtype=np.float64)
+        else:
+            size = (HEADER_WORDS + n_data) * 8
+            fresh = not (os.path.exists(path) and os.path.getsize(path) == size)
+            raw = np.memmap(path, dtype=np.uint64, mode="w+" if fresh else "r+", shape=(HEADER_WORDS + n_data,))
+            self._meta = raw[:HEADER_WORDS]
+            self._data = raw[HEADER_WORDS:].view(np.float64).reshape(channels, 2 * capacity)
+            header = [int(w) for w in self._meta[:5]]
+            if fresh or header[:3] != [MAGIC, capacity, channels] or header[4] != tag:
+                self._data[:] = 0.0
+                self._meta[:] = 0
+            self._raw = raw
+        self._meta[0], self._meta[1], self._meta[2], self._meta[4] = MAGIC, capacity, channels, tag
+
+    @classmethod
+    def open(cls, path):
+        # read-only attach to a ring another process is writing
+        header = np.fromfile(path, dtype=np.uint64, count=HEADER_WORDS)
+        if len(header) < HEADER_WORDS or header[0] != MAGIC:
+            raise ValueError(f"{path} is not a ring buffer file")
+        self = cls.__new__(cls)
+        self.capacity, self.channels, self.path = int(header[1]), int(header[2]), path
+        raw = np.memmap(path, dtype=np.uint64, mode="r")
+        self._meta = raw[:HEADER_WORDS]
+        self._data = raw[HEADER_WORDS:].view(np.float64).reshape(self.channels, 2 * self.capacity)
+        self._raw = raw
+        return self
+
+    @property
+    def count(self):
+        return int(self._meta[3])
+
+    def append(self, sample):
+        count = int(self._meta[3])
+        i = count % self.capacity
+        self._data[:, i] = sample
+        self._data[:, i + self.capacity] = sample
+        # publish after the data so readers never see the new count with old values
+        self._meta[3] = count + 1
+
+    def view(self, n=None):
+        # newest-last (channels, n) view; no copy
+        start = int(self._meta[3]) % self.capacity
+        n = self.capacity if n is None else min(n, self.capacity)
+        return self._data[:, start + self.capacity - n:start + self.capacity]
+
+    def last(self):
+        return self._data[:, (int(self._meta[3]) - 1) % self.capacity]
+
+    def flush(self):
+        if self.path is not None:
+            self._raw.flush()
+
+
+# The recent high-resolution history of monitor/metrics.SERIES, one channel per
+# series. The collector appends every snapshot before notifying subscribers, so
+# pages can chart straight from it.
+class RecentHistory:
+    def __init__(self, capacity=3600, path=None):
+        tag = zlib.crc32("\n".join(SERIES).encode("utf-8"))
+        self.ring = RingBuffer(capacity, len(SERIES), path=os.path.expanduser(path) if path else None, tag=tag)
+        self._index = {name: i for i, name in enumerate(SERIES)}
+
+    @classmethod
+    def from_config(cls, config):
+        ring = config.get("ring_buffer", {})
+        return cls(capacity=ring.get("capacity", 3600), path=ring.get("path"))
+
+    def append(self, snap):
+        self.ring.append(values(snap))
+
+    def series(self, name, n=None):
+        return self.ring.view(n)[self._index[name]]
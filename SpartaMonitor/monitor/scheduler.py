@@ -0,0 +1,213 @@
+import time
+
+# Per-collector sampling intervals on one shared timer wheel.
+#
+# Deadlines are on time.monotonic() and advance by whole intervals from the
+# previous deadline, so a slow tick does not push every later sample back
+# (no drift); a task that falls more than one interval behind resyncs instead
+# of bursting to catch up.
+#
+# Adaptive intervals:
+#   - back-off: when the measured cost of all tasks (seconds of work per second)
+#     exceeds `budget`, the task using the biggest share is slowed by 1.5x
+#     (up to `max_backoff`); once well under budget the most slowed task recovers.
+#   - speed-up: a task runs at `fast_interval` for a while when its value moves
+#     by more than its volatility threshold, or when boost(key) is called (e.g.
+#     an alert rule on that metric is passing but not yet sustained).
+#
+# With an `instrument` registry (selfstats.Stats) every call also records its
+# wall and thread CPU time, how far from its deadline it started (either side:
+# the wheel wakes on its resolution), and whether it missed a deadline.
+# stats() and load() report what the scheduler has made of that: each key's
+# current interval, cost and backoff, and the total sampling load.
+
+# collector keys, in multiples of the base interval (config "refresh_rate")
+DEFAULT_INTERVALS = {
+    "cpu": 1,
+    "memory": 1,
+    "pressure": 1,
+    "network": 1,
+    "interfaces": 1,
+    "disk_io": 1,
+    "gpus": 1,
+    "processes": 2,
+    "system": 10,
+    "disks": 30,
+    "monitor": 2,
+}
+
+
+class TimerWheel:
+    # hashed wheel: `slots` buckets of `resolution` seconds; far deadlines wrap
+    # around and are skipped until their round comes up
+    def __init__(self, resolution=0.05, slots=256):
+        self.resolution = resolution
+        self.slots = [[] for _ in range(slots)]
+        self._tick = None  # last processed tick number
+
+    def _tick_of(self, deadline):
+        return int(deadline / self.resolution)
+
+    def schedule(self, item, deadline):
+        tick = self._tick_of(deadline)
+        if self._tick is not None and tick <= self._tick:
+            tick = self._tick + 1  # already past: next tick
+        self.slots[tick % len(self.slots)].append((tick, item))
+
+    def advance(self, now):
+        # items due at or before `now`, in deadline order
+        target = self._tick_of(now)
+        if self._tick is None:
+            self._tick = target - 1
+        if target - self._tick > len(self.slots):
+            self._tick = target - len(self.slots)  # one full turn visits every slot
+        due = []
+        for tick in range(self._tick + 1, target + 1):
+            slot = self.slots[tick % len(self.slots)]
+            if not slot:
+                continue
+            keep = []
+            for entry in slot:
+                (due if entry[0] <= target else keep).append(entry)
+            slot[:] = keep
+        self._tick = target
+        due.sort(key=lambda e: e[0])
+        return [item for _, item in due]
+
+    def next_deadline(self, now, horizon=1.0):
+        # earliest scheduled deadline within `horizon`, else now + horizon
+        start = self._tick_of(now)
+        for tick in range(start, start + int(horizon / self.resolution) + 1):
+            if any(t == tick for t, _ in self.slots[tick % len(self.slots)]):
+                return tick * self.resolution
+        return now + horizon
+
+
+class _Task:
+    __slots__ = ("key", "fn", "base", "backoff", "boost_until", "deadline", "cost", "probe", "threshold", "last_probe")
+
+    def __init__(self, key, fn, base, probe=None, threshold=None):
+        self.key, self.fn, self.base = key, fn, base
+        self.backoff = 1.0
+        self.boost_until = 0.0
+        self.deadline = 0.0
+        self.cost = 0.0          # EWMA seconds per run
+        self.probe = probe       # value -> float, for volatility
+        self.threshold = threshold
+        self.last_probe = None
+
+
+class Scheduler:
+    def __init__(self, tasks, intervals=None, budget=0.05, fast_interval=0.5, boost_seconds=10.0,
+                 max_backoff=8.0, resolution=0.05, instrument=None):
+        self.intervals = dict(intervals or {})  # key -> seconds
+        self.budget = budget
+        self.fast_interval = fast_interval
+        self.boost_seconds = boost_seconds
+        self.max_backoff = max_backoff
+        self.wheel = TimerWheel(resolution)
+        self.instrument = instrument
+        self.tasks = {}
+        for key, fn in tasks.items():
+            self.tasks[key] = _Task(key, fn, float(self.intervals.get(key, 1.0)))
+
+    def volatility(self, key, probe, threshold):
+        # speed `key` up while probe(value) jumps by more than `threshold` between runs
+        task = self.tasks[key]
+        task.probe, task.threshold = probe, threshold
+
+    def interval(self, task, now):
+        if now < task.boost_until:
+            return min(task.base, self.fast_interval)
+        return task.base * task.backoff
+
+    def boost(self, key, now=None):
+        task = self.tasks.get(key)
+        if task is not None:
+            now = time.monotonic() if now is None else now
+            task.boost_until = now + self.boost_seconds
+            # pull a far deadline in so the boost takes effect now
+            if task.deadline > now + self.fast_interval:
+                task.deadline = now + self.fast_interval
+                self.wheel.schedule((task, task.deadline), task.deadline)
+
+    def start(self, now=None):
+        now = time.monotonic() if now is None else now
+        for task in self.tasks.values():
+            task.deadline = now + self.interval(task, now)
+            self.wheel.schedule((task, task.deadline), task.deadline)
+
+    def next_wakeup(self, now=None):
+        now = time.monotonic() if now is None else now
+        return self.wheel.next_deadline(now, horizon=self.fast_interval)
+
+    def run_due(self, now=None):
+        # runs every due task; returns {key: value} for the ones that ran
+        now = time.monotonic() if now is None else now
+        results = {}
+        for task, deadline in self.wheel.advance(now):
+            if deadline != task.deadline:
+                continue  # superseded by boost()
+            if self.instrument is not None:
+                self.instrument.observe("jitter", task.key, abs(now - deadline))
+            value = self.run(task)
+            if value is not None:
+                results[task.key] = value
+                self._check_volatility(task, value, now)
+            step = self.interval(task, now)
+            task.deadline += step
+            if task.deadline <= now:
+                task.deadline = now + step  # fell a whole interval behind: resync
+                if self.instrument is not None:
+                    self.instrument.incr("missed", task.key)
+            self.wheel.schedule((task, task.deadline), task.deadline)
+        if results:
+            self._adapt(now)
+        return results
+
+    def run(self, task):
+        # one timed call of the task; None if it raised
+        start, cpu = time.perf_counter(), time.thread_time()
+        try:
+            value = task.fn()
+        except Exception:
+            value = None
+        cost = time.perf_counter() - start
+        task.cost = cost if task.cost == 0.0 else 0.8 * task.cost + 0.2 * cost
+        if self.instrument is not None:
+            self.instrument.observe("wall", task.key, cost)
+            self.instrument.observe("cpu", task.key, time.thread_time() - cpu)
+        return value
+
+    def _check_volatility(self, task, value, now):
+        if task.probe is None:
+            return
+        try:
+            x = float(task.probe(value))
+        except (TypeError, ValueError, KeyError):
+            return
+        if task.last_probe is not None and abs(x - task.last_probe) >= task.threshold:
+            task.boost_until = now + self.boost_seconds
+        task.last_probe = x
+
+    def load(self, now=None):
+        # seconds of sampling work per second of wall time
+        now = time.monotonic() if now is None else now
+        return sum(t.cost / self.interval(t, now) for t in self.tasks.values())
+
+    def _adapt(self, now):
+        shares = {t.key: t.cost / self.interval(t, now) for t in self.tasks.values()}
+        load = sum(shares.values())
+        if load > self.budget:
+            worst = self.tasks[max(shares, key=shares.get)]
+            worst.backoff = min(self.max_backoff, worst.backoff * 1.5)
+        elif load < self.budget / 2:
+            slowed = max(self.tasks.values(), key=lambda t: t.backoff)
+            if slowed.backoff > 1.0:
+                slowed.backoff = max(1.0, slowed.backoff / 1.5)
+
+    def stats(self, now=None):
+        # per key: current interval (s), smoothed cost of one call (ms) and backoff factor
+        now = time.monotonic() if now is None else now
+        return {t.key: {"interval": self.interval(t, now), "cost_ms": t.cost * 1000, "backoff": t.backoff}
+                for t in self.tasks.values()}
@@ -0,0 +1,135 @@
+import os, time, bisect, threading
+import psutil
+
+# What the monitor itself costs, always on. Recording is one bisect over fixed
+# log-spaced buckets plus a few adds per observation, with no locks: every
+# histogram has one writer (a collector key is only sampled on the collector
+# thread, a page only draws on the Tk thread) and readers tolerate a count
+# that is one observation behind. Quantiles are interpolated from the buckets.
+#
+# Groups recorded (name -> histogram of seconds, or a counter):
+#   wall, cpu   per collector key: wall and thread CPU time of each call
+#   jitter      per collector key: how far from its deadline a call started
+#   missed      per collector key: times it fell a whole interval behind (counter)
+#   subscriber  per snapshot subscriber, e.g. "CPUPage.on_snapshot", "Alerts.check"
+#   subscriber_errors  per snapshot subscriber: calls that raised (counter)
+#   draw        per owner of UI work run on the Tk main loop, e.g. "CPUPage"
+#   ui          "queue" (first queued write -> applied), "frame" (one drain)
+
+# bucket upper bounds in seconds: 1-2-5 steps from 1 us to 10 s, then overflow
+BOUNDS = tuple(m * 10.0 ** e for e in range(-6, 1) for m in (1, 2, 5)) + (10.0,)
+QUANTILES = (0.5, 0.99)
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BOUNDS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, v):
+        self.counts[bisect.bisect_left(BOUNDS, v)] += 1
+        self.count += 1
+        self.sum += v
+        if v > self.max:
+            self.max = v
+
+    def quantile(self, q):
+        if not self.count:
+            return None
+        rank, seen = q * self.count, 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lo = BOUNDS[i - 1] if i else 0.0
+                hi = BOUNDS[i] if i < len(BOUNDS) else self.max
+                return min(self.max, lo + (hi - lo) * (rank - seen) / n)
+            seen += n
+        return self.max
+
+    def ms(self, q):
+        v = self.quantile(q)
+        return None if v is None else round(v * 1000, 3)
+
+    def summary(self):
+        # -> {"count", "total_ms", "p50_ms", "p99_ms", "max_ms"}
+        out = {"count": self.count, "total_ms": round(self.sum * 1000, 3)}
+        for q in QUANTILES:
+            out[f"p{round(q * 100)}_ms"] = self.ms(q)
+        out["max_ms"] = round(self.max * 1000, 3)
+        return out
+
+
+def name_of(fn):
+    # "Class.method" for bound methods, else the function name
+    owner = getattr(fn, "__self__", None)
+    if owner is None:
+        return getattr(fn, "__name__", type(fn).__name__)
+    return f"{type(owner).__name__}.{fn.__name__}"
+
+
+class Stats:
+    def __init__(self):
+        self.groups = {}    # group -> {name: Histogram}
+        self.counters = {}  # group -> {name: int}
+        self._lock = threading.Lock()  # only taken to create a histogram
+        self._proc = None
+        self._cpu = None    # (cpu seconds, monotonic) at the previous process() call
+
+    def histogram(self, group, name):
+        hists = self.groups.get(group)
+        h = hists.get(name) if hists is not None else None
+        if h is None:
+            with self._lock:
+                h = self.groups.setdefault(group, {}).setdefault(name, Histogram())
+        return h
+
+    def observe(self, group, name, seconds):
+        self.histogram(group, name).observe(seconds)
+
+    def incr(self, group, name, n=1):
+        counts = self.counters.setdefault(group, {})
+        counts[name] = counts.get(name, 0) + n
+
+    def process(self):
+        # this process: RSS, threads and CPU % (all cores) since the previous call
+        if self._proc is None:
+            self._proc = psutil.Process(os.getpid())
+        p = self._proc
+        with p.oneshot():
+            rss, threads, times = p.memory_info().rss, p.num_threads(), p.cpu_times()
+        cpu, now = times.user + times.system, time.monotonic()
+        pct = None
+        if self._cpu is not None and now > self._cpu[1]:
+            pct = round((cpu - self._cpu[0]) / (now - self._cpu[1]) * 100, 2)
+        self._cpu = (cpu, now)
+        return {"rss": rss, "threads": threads, "cpu_percent": pct}
+
+    def report(self):
+        # the snapshot's "monitor" section
+        groups = {g: dict(hists) for g, hists in list(self.groups.items())}
+        missed = dict(self.counters.get("missed", {}))
+        errors = dict(self.counters.get("subscriber_errors", {}))
+        collectors = {}
+        cpu, jitter = groups.get("cpu", {}), groups.get("jitter", {})
+        for key, h in groups.get("wall", {}).items():
+            c = collectors[key] = h.summary()
+            if key in cpu:
+                c["cpu_total_ms"] = round(cpu[key].sum * 1000, 3)
+                c["cpu_p50_ms"], c["cpu_p99_ms"] = cpu[key].ms(0.5), cpu[key].ms(0.99)
+            if key in jitter:
+                c["jitter_p99_ms"] = jitter[key].ms(0.99)
+            c["missed"] = missed.get(key, 0)
+        return {
+            "process": self.process(),
+            "collectors": collectors,
+            "subscribers": {k: dict(h.summary(), errors=errors.get(k, 0))
+                            for k, h in groups.get("subscriber", {}).items()},
+            "draw": {k: h.summary() for k, h in groups.get("draw", {}).items()},
+            "ui": {k: h.summary() for k, h in groups.get("ui", {}).items()},
+        }
+
+
+STATS = Stats()  # the process-wide registry
@@ -0,0 +1,124 @@
+from collections.abc import Mapping
+
+import numpy as np
+
+# Typed parts of a collector snapshot. The snapshot itself stays a dict of
+# sections, but the per-item data that used to be rebuilt as fresh dicts on
+# every tick now comes as:
+#   Record - one __slots__ object per disk, GPU or process row
+#   Table  - per-disk / per-NIC rates as one (devices, fields) float64 array
+#            straight from CounterRates (struct of arrays), no per-device objects
+# Both are read-only Mappings, so existing callers keep using d["percent"],
+# d.get(...), .items() and dict(...). Snapshots that were decoded from a
+# recording or a fleet agent still have plain dicts in these places; column()
+# and named() accept either. On the wire and on disk (fleet agents,
+# recordings, headless JSON) they are flattened back to those plain forms.
+
+
+class Record(Mapping):
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{k}={getattr(self, k)!r}' for k in self.__slots__)})"
+
+
+class Disk(Record):
+    __slots__ = ("device", "mount", "fstype", "stale", "total", "used", "free", "percent")
+
+    def __init__(self, device, mount, fstype, stale, total, used, free, percent):
+        self.device, self.mount, self.fstype, self.stale = device, mount, fstype, stale
+        self.total, self.used, self.free, self.percent = total, used, free, percent
+
+
+class GPU(Record):
+    __slots__ = ("id", "name", "load_percent", "mem_total_mb", "mem_used_mb", "temp_c")
+
+    def __init__(self, id, name, load_percent, mem_total_mb, mem_used_mb, temp_c):
+        self.id, self.name, self.load_percent = id, name, load_percent
+        self.mem_total_mb, self.mem_used_mb, self.temp_c = mem_total_mb, mem_used_mb, temp_c
+
+
+class Proc(Record):
+    __slots__ = ("pid", "name", "cpu_percent", "rss", "io_rate", "threads")
+
+    def __init__(self, pid, name, cpu_percent, rss, io_rate, threads):
+        self.pid, self.name, self.cpu_percent = pid, name, cpu_percent
+        self.rss, self.io_rate, self.threads = rss, io_rate, threads
+
+
+class Table(Mapping):
+    # {device: {field: value}} over one array; NaN reads as None, like the old dicts
+    __slots__ = ("names", "fields", "data", "_index")
+
+    def __init__(self, names, fields, data):
+        self.names, self.fields, self.data = list(names), tuple(fields), data
+        self._index = None
+
+    def __getitem__(self, name):
+        if self._index is None:
+            self._index = {n: i for i, n in enumerate(self.names)}
+        return Row(self, self._index[name])
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __repr__(self):
+        return f"Table({self.fields}, {len(self.names)} rows)"
+
+    def column(self, field):
+        return self.data[:, self.fields.index(field)]
+
+
+class Row(Mapping):
+    __slots__ = ("table", "i")
+
+    def __init__(self, table, i):
+        self.table, self.i = table, i
+
+    def __getitem__(self, field):
+        try:
+            v = float(self.table.data[self.i, self.table.fields.index(field)])
+        except ValueError:
+            raise KeyError(field) from None
+        return None if v != v else v
+
+    def __iter__(self):
+        return iter(self.table.fields)
+
+    def __len__(self):
+        return len(self.table.fields)
+
+
+def column(per, field):
+    # per-device values of `field` as float64, from a Table or a {device: {field: v}} dict
+    if isinstance(per, Table):
+        return per.column(field)
+    return np.array([r.get(field) for r in per.values()], dtype=np.float64)
+
+
+def named(per, field):
+    # -> {device: value}
+    return dict(zip(per, column(per, field).tolist()))
+
+
+def plain(obj):
+    # json.dumps(snap, default=plain): Records, Tables and Rows as dicts
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
@@ -0,0 +1,213 @@
+import os, time, math, struct, zlib, threading
+from array import array
+
+from monitor.metrics import SERIES, values
+from utils.config import parse_duration
+
+# On-disk metrics history fed by the collector.
+#
+# Each tier is a directory of append-only segment files. A segment starts with a
+# small header (magic, version, kind, series names) followed by packed float64
+# records: raw tiers store [t, v0..vn], rollup tiers store
+# [t, min0..minn, max0..maxn, avg0..avgn]. Segments are aligned to a fixed span
+# per tier and whole segments are deleted once they fall out of retention, so
+# the store never grows past the configured window.
+
+MAGIC = b"SPMS"
+VERSION = 1
+KIND_RAW, KIND_ROLLUP = 1, 2
+RECORDS_PER_SEGMENT = 1024
+
+DEFAULT_DIR = "~/.sparta_monitor/history"
+DEFAULT_RETENTION = {"1s": "1h", "10s": "24h", "1m": "7d", "1h": "90d"}
+
+
+def _header(kind, names):
+    blob = "\n".join(names).encode("utf-8")
+    return MAGIC + struct.pack("<BBHI", VERSION, kind, len(names), len(blob)) + blob
+
+
+def _read_segment(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:4] != MAGIC:
+        return None
+    _version, kind, n, blob_len = struct.unpack_from("<BBHI", data, 4)
+    offset = 4 + struct.calcsize("<BBHI")
+    names = data[offset:offset + blob_len].decode("utf-8").split("\n") if n else []
+    body = data[offset + blob_len:]
+    width = 1 + n * (1 if kind == KIND_RAW else 3)
+    body = body[:len(body) - len(body) % (8 * width)]  # drop a torn trailing record
+    records = array("d")
+    records.frombytes(body)
+    return kind, names, width, records
+
+
+class _Tier:
+    def __init__(self, root, name, resolution, retention, raw):
+        self.name = name
+        self.resolution = resolution
+        self.retention = retention
+        self.raw = raw
+        self.dir = os.path.join(root, name)
+        self.span = resolution * RECORDS_PER_SEGMENT
+        self._file = None
+        self._seg_start = None
+        self._bucket = None
+        os.makedirs(self.dir, exist_ok=True)
+
+    def add(self, t, vals, schema):
+        if self.raw:
+            self._write(t, [t] + vals, schema)
+            return
+
+        bucket = math.floor(t / self.resolution) * self.resolution
+        if bucket != self._bucket:
+            self.flush_bucket(schema)
+            n = len(vals)
+            self._bucket = bucket
+            self._min = array("d", [math.inf] * n)
+            self._max = array("d", [-math.inf] * n)
+            self._sum = array("d", [0.0] * n)
+            self._cnt = array("l", [0] * n)
+        for i, v in enumerate(vals):
+            if v != v:  # NaN: series missing this tick
+                continue
+            if v < self._min[i]:
+                self._min[i] = v
+            if v > self._max[i]:
+                self._max[i] = v
+            self._sum[i] += v
+            self._cnt[i] += 1
+
+    def flush_bucket(self, schema):
+        if self._bucket is None:
+            return
+        nan = float("nan")
+        mins = [m if c else nan for m, c in zip(self._min, self._cnt)]
+        maxs = [m if c else nan for m, c in zip(self._max, self._cnt)]
+        avgs = [s / c if c else nan for s, c in zip(self._sum, self._cnt)]
+        self._write(self._bucket, [self._bucket] + mins + maxs + avgs, schema)
+        self._bucket = None
+
+    def _write(self, t, record, schema):
+        seg_start = math.floor(t / self.span) * self.span
+        if seg_start != self._seg_start:
+            self.close()
+            self._seg_start = seg_start
+            path = os.path.join(self.dir, f"{int(seg_start):012d}-{zlib.crc32(schema[1]):08x}.seg")
+            self._file = open(path, "ab")
+            if self._file.tell() == 0:
+                self._file.write(_header(KIND_RAW if self.raw else KIND_ROLLUP, schema[0]))
+            self.prune(t)
+        array("d", record).tofile(self._file)
+        self._file.flush()
+
+    def prune(self, now):
+        cutoff = now - self.retention
+        for name in os.listdir(self.dir):
+            start = self._segment_start(name)
+            if start is not None and start + self.span < cutoff:
+                try:
+                    os.remove(os.path.join(self.dir, name))
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _segment_start(name):
+        if not name.endswith(".seg"):
+            return None
+        try:
+            return float(name.split("-", 1)[0])
+        except ValueError:
+            return None
+
+    def read(self, series, start, end):
+        rows = []
+        for name in sorted(os.listdir(self.dir)):
+            seg = self._segment_start(name)
+            if seg is None or seg > end or seg + self.span < start:
+                continue
+            parsed = _read_segment(os.path.join(self.dir, name))
+            if parsed is None:
+                continue
+            kind, names, width, records = parsed
+            if series not in names:
+                continue
+            col, n = names.index(series), len(names)
+            for i in range(0, len(records), width):
+                t = records[i]
+                if t < start or t > end:
+                    continue
+                if kind == KIND_RAW:
+                    v = records[i + 1 + col]
+                    rows.append((t, v, v, v))
+                else:
+                    rows.append((t, records[i + 1 + col], records[i + 1 + n + col],
+                                 records[i + 1 + 2 * n + col]))
+        rows.sort(key=lambda r: r[0])
+        return rows
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._seg_start = None
+
+
+class MetricStore:
+    def __init__(self, path=DEFAULT_DIR, retention=None):
+        self.path = os.path.expanduser(path)
+        retention = retention or DEFAULT_RETENTION
+        tiers = sorted((parse_duration(name), name, parse_duration(keep))
+                       for name, keep in retention.items())
+        self.tiers = [
+            _Tier(self.path, name, res, keep, raw=(i == 0))
+            for i, (res, name, keep) in enumerate(tiers)
+        ]
+        self.series = SERIES
+        self._schema = (list(SERIES), "\n".join(SERIES).encode("utf-8"))
+        self._lock = threading.Lock()
+        self._last = None  # t of the last snapshot taken
+
+    @classmethod
+    def from_config(cls, config):
+        hist = config.get("history", {})
+        if not hist.get("enabled", True):
+            return None
+        return cls(path=hist.get("dir", DEFAULT_DIR), retention=hist.get("retention"))
+
+    def append(self, snap):
+        # collector subscriber: one raw record per tick, rollups as buckets close.
+        # At most one snapshot per raw step is taken, even while a boosted key
+        # publishes faster (3/4 of a step, so a tick that wakes early counts)
+        t = snap.get("t") or time.time()
+        if self._last is not None and t - self._last < 0.75 * self.tiers[0].resolution:
+            return
+        self._last = t
+        vals = values(snap)
+        with self._lock:
+            for tier in self.tiers:
+                tier.add(t, vals, self._schema)
+
+    def pick_tier(self, start, end, max_points=600):
+        # coarsest tier that still gives at least max_points over the range and
+        # whose retention reaches back to start; otherwise the nearest that does
+        now = time.time()
+        step = max(0.0, (end - start) / max(1, max_points))
+        covering = [t for t in self.tiers if now - t.retention <= start] or self.tiers[-1:]
+        fitting = [t for t in covering if t.resolution <= step]
+        return fitting[-1] if fitting else covering[0]
+
+    def query(self, series, start, end=None, max_points=600):
+        # returns (tier name, [(t, min, max, avg), ...])
+        end = end if end is not None else time.time()
+        with self._lock:
+            tier = self.pick_tier(start, end, max_points)
+            return tier.name, tier.read(series, start, end)
+
+    def close(self):
+        with self._lock:
+            for tier in self.tiers:
+                tier.flush_bucket(self._schema)
+                tier.close()
@@ -2,6 +2,13 @@ import time
 import platform
 import psutil
 
+# fixed for the life of the process
+_PLATFORM = {
+    "system": platform.system(),
+    "release": platform.release(),
+    "machine": platform.machine(),
+}
+
 def get_overview():
     boot = psutil.boot_time()
     uptime = max(0, int(time.time() - boot))
@@ -15,10 +22,7 @@ def get_overview():
 
     return {
         "uptime_seconds": uptime,
+        "boot_time": boot,
         "battery": batt,
-        "platform": {
-            "system": platform.system(),
-            "release": platform.release(),
-            "machine": platform.machine(),
-        }
+        "platform": dict(_PLATFORM),
     }
@@ -0,0 +1,293 @@
+import numpy as np
+
+from monitor.ringbuffer import RingBuffer
+from monitor.snapshot import named
+
+# Alert rules evaluated as array operations over short per-metric ring buffers.
+#
+# Rules are grouped by metric. Each metric keeps a (entities, depth) ring
+# (entities = each core, disk, GPU, or a single "" for scalars), and all rules
+# on a metric are checked together as a (rules, entities, samples) comparison:
+#
+#   sustained = the last `ticks` samples all pass `op fire`
+#   firing    = was firing ? latest has not crossed `clear` : sustained
+#
+# "rate" rules run the same test on (x[i] - x[i-window]) / dt, per second.
+# State is kept per (rule, entity), so a disk at 96% and then 97% is one alert.
+# A sample is one reading of the metric's source key: snapshots that carry the
+# key over unchanged (see "sampled" in collector.py) do not advance its ring,
+# so `ticks` and rate windows count real readings at their real times.
+#
+# A rule in config.json "rules":
+#   {"name": "cpu_high", "metric": "cpu.percent", "op": ">=", "fire": 90, "clear": 80,
+#    "ticks": 1, "kind": "value" | "rate", "window": 1, "level": "warning",
+#    "message": "High CPU usage: {value:.0f}%"}
+# Message fields: {value}, {entity}, {rule}, {top} (top CPU process, if any).
+
+
+def _one(value):
+    return {"": value}
+
+
+def _per(items, key, field):
+    return {str(x[key]): x.get(field) for x in items}
+
+
+def _disk(s, field):
+    return named((s.get("disk_io") or {}).get("per_disk") or {}, field)
+
+
+def _nic(s, field):
+    return named((s.get("network") or {}).get("per_nic") or {}, field)
+
+
+def _gpu_mem(g):
+    return g["mem_used_mb"] / g["mem_total_mb"] * 100 if g.get("mem_total_mb") else None
+
+
+# snapshot key each metric is read from (collector backends, see scheduler.py)
+SOURCES = {
+    "cpu": "cpu",
+    "mem": "memory", "swap": "memory",
+    "disk.percent": "disks",
+    "disk.read_Bps": "disk_io", "disk.write_Bps": "disk_io", "disk.await_ms": "disk_io",
+    "disk.util_percent": "disk_io", "disk.queue_depth": "disk_io",
+    "net": "network",
+    "gpu": "gpus",
+    "procs": "processes",
+    "psi": "pressure",
+    "monitor": "monitor",
+}
+
+
+def source_of(metric):
+    return SOURCES.get(metric) or SOURCES.get(metric.split(".", 1)[0])
+
+
+# metric name -> snapshot -> {entity: value}
+METRICS = {
+    "cpu.percent": lambda s: _one((s.get("cpu") or {}).get("percent")),
+    "cpu.temp_c": lambda s: _one((s.get("cpu") or {}).get("temp_c")),
+    "cpu.core_percent": lambda s: {str(i): v for i, v in enumerate((s.get("cpu") or {}).get("per_core") or [])},
+    "cpu.iowait_percent": lambda s: _one(((s.get("cpu") or {}).get("times") or {}).get("iowait")),
+    "cpu.steal_percent": lambda s: _one(((s.get("cpu") or {}).get("times") or {}).get("steal")),
+    "cpu.core_steal_percent": lambda s: named((s.get("cpu") or {}).get("per_core_times") or {}, "steal"),
+    "cpu.ctx_switches_ps": lambda s: _one((s.get("cpu") or {}).get("ctx_switches_ps")),
+    "cpu.procs_running": lambda s: _one((s.get("cpu") or {}).get("procs_running")),
+    "mem.percent": lambda s: _one((s.get("memory") or {}).get("percent")),
+    "swap.percent": lambda s: _one(((s.get("memory") or {}).get("swap") or {}).get("percent")),
+    "mem.dirty_bytes": lambda s: _one(((s.get("memory") or {}).get("detail") or {}).get("dirty")),
+    "mem.major_faults_ps": lambda s: _one(((s.get("memory") or {}).get("vm") or {}).get("major_faults_ps")),
+    "mem.oom_kills": lambda s: _one(((s.get("memory") or {}).get("vm") or {}).get("oom_kills")),
+    "swap.in_ps": lambda s: _one(((s.get("memory") or {}).get("vm") or {}).get("swap_in_ps")),
+    "swap.out_ps": lambda s: _one(((s.get("memory") or {}).get("vm") or {}).get("swap_out_ps")),
+    # PSI avg10 per resource (cpu, memory, io)
+    "psi.some": lambda s: {r: (v.get("some") or {}).get("avg10") for r, v in (s.get("pressure") or {}).items()},
+    "psi.full": lambda s: {r: (v.get("full") or {}).get("avg10") for r, v in (s.get("pressure") or {}).items()},
+    "disk.percent": lambda s: _per(s.get("disks") or [], "mount", "percent"),
+    "disk.read_Bps": lambda s: _one((s.get("disk_io") or {}).get("read_rate_Bps")),
+    "disk.write_Bps": lambda s: _one((s.get("disk_io") or {}).get("write_rate_Bps")),
+    "disk.await_ms": lambda s: _disk(s, "await_ms"),
+    "disk.util_percent": lambda s: _disk(s, "util_percent"),
+    "disk.queue_depth": lambda s: _disk(s, "queue_depth"),
+    "net.tx_bps": lambda s: _one((s.get("network") or {}).get("tx_rate_bps")),
+    "net.rx_bps": lambda s: _one((s.get("network") or {}).get("rx_rate_bps")),
+    "net.nic_errors_ps": lambda s: _nic(s, "errors_ps"),
+    "net.nic_drops_ps": lambda s: _nic(s, "drops_ps"),
+    "gpu.load_percent": lambda s: _per(s.get("gpus") or [], "id", "load_percent"),
+    "gpu.mem_percent": lambda s: {str(g["id"]): _gpu_mem(g) for g in s.get("gpus") or []},
+    "gpu.temp_c": lambda s: _per(s.get("gpus") or [], "id", "temp_c"),
+    "procs.count": lambda s: _one((s.get("processes") or {}).get("count")),
+    # the monitor's own cost
+    "monitor.cpu_percent": lambda s: _one(((s.get("monitor") or {}).get("process") or {}).get("cpu_percent")),
+    "monitor.rss_bytes": lambda s: _one(((s.get("monitor") or {}).get("process") or {}).get("rss")),
+    "monitor.missed_deadlines": lambda s: {k: c.get("missed") for k, c in
+                                           ((s.get("monitor") or {}).get("collectors") or {}).items()},
+}
+
+
+class Rule:
+    __slots__ = ("name", "metric", "kind", "op", "fire", "clear", "ticks", "window", "level", "message")
+
+    def __init__(self, name, metric, fire, clear=None, op=">=", ticks=1, kind="value", window=1,
+                 level="warning", message=None):
+        if metric not in METRICS:
+            raise ValueError(f"rule {name!r}: unknown metric {metric!r}")
+        if op not in (">=", "<="):
+            raise ValueError(f"rule {name!r}: op must be '>=' or '<='")
+        self.name, self.metric, self.kind, self.op = name, metric, kind, op
+        self.fire = float(fire)
+        self.clear = float(fire if clear is None else clear)
+        self.ticks = max(1, int(ticks))
+        self.window = max(1, int(window)) if kind == "rate" else 0
+        self.level = level
+        self.message = message or "{rule}: {value:.1f}"
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(**d)
+
+
+def default_rules(config):
+    # the old hardcoded Alerts thresholds plus the heavy-CPU/temperature keys of config.json
+    temp = config.get("temp_threshold", 85)
+    return [
+        Rule("cpu_high", "cpu.percent", 90, clear=80, message="High CPU usage: {value:.0f}%{top}"),
+        Rule("cpu_heavy", "cpu.percent", config.get("heavy_cpu_threshold", 85), clear=70,
+             ticks=config.get("heavy_cpu_ticks", 8), message="Sustained CPU load: {value:.0f}%{top}"),
+        Rule("mem_high", "mem.percent", 90, clear=85, message="High memory usage: {value:.0f}%"),
+        Rule("disk_full", "disk.percent", 95, clear=92, message="Low disk space on {entity}: {value:.0f}% used"),
+        Rule("gpu_high", "gpu.load_percent", 95, clear=85, message="High GPU {entity} load: {value:.0f}%"),
+        Rule("cpu_temp", "cpu.temp_c", temp, clear=temp - 5, message="CPU temperature: {value:.0f}°C"),
+        Rule("gpu_temp", "gpu.temp_c", temp, clear=temp - 5, message="GPU {entity} temperature: {value:.0f}°C"),
+    ]
+
+
+def load_rules(config):
+    # config "rules" entries replace defaults of the same name and add the rest
+    rules = {r.name: r for r in default_rules(config)}
+    for d in config.get("rules") or []:
+        if d.get("enabled", True):
+            rules[d["name"]] = Rule.from_dict({k: v for k, v in d.items() if k != "enabled"})
+        else:
+            rules.pop(d["name"], None)
+    return list(rules.values())
+
+
+class _MetricTable:
+    # one metric's recent samples for every entity, plus state per (rule, entity)
+    def __init__(self, metric, rules):
+        self.metric = metric
+        self.source = source_of(metric)
+        self.rules = rules
+        self.depth = max(r.ticks + r.window for r in rules) + 1
+        self.sign = np.array([1.0 if r.op == ">=" else -1.0 for r in rules])
+        self.fire = self.sign * [r.fire for r in rules]
+        self.clear = self.sign * [r.clear for r in rules]
+        self.ticks = np.array([r.ticks for r in rules])
+        # rules sharing a (window, op) share one signed series and its trailing minima
+        keys = sorted({(r.window, r.op) for r in rules})
+        self.groups = [(w, op, np.array([i for i, r in enumerate(rules) if (r.window, r.op) == (w, op)]))
+                       for w, op in keys]
+        self.entities = []
+        self.ring = None
+        self.times = RingBuffer(self.depth)
+        self.taken = None  # sample time of the newest reading
+        self.state = np.zeros((len(rules), 0), dtype=bool)
+        self.notified = np.zeros((len(rules), 0))
+        self.pending = False  # some rule passes now but has not fired yet
+
+    def _remap(self, entities):
+        # keep history and state of entities that are still present
+        old = {e: i for i, e in enumerate(self.entities)}
+        keep = [(j, old[e]) for j, e in enumerate(entities) if e in old]
+        ring = RingBuffer(self.depth, channels=len(entities))
+        state = np.zeros((len(self.rules), len(entities)), dtype=bool)
+        notified = np.zeros(state.shape)
+        if self.ring is not None and keep:
+            new_idx, old_idx = map(list, zip(*keep))
+            hist = self.ring.view(self.ring.count)
+            for col in range(hist.shape[1]):
+                sample = np.full(len(entities), np.nan)
+                sample[new_idx] = hist[old_idx, col]
+                ring.append(sample)
+            state[:, new_idx] = self.state[:, old_idx]
+            notified[:, new_idx] = self.notified[:, old_idx]
+        self.entities, self.ring, self.state, self.notified = list(entities), ring, state, notified
+
+    def update(self, t, values):
+        if self.ring is None or list(values) != self.entities:
+            self._remap(values)
+        self.ring.append([np.nan if v is None else v for v in values.values()])
+        self.times.append(t)
+        self.taken = t
+
+    def evaluate(self):
+        # -> (was firing, now firing, latest tested value), each (rules, entities)
+        n = min(self.ring.count, self.depth)
+        if n == 0 or not self.entities:
+            return None
+        x = self.ring.view(n)
+        t = self.times.view(n)[0]
+        was = self.state
+        now = np.zeros_like(was)
+        latest = np.full(was.shape, np.nan)
+        pending = False
+        for w, op, idx in self.groups:
+            if w:
+                if n <= w:
+                    continue
+                dt = t[w:] - t[:-w]
+                series = (x[:, w:] - x[:, :-w]) / np.where(dt > 0, dt, np.nan)
+            else:
+                series = x
+            signed = series if op == ">=" else -series
+            # tail[:, k-1] = worst of the last k samples; NaN breaks a streak
+            tail = np.minimum.accumulate(signed[:, ::-1], axis=1)
+            ticks = self.ticks[idx]
+            enough = ticks <= tail.shape[1]
+            worst = tail[:, np.minimum(ticks, tail.shape[1]) - 1].T               # (R, E)
+            sustained = enough[:, None] & (worst >= self.fire[idx, None])
+            cleared = signed[:, -1][None] < self.clear[idx, None]
+            now[idx] = np.where(was[idx], ~cleared, sustained)
+            latest[idx] = series[:, -1][None]
+            passing = signed[:, -1][None] >= self.fire[idx, None]
+            pending = pending or bool((passing & ~now[idx]).any())
+        self.state = now
+        self.pending = pending
+        return was, now, latest
+
+
+class RuleEngine:
+    # evaluate(snap, source) -> list of (rule, entity, value, event), event one of
+    # "fire" (started), "repeat" (still firing, `repeat` seconds since the last
+    # notice) or "clear" (resolved). Unchanged cells produce nothing, so the
+    # Python-side cost follows the number of alerts, not the number of rules.
+    # Each source (host) has its own tables, so one engine can watch a fleet
+    # (Alerts.watch); forget(source) drops a host that went away.
+    def __init__(self, rules, repeat=None):
+        self.rules = list(rules)
+        self.repeat = repeat
+        self._groups = {}
+        for r in self.rules:
+            self._groups.setdefault(r.metric, []).append(r)
+        self._tables = {}
+
+    @classmethod
+    def from_config(cls, config, repeat=None):
+        return cls(load_rules(config), repeat=repeat)
+
+    def _tables_for(self, source):
+        tables = self._tables.get(source)
+        if tables is None:
+            tables = self._tables[source] = [_MetricTable(m, rules) for m, rules in self._groups.items()]
+        return tables
+
+    def forget(self, source):
+        self._tables.pop(source, None)
+
+    def pending(self, source=None):
+        # metrics with a rule that passes now but is not yet sustained
+        return [table.metric for table in self._tables.get(source, ()) if table.pending]
+
+    def evaluate(self, snap, source=None):
+        t = snap.get("t") or 0.0
+        sampled = snap.get("sampled") or {}
+        events = []
+        for table in self._tables_for(source):
+            taken = sampled.get(table.source, t)
+            if taken == table.taken:
+                continue  # carried over, not re-sampled
+            table.update(taken, METRICS[table.metric](snap))
+            result = table.evaluate()
+            if result is None:
+                continue
+            was, now, latest = result
+            fire = now & ~was
+            if self.repeat is not None:
+                fire |= now & (t - table.notified >= self.repeat)
+            table.notified[fire] = t
+            for r, e in zip(*np.nonzero(fire | (was & ~now))):
+                event = "clear" if not now[r, e] else "repeat" if was[r, e] else "fire"
+                events.append((table.rules[r], table.entities[e], float(latest[r, e]), event))
+        return events
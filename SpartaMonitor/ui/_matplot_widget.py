@@ -1,5 +1,7 @@
+import numpy as np
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
+from matplotlib.ticker import FuncFormatter
 
 def make_figure(width=6, height=2.2, dpi=100):
     fig = Figure(figsize=(width, height), dpi=dpi)
@@ -24,3 +26,203 @@ def attach(fig, parent):
     widget.configure(highlightthickness=0, bd=0, bg="#0F1115")
     widget.pack(fill="x", padx=10, pady=8)
     return canvas
+
+
+# Blitting base for the page charts. Everything that is not animated (axes,
+# grid, ticks, legend, panel frames) is rendered once and cached as a background
+# bitmap; a tick only restores that bitmap and redraws the animated artists.
+# A full redraw happens on the first paint, after a resize, or when a subclass
+# asks for one (e.g. autoscale moved the limits).
+class BlitChart:
+    def __init__(self, fig):
+        self.fig = fig
+        self.artists = []
+        self.canvas = None
+        self._background = None
+        self._bg_size = None
+
+    def attach(self, parent):
+        canvas = FigureCanvasTkAgg(self.fig, master=parent)
+        self.bind(canvas)
+        widget = canvas.get_tk_widget()
+        widget.configure(highlightthickness=0, bd=0, bg="#0F1115")
+        widget.pack(fill="x", padx=10, pady=8)
+        return canvas
+
+    def bind(self, canvas):
+        # any canvas works (Agg for benchmarks); draw_event refreshes the cached background
+        self.canvas = canvas
+        canvas.mpl_connect("draw_event", self._on_draw)
+        canvas.draw()
+
+    def _on_draw(self, event):
+        self._background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._bg_size = self.canvas.get_width_height()
+        for artist in self.artists:
+            artist.axes.draw_artist(artist)
+
+    def blit(self, full=False):
+        if self.canvas is None:
+            return
+        if full or self._background is None or self._bg_size != self.canvas.get_width_height():
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self._background)
+        for artist in self.artists:
+            artist.axes.draw_artist(artist)
+        self.canvas.blit(self.fig.bbox)
+
+
+# Live line chart shared by the pages; y-limits optionally follow the data.
+class LiveChart(BlitChart):
+    def __init__(self, n_points, series=("",), ylabel="%", ylim=(0, 100), autoscale=False,
+                 yfmt=None, width=6, height=2.2):
+        super().__init__(make_figure(width, height))
+        self.ax = add_line_axes(self.fig, ylabel=ylabel, ylim=ylim)
+        if yfmt is not None:
+            self.ax.yaxis.set_major_formatter(FuncFormatter(lambda v, _pos: yfmt(v)))
+        self.autoscale = autoscale
+        self.min_top = ylim[1]
+        self.n_points = n_points
+
+        x = range(n_points)
+        self.lines = []
+        for label in series:
+            (line,) = self.ax.plot(x, [0] * n_points, label=label or None, animated=True)
+            self.lines.append(line)
+        if len(series) > 1:
+            self.ax.legend(facecolor="#0F1115", edgecolor="#444", labelcolor="#E0E0E0")
+        self.artists = self.lines
+
+    def _rescale(self, ydata):
+        top = max((float(np.nanmax(y)) for y in ydata if len(y)), default=0.0)
+        if top != top:  # all NaN
+            return False
+        lo, hi = self.ax.get_ylim()
+        # grow past the top, shrink once the data falls well below it
+        if top > hi or (hi > self.min_top and top < hi * 0.25):
+            self.ax.set_ylim(lo, max(self.min_top, top * 1.25))
+            return True
+        return False
+
+    def update(self, *ydata):
+        for line, y in zip(self.lines, ydata):
+            if len(y) == self.n_points:
+                line.set_ydata(y)
+            else:
+                # shorter history than the chart is wide: right-align it
+                line.set_data(np.arange(self.n_points - len(y), self.n_points), y)
+        self.blit(full=self.autoscale and self._rescale(ydata))
+
+
+# Small multiples for many devices in one figure: one panel per device, laid
+# out on a grid inside a single axes. Each metric is a single Line2D whose
+# path covers every panel (NaN breaks between devices), so a tick draws a fixed
+# number of paths and the figure keeps a fixed pixel size whatever the device
+# count. Panel frames and titles are background.
+class SmallMultiplesChart(BlitChart):
+    PANEL_H = 100.0
+    GAP = 0.12
+
+    def __init__(self, n_devices, n_points, metrics=("load",), titles=None, cols=4, width=6, height=3.2):
+        self.n_devices = n_devices
+        self.n_points = n_points
+        self.cols = max(1, min(cols, n_devices))
+        self.rows = max(1, -(-n_devices // self.cols))
+        super().__init__(make_figure(width, height))
+
+        ax = self.fig.add_axes([0.01, 0.02, 0.98, 0.96])
+        ax.set_facecolor("#0F1115")
+        ax.set_axis_off()
+        gap_x, gap_y = n_points * self.GAP, self.PANEL_H * (self.GAP + 0.15)
+        self.ax = ax
+        ax.set_xlim(-gap_x / 2, self.cols * (n_points + gap_x))
+        ax.set_ylim(-gap_y / 2, self.rows * (self.PANEL_H + gap_y))
+
+        # per-device panel origin, as (n_devices, 1) columns for broadcasting
+        idx = np.arange(n_devices)
+        col, row = idx % self.cols, idx // self.cols
+        self._x0 = (col * (n_points + gap_x))[:, None]
+        self._y0 = ((self.rows - 1 - row) * (self.PANEL_H + gap_y))[:, None]
+        # one extra NaN column per device breaks the path between panels
+        x = np.full((n_devices, n_points + 1), np.nan)
+        x[:, :-1] = self._x0 + np.arange(n_points)[None, :]
+        self._x = x.ravel()
+        self._y = np.full((n_devices, n_points + 1), np.nan)
+
+        from matplotlib.patches import Rectangle
+        titles = titles or [f"GPU {i}" for i in range(n_devices)]
+        for i in range(n_devices):
+            x0, y0 = float(self._x0[i, 0]), float(self._y0[i, 0])
+            ax.add_patch(Rectangle((x0, y0), n_points - 1, self.PANEL_H, fill=False, ec="#444", lw=0.8))
+            ax.text(x0, y0 + self.PANEL_H * 1.03, titles[i], color="#E0E0E0", fontsize=8, va="bottom")
+
+        colors = ("#3B82F6", "#F59F00", "#E03131", "#40C057")
+        self.lines = []
+        for m, name in enumerate(metrics):
+            (line,) = ax.plot(self._x, self._y.ravel(), color=colors[m % len(colors)], lw=1.0,
+                              label=name, animated=True)
+            self.lines.append(line)
+        ax.legend(handles=self.lines, loc="upper right", fontsize=7, ncol=len(metrics),
+                  facecolor="#0F1115", edgecolor="#444", labelcolor="#E0E0E0", bbox_to_anchor=(1, 1.0))
+        self.artists = self.lines
+
+    def update(self, *histories):
+        # each history is a (n_devices, n_points) array of 0-100 values
+        scale = self.PANEL_H / 100.0
+        for line, hist in zip(self.lines, histories):
+            y = np.full_like(self._y, np.nan)
+            np.multiply(np.clip(hist, 0, 100), scale, out=y[:, :-1])
+            y[:, :-1] += self._y0
+            line.set_ydata(y.ravel())
+        self.blit()
+
+
+# Rows x time heatmap (e.g. one row per CPU core) drawn as a single image
+# artist. The image is resampled to the canvas size when drawn, so a tick costs
+# about the same for 8 rows or 500. Hovering reports the row, column and exact
+# value under the pointer through on_hover(row, col, value), or
+# on_hover(None, None, None) when the pointer leaves the image.
+class HeatmapChart(BlitChart):
+    def __init__(self, n_rows, n_points, label="%", vmax=100.0, cmap="inferno", row_name="Core",
+                 width=6, height=2.6, on_hover=None):
+        super().__init__(make_figure(width, height))
+        self.n_rows = n_rows
+        self.n_points = n_points
+        self.on_hover = on_hover
+        self.data = np.full((n_rows, n_points), np.nan)
+
+        from matplotlib import colormaps
+        from matplotlib.ticker import MaxNLocator
+        cmap = colormaps[cmap].with_extremes(bad="#0F1115")
+        self.ax = add_line_axes(self.fig, ylabel=row_name, ylim=(n_rows - 0.5, -0.5))
+        self.ax.grid(False)
+        self.ax.set_xticks([])
+        self.ax.yaxis.set_major_locator(MaxNLocator(nbins=8, integer=True))
+        self.image = self.ax.imshow(self.data, aspect="auto", interpolation="nearest", cmap=cmap,
+                                    vmin=0.0, vmax=vmax, animated=True,
+                                    extent=(-0.5, n_points - 0.5, n_rows - 0.5, -0.5))
+        bar = self.fig.colorbar(self.image, ax=self.ax, pad=0.01, fraction=0.04)
+        bar.set_label(label, color="#E0E0E0")
+        bar.ax.tick_params(colors="#BFBFBF")
+        self.artists = [self.image]
+
+    def bind(self, canvas):
+        canvas.mpl_connect("motion_notify_event", self._on_motion)
+        super().bind(canvas)
+
+    def _on_motion(self, event):
+        if self.on_hover is None:
+            return
+        if event.inaxes is not self.ax or event.xdata is None:
+            self.on_hover(None, None, None)
+            return
+        row, col = int(round(event.ydata)), int(round(event.xdata))
+        if 0 <= row < self.n_rows and 0 <= col < self.n_points:
+            self.on_hover(row, col, self.data[row, col])
+
+    def update(self, data):
+        # data: (n_rows, n_points), newest column last; NaN draws as background
+        self.data = data
+        self.image.set_data(data)
+        self.blit()
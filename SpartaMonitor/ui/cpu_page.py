@@ -1,39 +1,14 @@
 import customtkinter as ctk
-import psutil, threading, time, collections
-from monitor.cpu import get_overview  # uses your existing backend
+import numpy as np
 
-# Matplotlib embed helpers
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
+from monitor.ringbuffer import RingBuffer
+from ui.page import Page
+from ui._matplot_widget import LiveChart, HeatmapChart
 
-def _make_fig():
-    fig = Figure(figsize=(6, 2.2), dpi=100)
-    fig.patch.set_facecolor("#0F1115")
-    return fig
 
-def _add_axes(fig, ylabel="%", ylim=(0, 100)):
-    ax = fig.add_subplot(111)
-    ax.set_facecolor("#0F1115")
-    ax.tick_params(colors="#BFBFBF")
-    for s in ax.spines.values():
-        s.set_color("#444")
-    ax.set_ylim(*ylim)
-    ax.set_ylabel(ylabel, color="#E0E0E0")
-    ax.grid(True, alpha=0.15, color="#888", linestyle="--")
-    return ax
-
-def _attach(fig, parent):
-    canvas = FigureCanvasTkAgg(fig, master=parent)
-    canvas.draw()
-    widget = canvas.get_tk_widget()
-    widget.configure(highlightthickness=0, bd=0, bg="#0F1115")
-    widget.pack(fill="x", padx=10, pady=8)
-    return canvas
-
-
-class CPUPage(ctk.CTkFrame):
-    def __init__(self, master, **kwargs):
-        super().__init__(master, **kwargs)
+class CPUPage(Page):
+    def __init__(self, master, collector, ui, **kwargs):
+        super().__init__(master, collector, ui, **kwargs)
         self.configure(fg_color="transparent")
 
         title = ctk.CTkLabel(self, text="🖥️ CPU", font=("Segoe UI", 22, "bold"),
@@ -42,46 +17,94 @@ class CPUPage(ctk.CTkFrame):
 
         self.summary = ctk.CTkLabel(self, text="Usage: --% | Freq: -- MHz | Temp: --°C",
                                     font=("Segoe UI", 16), fg_color="transparent", text_color="#E0E0E0")
-        self.summary.pack(pady=(0, 8))
+        self.summary.pack(pady=(0, 2))
+        # where the time goes; iowait and steal are the ones that matter on VMs
+        self.breakdown = ctk.CTkLabel(self, text="", font=("Segoe UI", 13), fg_color="transparent",
+                                      text_color="#A0A0A0")
+        self.breakdown.pack(pady=(0, 8))
 
-        # Per-core usage list
-        self.core_list = ctk.CTkScrollableFrame(self, fg_color=("gray10", "gray15"), height=180)
-        self.core_list.pack(fill="x", padx=10, pady=8)
-        self.core_labels = []
-        for i in range(psutil.cpu_count(logical=True)):
-            lbl = ctk.CTkLabel(self.core_list, text=f"Core {i}: --%",
-                               font=("Segoe UI", 14), fg_color="transparent", text_color="white")
-            lbl.pack(anchor="w", padx=10, pady=2)
-            self.core_labels.append(lbl)
+        # Per-core heatmap (cores x time): one image, whatever the core count
+        self.hist_len = 120
+        self.n_cores = 0
+        self.cores = None   # RingBuffer, one channel per core
+        self.times = RingBuffer(self.hist_len)
+        self.heatmap = None
+        self.heatmap_host = ctk.CTkFrame(self, fg_color="transparent")
+        self.heatmap_host.pack(fill="x")
+        self.hover = ctk.CTkLabel(self, text="Hover the heatmap for per-core values", font=("Segoe UI", 13),
+                                  fg_color="transparent", text_color="#A0A0A0")
+        self.hover.pack(pady=(0, 4))
 
         # Usage graph
-        self.hist_len = 120
-        self.cpu_hist = collections.deque([0]*self.hist_len, maxlen=self.hist_len)
-        fig = _make_fig()
-        self.ax = _add_axes(fig, ylabel="CPU %", ylim=(0, 100))
-        (self.line,) = self.ax.plot(range(self.hist_len), list(self.cpu_hist))
-        self.canvas = _attach(fig, self)
+        self.chart = LiveChart(self.hist_len, series=("busy", "iowait", "steal"), ylabel="CPU %", ylim=(0, 100))
+        self.chart.attach(self)
+
+        first = self.collector.latest
+        if first is not None:
+            self._resize(len(first["cpu"]["per_core"]))
+            self._rebuild_heatmap(self.n_cores)
+        self.collector.subscribe(self.on_snapshot)
+
+    def _resize(self, n_cores):
+        self.n_cores = n_cores
+        self.cores = RingBuffer(self.hist_len, channels=n_cores)
+        self.times = RingBuffer(self.hist_len)
+
+    def _rebuild_heatmap(self, n_cores):
+        # main thread only: the image shape follows the core count
+        if self.heatmap is not None:
+            self.heatmap.canvas.get_tk_widget().destroy()
+        self.heatmap = HeatmapChart(n_cores, self.hist_len, label="CPU %", on_hover=self._on_hover)
+        self.heatmap.attach(self.heatmap_host)
 
-        threading.Thread(target=self._loop, daemon=True).start()
+    def ingest(self, snap):
+        if not self.fresh(snap, "cpu"):
+            return
+        per_core = snap["cpu"]["per_core"]
+        if len(per_core) != self.n_cores:
+            self._resize(len(per_core))
+            self.ui.call((self, "rebuild"), self._rebuild_heatmap, self.n_cores)
+        self.cores.append(per_core)
+        self.times.append(snap["t"])
 
-    def _loop(self):
-        while True:
-            info = get_overview()
-            usage = info["percent"]
-            freq = info["freq_mhz"] if info["freq_mhz"] is not None else 0
-            temp = info["temp_c"]
-            per_core = info["per_core"]
+    def render(self, snap):
+        info = snap["cpu"]
+        usage = info["percent"]
+        freq = info["freq_mhz"] if info["freq_mhz"] is not None else 0
+        temp = info["temp_c"]
 
-            self.summary.configure(
-                text=f"Usage: {usage:.0f}% | Freq: {freq:.0f} MHz | Temp: {temp:.1f}°C" if temp is not None
-                     else f"Usage: {usage:.0f}% | Freq: {freq:.0f} MHz | Temp: N/A"
-            )
+        self.ui.configure(
+            self.summary,
+            text=f"Usage: {usage:.0f}% | Freq: {freq:.0f} MHz | Temp: {temp:.1f}°C" if temp is not None
+                 else f"Usage: {usage:.0f}% | Freq: {freq:.0f} MHz | Temp: N/A"
+        )
+        times = info.get("times")
+        if times:
+            parts = [f"{m} {times[m]:.0f}%" for m in ("user", "system", "iowait", "steal", "irq", "softirq")]
+            parts.append(f"{info['ctx_switches_ps']:,.0f} ctx/s")
+            if info.get("procs_running") is not None:
+                parts.append(f"run queue {info['procs_running']}")
+            self.ui.configure(self.breakdown, text=" · ".join(parts))
+        self.ui.call(self.chart, self._redraw)
 
-            for i, v in enumerate(per_core):
-                if i < len(self.core_labels):
-                    self.core_labels[i].configure(text=f"Core {i}: {v:.0f}%")
+    def _redraw(self):
+        # runs on the Tk main loop via the dispatcher
+        h, n = self.collector.history, self.hist_len
+        self.chart.update(h.series("cpu.percent", n), h.series("cpu.iowait", n), h.series("cpu.steal", n))
+        heatmap, cores = self.heatmap, self.cores
+        if heatmap is None or cores is None or heatmap.n_rows != cores.channels:
+            return
+        data = cores.view()
+        missing = self.hist_len - cores.count
+        if missing > 0:
+            # not a full window yet: unfilled columns draw as background
+            data = data.copy()
+            data[:, :missing] = np.nan
+        heatmap.update(data)
 
-            self.cpu_hist.append(usage)
-            self.line.set_ydata(list(self.cpu_hist))
-            self.canvas.draw_idle()
-            time.sleep(1)
+    def _on_hover(self, core, col, value):
+        if core is None or value != value:
+            self.hover.configure(text="Hover the heatmap for per-core values")
+            return
+        ago = float(self.times.last()[0] - self.times.view()[0, col])
+        self.hover.configure(text=f"Core {core}: {value:.0f}%  ({ago:.0f} s ago)")
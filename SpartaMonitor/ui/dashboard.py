@@ -1,16 +1,16 @@
 import customtkinter as ctk
-import psutil, threading, time
 
-try:
-    import GPUtil
-    HAS_GPU = True
-except ImportError:
-    HAS_GPU = False
+from ui.page import Page
 
+LOCAL = "This machine"
 
-class DashboardFrame(ctk.CTkFrame):
-    def __init__(self, master, **kwargs):
-        super().__init__(master, **kwargs)
+
+class DashboardFrame(Page):
+    def __init__(self, master, collector, ui, fleet=None, **kwargs):
+        super().__init__(master, collector, ui, **kwargs)
+        self.fleet = fleet
+        self.host = LOCAL
+        self._known = set()
 
         # ✅ Solid background (instead of image)
         self.configure(fg_color="#111111")  
@@ -24,6 +24,12 @@ class DashboardFrame(ctk.CTkFrame):
         )
         self.title_label.pack(pady=20)
 
+        # ✅ Host selector when remote agents report to this window
+        if self.fleet is not None:
+            self.host_menu = ctk.CTkOptionMenu(self, values=[LOCAL], command=self.select_host)
+            self.host_menu.pack(pady=(0, 10))
+            self.fleet.subscribe(self.on_remote)
+
         # ✅ Cards container
         self.cards_frame = ctk.CTkFrame(self, fg_color="transparent")
         self.cards_frame.pack(pady=20, padx=20, fill="both", expand=True)
@@ -37,8 +43,37 @@ class DashboardFrame(ctk.CTkFrame):
         self.gpu_label = self.create_card("🎮 GPU", "Loading...", 1, 1)
         self.temp_label = self.create_card("🌡 CPU Temp", "Loading...", 1, 2)
 
-        # ✅ Start background thread for stats
-        threading.Thread(target=self.update_stats, daemon=True).start()
+        # ✅ Render every snapshot from the shared collector
+        self.collector.subscribe(self.on_snapshot)
+
+    def on_snapshot(self, snap):
+        if self.host == LOCAL:
+            super().on_snapshot(snap)
+
+    def on_remote(self, host):
+        # aggregator thread; only the selected host is rebuilt into a snapshot
+        if host not in self.fleet.hosts:
+            # expired: drop it from the menu and fall back to this machine
+            self._known.discard(host)
+            self.ui.call((self, "hosts"), self._refresh_hosts)
+            if host == self.host:
+                self.ui.call((self, "host"), self.select_host, LOCAL)
+            return
+        if host not in self._known:
+            self._known.add(host)
+            self.ui.call((self, "hosts"), self._refresh_hosts)
+        if host == self.host:
+            super().on_snapshot(self.fleet.snapshot(host))
+
+    def _refresh_hosts(self):
+        self.host_menu.configure(values=[LOCAL] + sorted(self._known))
+
+    def select_host(self, host):
+        self.host = host
+        self.host_menu.set(host)
+        snap = self.collector.latest if host == LOCAL else self.fleet.snapshot(host)
+        if snap is not None:
+            super().on_snapshot(snap)
 
     def create_card(self, title, value, row, col):
         """Reusable system info card with glassy effect"""
@@ -67,49 +102,32 @@ class DashboardFrame(ctk.CTkFrame):
 
         return value_label
 
-    def update_stats(self):
-        old_sent = psutil.net_io_counters().bytes_sent
-        old_recv = psutil.net_io_counters().bytes_recv
-
-        while True:
-            # CPU, RAM, Disk
-            cpu = psutil.cpu_percent(interval=1)
-            mem = psutil.virtual_memory().percent
-            disk = psutil.disk_usage("/").percent
-
-            # Network
-            new_sent = psutil.net_io_counters().bytes_sent
-            new_recv = psutil.net_io_counters().bytes_recv
-            up_speed = (new_sent - old_sent) / 1024
-            down_speed = (new_recv - old_recv) / 1024
-            old_sent, old_recv = new_sent, new_recv
-
-            # GPU
-            gpu = 0
-            if HAS_GPU:
-                try:
-                    gpus = GPUtil.getGPUs()
-                    gpu = gpus[0].load * 100 if gpus else 0
-                except Exception:
-                    gpu = 0
-
-            # CPU Temp
-            temp = "N/A"
-            try:
-                temps = psutil.sensors_temperatures()
-                if "coretemp" in temps:
-                    temp = f"{temps['coretemp'][0].current:.1f}°C"
-                elif temps:
-                    first = list(temps.values())[0]
-                    if first:
-                        temp = f"{first[0].current:.1f}°C"
-            except Exception:
-                temp = "N/A"
-
-            # Update UI
-            self.cpu_label.configure(text=f"{cpu}%")
-            self.mem_label.configure(text=f"{mem}%")
-            self.disk_label.configure(text=f"{disk}%")
-            self.net_label.configure(text=f"⬆ {up_speed:.1f} KB/s | ⬇ {down_speed:.1f} KB/s")
-            self.gpu_label.configure(text=f"{gpu:.1f}%")
-            self.temp_label.configure(text=temp)
+    def render(self, snap):
+        # CPU, RAM, Disk
+        cpu = snap["cpu"]["percent"]
+        mem = snap["memory"]["percent"]
+        disks = snap["disks"]
+        root = next((d for d in disks if d["mount"] in ("/", "C:\\")), disks[0] if disks else None)
+        disk = f"{root['percent']}%" if root and root["percent"] is not None else "N/A"
+
+        # Network (collector reports bits per second)
+        net = snap["network"]
+        up_speed = net["tx_rate_bps"] / 8 / 1024
+        down_speed = net["rx_rate_bps"] / 8 / 1024
+
+        # GPU (average across devices)
+        gpus = snap["gpus"]
+        gpu = sum(g["load_percent"] for g in gpus) / len(gpus) if gpus else 0
+        gpu_text = f"{gpu:.1f}%" if len(gpus) < 2 else f"{gpu:.1f}% avg ({len(gpus)} GPUs)"
+
+        # CPU Temp
+        temp_c = snap["cpu"]["temp_c"]
+        temp = f"{temp_c:.1f}°C" if temp_c is not None else "N/A"
+
+        # Update UI
+        self.ui.configure(self.cpu_label, text=f"{cpu}%")
+        self.ui.configure(self.mem_label, text=f"{mem}%")
+        self.ui.configure(self.disk_label, text=disk)
+        self.ui.configure(self.net_label, text=f"⬆ {up_speed:.1f} KB/s | ⬇ {down_speed:.1f} KB/s")
+        self.ui.configure(self.gpu_label, text=gpu_text)
+        self.ui.configure(self.temp_label, text=temp)
@@ -0,0 +1,90 @@
+import customtkinter as ctk
+
+from ui.page import Page
+from ui._matplot_widget import LiveChart
+
+
+def _ms(v):
+    return "--" if v is None else f"{v:.2f}"
+
+
+def _collector_table(collectors):
+    lines = [f"{'Collector':<12}{'Every s':>8}{'Runs':>7}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}{'CPU p50':>9}"
+             f"{'Jitter p99':>12}{'Missed':>8}"]
+    for key, c in sorted(collectors.items(), key=lambda kv: -(kv[1].get("total_ms") or 0)):
+        every = c.get("interval_s")
+        # "x2.3" after the interval: slowed down by the sampling budget
+        every = "--" if every is None else f"{every:g}" + (f" x{c['backoff']:.1f}" if c.get("backoff", 1) > 1 else "")
+        lines.append(f"{key:<12}{every:>8}{c.get('count', 0):>7}{_ms(c.get('p50_ms')):>9}{_ms(c.get('p99_ms')):>9}"
+                     f"{_ms(c.get('max_ms')):>9}{_ms(c.get('cpu_p50_ms')):>9}{_ms(c.get('jitter_p99_ms')):>12}"
+                     f"{c.get('missed', 0):>8}")
+    return "\n".join(lines)
+
+
+def _page_table(subscribers, draw):
+    # pages and other subscribers: snapshot handling on the collector thread
+    # (ingest + render), then their queued drawing on the Tk thread
+    owners = {k.split(".")[0]: v for k, v in subscribers.items()}
+    lines = [f"{'Component':<22}{'update p50':>11}{'p99':>8}{'draw p50':>10}{'p99':>8}{'max':>8}{'Errors':>8}"]
+    for name in sorted(set(owners) | set(draw)):
+        u, d = owners.get(name) or {}, draw.get(name) or {}
+        lines.append(f"{name[:21]:<22}{_ms(u.get('p50_ms')):>11}{_ms(u.get('p99_ms')):>8}"
+                     f"{_ms(d.get('p50_ms')):>10}{_ms(d.get('p99_ms')):>8}{_ms(d.get('max_ms')):>8}"
+                     f"{u.get('errors', 0):>8}")
+    return "\n".join(lines)
+
+
+class DiagnosticsPage(Page):
+    # what the monitor itself costs: its process, each collector, each page, the UI queue
+    def __init__(self, master, collector, ui, **kwargs):
+        super().__init__(master, collector, ui, **kwargs)
+        self.configure(fg_color="transparent")
+
+        title = ctk.CTkLabel(self, text="🩺 Diagnostics", font=("Segoe UI", 22, "bold"),
+                             fg_color="transparent", text_color="white")
+        title.pack(pady=(10, 4))
+
+        self.summary = ctk.CTkLabel(self, text="Monitor: -- MB | -- threads | --% CPU",
+                                    font=("Segoe UI", 16), fg_color="transparent", text_color="#E0E0E0")
+        self.summary.pack(pady=(0, 2))
+        self.ui_line = ctk.CTkLabel(self, text="", font=("Segoe UI", 13), fg_color="transparent",
+                                    text_color="#A0A0A0")
+        self.ui_line.pack(pady=(0, 8))
+
+        self.collectors = ctk.CTkLabel(self, text="", font=("Consolas", 13), justify="left",
+                                       fg_color="transparent", text_color="#C0C0C0")
+        self.collectors.pack(pady=(0, 8))
+        self.pages = ctk.CTkLabel(self, text="", font=("Consolas", 13), justify="left",
+                                  fg_color="transparent", text_color="#C0C0C0")
+        self.pages.pack(pady=(0, 8))
+
+        self.hist_len = 120
+        self.chart = LiveChart(self.hist_len, ylabel="monitor CPU %", ylim=(0, 5), autoscale=True)
+        self.chart.attach(self)
+
+        self.collector.subscribe(self.on_snapshot)
+
+    def render(self, snap):
+        own = snap.get("monitor")
+        if not own:
+            self.ui.configure(self.summary, text="Monitor: no self-instrumentation in this snapshot")
+            return
+        proc = own.get("process") or {}
+        cpu = proc.get("cpu_percent")
+        self.ui.configure(self.summary, text=f"Monitor: {proc.get('rss', 0) / 2**20:.1f} MB | "
+                                             f"{proc.get('threads', '--')} threads | "
+                                             f"{'--' if cpu is None else f'{cpu:.1f}'}% CPU")
+        ui = own.get("ui") or {}
+        queue, frame = ui.get("queue") or {}, ui.get("frame") or {}
+        missed = sum(c.get("missed", 0) for c in (own.get("collectors") or {}).values())
+        load = own.get("load_percent")
+        self.ui.configure(self.ui_line, text=f"UI queue p50 {_ms(queue.get('p50_ms'))} / p99 {_ms(queue.get('p99_ms'))} ms"
+                                             f" · frame p99 {_ms(frame.get('p99_ms'))} ms"
+                                             f" · missed deadlines {missed}  (since start)"
+                                             f" · sampling load {'--' if load is None else f'{load:.2f}'}%")
+        self.ui.configure(self.collectors, text=_collector_table(own.get("collectors") or {}))
+        self.ui.configure(self.pages, text=_page_table(own.get("subscribers") or {}, own.get("draw") or {}))
+        self.ui.call(self.chart, self._redraw)
+
+    def _redraw(self):
+        self.chart.update(self.collector.history.series("monitor.cpu_percent", self.hist_len))
@@ -1,37 +1,33 @@
 import customtkinter as ctk
-import psutil, threading, time, collections
-
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
-
-def _make_fig():
-    fig = Figure(figsize=(6, 2.2), dpi=100)
-    fig.patch.set_facecolor("#0F1115")
-    return fig
-
-def _add_axes(fig, ylabel="KB/s", ylim=(0, 5000)):
-    ax = fig.add_subplot(111)
-    ax.set_facecolor("#0F1115")
-    ax.tick_params(colors="#BFBFBF")
-    for s in ax.spines.values():
-        s.set_color("#444")
-    ax.set_ylim(*ylim)
-    ax.set_ylabel(ylabel, color="#E0E0E0")
-    ax.grid(True, alpha=0.15, color="#888", linestyle="--")
-    return ax
-
-def _attach(fig, parent):
-    canvas = FigureCanvasTkAgg(fig, master=parent)
-    canvas.draw()
-    w = canvas.get_tk_widget()
-    w.configure(highlightthickness=0, bd=0, bg="#0F1115")
-    w.pack(fill="x", padx=10, pady=8)
-    return canvas
-
-
-class DiskPage(ctk.CTkFrame):
-    def __init__(self, master, **kwargs):
-        super().__init__(master, **kwargs)
+
+from ui.page import Page
+from ui._matplot_widget import LiveChart
+from utils.formatting import human_bytes
+
+# per-disk I/O table columns: (header, width in characters)
+IO_COLUMNS = (("Disk", 12), ("Read/s", 12), ("Write/s", 12), ("IOPS r/w", 14), ("Await", 10), ("Util", 7),
+              ("Queue", 8), ("In flight", 9))
+
+
+def _opt(value, fmt):
+    # None, or NaN from a plain-dict snapshot (psutil has no queue or in-flight counters)
+    return "-" if value is None or value != value else fmt.format(value)
+
+
+def _io_table(per_disk):
+    rows = ["".join(h.ljust(w) for h, w in IO_COLUMNS)]
+    for name, r in sorted(per_disk.items()):
+        cells = (name[:11], human_bytes(r["read_Bps"]), human_bytes(r["write_Bps"]),
+                 f"{r['read_iops']:.0f}/{r['write_iops']:.0f}", f"{r['await_ms']:.1f} ms",
+                 _opt(r["util_percent"], "{:.0f}%"), _opt(r.get("queue_depth"), "{:.2f}"),
+                 _opt(r.get("in_flight"), "{:.0f}"))
+        rows.append("".join(c.ljust(w) for c, (_, w) in zip(cells, IO_COLUMNS)))
+    return "\n".join(rows)
+
+
+class DiskPage(Page):
+    def __init__(self, master, collector, ui, **kwargs):
+        super().__init__(master, collector, ui, **kwargs)
         self.configure(fg_color="transparent")
 
         title = ctk.CTkLabel(self, text="📀 Disk", font=("Segoe UI", 22, "bold"),
@@ -41,57 +37,95 @@ class DiskPage(ctk.CTkFrame):
         # Partitions list
         self.parts_frame = ctk.CTkScrollableFrame(self, fg_color=("gray10", "gray15"), height=220)
         self.parts_frame.pack(fill="x", padx=10, pady=8)
-        self.part_widgets = []
+        self.part_rows = {}  # mount -> (row, name, bar, value)
+        self._disks_shown = None
+        self._mounts = ()  # mount set last handed to _sync_partitions
+
+        # Per-disk I/O breakdown
+        self.io_table = ctk.CTkLabel(self, text="", font=("Courier New", 13), justify="left", anchor="w",
+                                     fg_color=("gray10", "gray15"), text_color="#E0E0E0", corner_radius=8)
+        self.io_table.pack(fill="x", padx=10, pady=6, ipadx=8, ipady=6)
 
         # IO graph
         self.hist_len = 120
-        self.r_hist = collections.deque([0]*self.hist_len, maxlen=self.hist_len)
-        self.w_hist = collections.deque([0]*self.hist_len, maxlen=self.hist_len)
-        fig = _make_fig()
-        self.ax = _add_axes(fig, ylabel="KB/s", ylim=(0, 50000))
-        (self.r_line,) = self.ax.plot(range(self.hist_len), list(self.r_hist), label="read")
-        (self.w_line,) = self.ax.plot(range(self.hist_len), list(self.w_hist), label="write")
-        self.ax.legend(facecolor="#0F1115", edgecolor="#444", labelcolor="#E0E0E0")
-        self.canvas = _attach(fig, self)
-
-        threading.Thread(target=self._loop, daemon=True).start()
-
-    def _refresh_partitions(self):
-        for w in self.part_widgets:
-            w.destroy()
-        self.part_widgets.clear()
-
-        for p in psutil.disk_partitions(all=False):
-            try:
-                usage = psutil.disk_usage(p.mountpoint)
-            except Exception:
+        self.chart = LiveChart(self.hist_len, series=("read", "write"), ylabel="Disk I/O",
+                               ylim=(0, 1024 * 1024), autoscale=True, yfmt=lambda v: f"{human_bytes(v)}/s",
+                               height=1.8)
+        self.chart.attach(self)
+
+        # IOPS and worst-device latency, both autoscaled (NVMe runs into six figures)
+        self.iops_chart = LiveChart(self.hist_len, series=("IOPS",), ylabel="IOPS", ylim=(0, 100),
+                                    autoscale=True, yfmt=lambda v: f"{v:,.0f}", height=1.6)
+        self.iops_chart.attach(self)
+        self.await_chart = LiveChart(self.hist_len, series=("await", "util %"), ylabel="Await ms / util %",
+                                     ylim=(0, 100), autoscale=True, height=1.6)
+        self.await_chart.attach(self)
+
+        if self.collector.latest is not None:
+            self._disks_shown = self.collector.latest["disks"]
+            self._mounts = tuple(d["mount"] for d in self._disks_shown)
+            self._sync_partitions(self._disks_shown)
+        self.collector.subscribe(self.on_snapshot)
+
+    def _usage_text(self, d):
+        if d["percent"] is None:
+            return "⚠ stale"
+        text = f"{d['percent']:.0f}%"
+        return f"⚠ {text} (stale)" if d.get("stale") else text
+
+    def _update_row(self, d, bar, val):
+        # in place, through the dispatcher: unchanged values cost nothing
+        self.ui.set(bar, (d["percent"] or 0) / 100)
+        self.ui.configure(val, text=self._usage_text(d),
+                          text_color="#ffb86c" if d.get("stale") else "#D0D0D0")
+
+    def _sync_partitions(self, disks):
+        # main thread: add rows for new mounts and drop rows for unmounted ones;
+        # rows for mounts that are still there are left alone
+        mounts = {d["mount"]: d for d in disks}
+        for mount in [m for m in self.part_rows if m not in mounts]:
+            row, *widgets = self.part_rows.pop(mount)
+            for w in widgets:
+                self.ui.forget(w)
+            row.destroy()
+
+        for d in disks:
+            if d["mount"] in self.part_rows:
                 continue
             row = ctk.CTkFrame(self.parts_frame, fg_color="transparent")
             row.pack(fill="x", padx=8, pady=6)
 
-            name = ctk.CTkLabel(row, text=f"{p.device} ({p.mountpoint})", font=("Segoe UI", 14, "bold"),
+            name = ctk.CTkLabel(row, text=f"{d['device']} ({d['mount']})", font=("Segoe UI", 14, "bold"),
                                 fg_color="transparent", text_color="white")
             name.pack(side="left")
 
-            percent = usage.percent / 100
-            bar = ctk.CTkProgressBar(row, height=14); bar.set(percent)
+            bar = ctk.CTkProgressBar(row, height=14); bar.set((d["percent"] or 0) / 100)
             bar.pack(side="right", fill="x", expand=True, padx=10)
-            val = ctk.CTkLabel(row, text=f"{usage.percent:.0f}%", fg_color="transparent", text_color="#D0D0D0")
+            val = ctk.CTkLabel(row, text=self._usage_text(d), fg_color="transparent",
+                               text_color="#ffb86c" if d.get("stale") else "#D0D0D0")
             val.pack(side="right", padx=8)
-            self.part_widgets += [row, name, bar, val]
-
-    def _loop(self):
-        self._refresh_partitions()
-        old = psutil.disk_io_counters()
-        while True:
-            time.sleep(1)
-            new = psutil.disk_io_counters()
-            r = (new.read_bytes - old.read_bytes) / 1024
-            w = (new.write_bytes - old.write_bytes) / 1024
-            old = new
-
-            self.r_hist.append(r)
-            self.w_hist.append(w)
-            self.r_line.set_ydata(list(self.r_hist))
-            self.w_line.set_ydata(list(self.w_hist))
-            self.canvas.draw_idle()
+            self.part_rows[d["mount"]] = (row, name, bar, val)
+
+    def _render_partitions(self, disks):
+        if disks is self._disks_shown:
+            return  # partitions are sampled far less often than the page renders
+        self._disks_shown = disks
+        mounts = tuple(d["mount"] for d in disks)
+        if mounts != self._mounts:
+            self._mounts = mounts
+            self.ui.call((self, "partitions"), self._sync_partitions, disks)
+        for d in disks:
+            widgets = self.part_rows.get(d["mount"])
+            if widgets is not None:
+                self._update_row(d, widgets[2], widgets[3])
+
+    def render(self, snap):
+        self._render_partitions(snap["disks"])
+        self.ui.configure(self.io_table, text=_io_table(snap["disk_io"].get("per_disk", {})))
+        self.ui.call(self.chart, self._redraw)
+
+    def _redraw(self):
+        h, n = self.collector.history, self.hist_len
+        self.chart.update(h.series("disk.read_Bps", n), h.series("disk.write_Bps", n))
+        self.iops_chart.update(h.series("disk.iops", n))
+        self.await_chart.update(h.series("disk.await_ms", n), h.series("disk.util_percent", n))
@@ -0,0 +1,107 @@
+import time, threading
+
+from monitor.selfstats import STATS
+
+_MISSING = object()
+
+
+# Tk is not thread-safe, so collector callbacks never touch widgets directly.
+# They queue writes here and the dispatcher applies them on the main loop once
+# per frame: several writes to the same widget merge into one, and configure()
+# is skipped when the displayed value would not change.
+# Each drain records how long the oldest queued write waited ("ui" "queue"),
+# the drain itself ("ui" "frame") and each call by its owner ("draw").
+class UIDispatcher:
+    def __init__(self, root, frame_ms=50, stats=STATS):
+        self.root = root
+        self.frame_ms = frame_ms
+        self.stats = stats
+        self._first = None   # perf_counter() of the oldest write not yet applied
+        self._lock = threading.Lock()
+        self._pending = {}   # widget -> merged configure kwargs
+        self._values = {}    # widget -> latest .set() value (progress bars)
+        self._calls = {}     # key -> (fn, args), last one wins
+        self._applied = {}   # widget -> options as last written
+        self._stopped = False
+        self._after_id = self.root.after(self.frame_ms, self._drain)
+
+    def configure(self, widget, **kwargs):
+        with self._lock:
+            self._pending.setdefault(widget, {}).update(kwargs)
+            if self._first is None:
+                self._first = time.perf_counter()
+
+    def set(self, widget, value):
+        with self._lock:
+            self._values[widget] = value
+            if self._first is None:
+                self._first = time.perf_counter()
+
+    def call(self, key, fn, *args):
+        # coalesced by key, e.g. one chart redraw per frame however many ticks queued it
+        with self._lock:
+            self._calls[key] = (fn, args)
+            if self._first is None:
+                self._first = time.perf_counter()
+
+    def forget(self, widget):
+        # drop cached state for a widget that is about to be destroyed
+        with self._lock:
+            self._pending.pop(widget, None)
+            self._values.pop(widget, None)
+            self._applied.pop(widget, None)
+
+    def stop(self):
+        self._stopped = True
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _drain(self):
+        start = time.perf_counter()
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            values, self._values = self._values, {}
+            calls, self._calls = self._calls, {}
+            first, self._first = self._first, None
+
+        for widget, kwargs in pending.items():
+            applied = self._applied.setdefault(widget, {})
+            changed = {k: v for k, v in kwargs.items() if applied.get(k, _MISSING) != v}
+            if not changed:
+                continue
+            try:
+                widget.configure(**changed)
+            except Exception:
+                # widget went away between queueing and drawing
+                self._applied.pop(widget, None)
+                continue
+            applied.update(changed)
+
+        for widget, value in values.items():
+            applied = self._applied.setdefault(widget, {})
+            if applied.get("value", _MISSING) == value:
+                continue
+            try:
+                widget.set(value)
+            except Exception:
+                self._applied.pop(widget, None)
+                continue
+            applied["value"] = value
+
+        for fn, args in calls.values():
+            t0 = time.perf_counter()
+            try:
+                fn(*args)
+            except Exception:
+                pass
+            owner = getattr(fn, "__self__", None)
+            self.stats.observe("draw", type(owner).__name__ if owner is not None else getattr(fn, "__name__", "?"),
+                               time.perf_counter() - t0)
+
+        if first is not None:
+            self.stats.observe("ui", "queue", time.perf_counter() - first)
+            self.stats.observe("ui", "frame", time.perf_counter() - start)
+
+        if not self._stopped:  # stop() may have run inside one of the calls
+            self._after_id = self.root.after(self.frame_ms, self._drain)
@@ -1,84 +1,82 @@
 import customtkinter as ctk
-import threading, time, collections
+import numpy as np
 
-try:
-    import GPUtil
-    HAS_GPU = True
-except Exception:
-    HAS_GPU = False
+from monitor.ringbuffer import RingBuffer
+from ui.page import Page
+from ui._matplot_widget import SmallMultiplesChart
 
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
+METRICS = ("load %", "mem %", "temp °C")
 
-def _make_fig():
-    fig = Figure(figsize=(6, 2.2), dpi=100)
-    fig.patch.set_facecolor("#0F1115")
-    return fig
 
-def _add_axes(fig, ylabel="GPU %", ylim=(0, 100)):
-    ax = fig.add_subplot(111)
-    ax.set_facecolor("#0F1115")
-    ax.tick_params(colors="#BFBFBF")
-    for s in ax.spines.values():
-        s.set_color("#444")
-    ax.set_ylim(*ylim)
-    ax.set_ylabel(ylabel, color="#E0E0E0")
-    ax.grid(True, alpha=0.15, color="#888", linestyle="--")
-    return ax
-
-def _attach(fig, parent):
-    canvas = FigureCanvasTkAgg(fig, master=parent)
-    canvas.draw()
-    w = canvas.get_tk_widget()
-    w.configure(highlightthickness=0, bd=0, bg="#0F1115")
-    w.pack(fill="x", padx=10, pady=8)
-    return canvas
-
-
-class GPUPage(ctk.CTkFrame):
-    def __init__(self, master, **kwargs):
-        super().__init__(master, **kwargs)
+class GPUPage(Page):
+    def __init__(self, master, collector, ui, **kwargs):
+        super().__init__(master, collector, ui, **kwargs)
         self.configure(fg_color="transparent")
 
         title = ctk.CTkLabel(self, text="🎮 GPU", font=("Segoe UI", 22, "bold"),
                              fg_color="transparent", text_color="white")
         title.pack(pady=(10, 4))
 
-        self.summary = ctk.CTkLabel(self, text="Load: --% | Mem: --%", font=("Segoe UI", 16),
-                                    fg_color="transparent", text_color="#E0E0E0")
+        # one multi-line label for all devices
+        self.summary = ctk.CTkLabel(self, text="Load: --% | Mem: --%", font=("Segoe UI", 14),
+                                    fg_color="transparent", text_color="#E0E0E0", justify="left")
         self.summary.pack(pady=4)
 
+        # devices x time history, one ring per metric
         self.hist_len = 120
-        self.load_hist = collections.deque([0]*self.hist_len, maxlen=self.hist_len)
-        fig = _make_fig()
-        self.ax = _add_axes(fig, ylabel="GPU %", ylim=(0, 100))
-        (self.load_line,) = self.ax.plot(range(self.hist_len), list(self.load_hist))
-        self.canvas = _attach(fig, self)
+        self.n_devices = 0
+        self.hist = None
+        self.chart = None
+        self.chart_host = ctk.CTkFrame(self, fg_color="transparent")
+        self.chart_host.pack(fill="both", expand=True)
+
+        first = self.collector.latest
+        if first is not None and first["gpus"]:
+            self._resize(first["gpus"])
+            self._rebuild_chart(first["gpus"])
+        self.collector.subscribe(self.on_snapshot)
+
+    def _resize(self, gpus):
+        self.n_devices = len(gpus)
+        self.hist = [RingBuffer(self.hist_len, channels=self.n_devices) for _ in METRICS]
+
+    def _rebuild_chart(self, gpus):
+        # main thread only: the figure size depends on the device count
+        if self.chart is not None:
+            self.chart.canvas.get_tk_widget().destroy()
+        titles = [f"GPU {g['id']}: {g['name']}" for g in gpus]
+        self.chart = SmallMultiplesChart(len(gpus), self.hist_len, metrics=METRICS, titles=titles)
+        self.chart.attach(self.chart_host)
 
-        if HAS_GPU:
-            threading.Thread(target=self._loop, daemon=True).start()
-        else:
-            self.summary.configure(text="No GPU detected (GPUtil not available)")
+    def ingest(self, snap):
+        if not self.fresh(snap, "gpus"):
+            return
+        gpus = snap["gpus"]
+        if not gpus:
+            return
+        if len(gpus) != self.n_devices:
+            self._resize(gpus)
+            self.ui.call((self, "rebuild"), self._rebuild_chart, gpus)
+        load, mem, temp = self.hist
+        load.append([g["load_percent"] for g in gpus])
+        mem.append([g["mem_used_mb"] / g["mem_total_mb"] * 100 if g["mem_total_mb"] else np.nan for g in gpus])
+        temp.append([g["temp_c"] if g["temp_c"] is not None else np.nan for g in gpus])
 
-    def _loop(self):
-        while True:
-            try:
-                gpus = GPUtil.getGPUs()
-                if not gpus:
-                    raise RuntimeError("No GPUs")
-                g = gpus[0]
-                load = g.load * 100
-                mem = 0
-                try:
-                    mem = (g.memoryUsed / g.memoryTotal) * 100 if g.memoryTotal else 0
-                except Exception:
-                    pass
+    def render(self, snap):
+        gpus = snap["gpus"]
+        if not gpus:
+            self.ui.configure(self.summary, text="No GPU detected")
+            return
+        lines = []
+        for g in gpus:
+            mem = (g["mem_used_mb"] / g["mem_total_mb"]) * 100 if g["mem_total_mb"] else 0
+            temp = f"{g['temp_c']:.0f}°C" if g["temp_c"] is not None else "N/A"
+            lines.append(f"GPU {g['id']}: Load: {g['load_percent']:.0f}% | Mem: {mem:.0f}% | Temp: {temp}")
+        self.ui.configure(self.summary, text="\n".join(lines))
+        self.ui.call(self, self._redraw)
 
-                self.summary.configure(text=f"Load: {load:.0f}% | Mem: {mem:.0f}%")
-                self.load_hist.append(load)
-                self.load_line.set_ydata(list(self.load_hist))
-                self.canvas.draw_idle()
-            except Exception:
-                self.summary.configure(text="GPU info unavailable")
-            finally:
-                time.sleep(1)
+    def _redraw(self):
+        chart, hist = self.chart, self.hist
+        if chart is None or hist is None or chart.n_devices != hist[0].channels:
+            return
+        chart.update(*(h.view() for h in hist))
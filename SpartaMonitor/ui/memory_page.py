@@ -1,37 +1,22 @@
 import customtkinter as ctk
-import psutil, threading, time, collections
-
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
-
-def _make_fig():
-    fig = Figure(figsize=(6, 2.2), dpi=100)
-    fig.patch.set_facecolor("#0F1115")
-    return fig
-
-def _add_axes(fig, ylabel="%", ylim=(0, 100)):
-    ax = fig.add_subplot(111)
-    ax.set_facecolor("#0F1115")
-    ax.tick_params(colors="#BFBFBF")
-    for s in ax.spines.values():
-        s.set_color("#444")
-    ax.set_ylim(*ylim)
-    ax.set_ylabel(ylabel, color="#E0E0E0")
-    ax.grid(True, alpha=0.15, color="#888", linestyle="--")
-    return ax
-
-def _attach(fig, parent):
-    canvas = FigureCanvasTkAgg(fig, master=parent)
-    canvas.draw()
-    w = canvas.get_tk_widget()
-    w.configure(highlightthickness=0, bd=0, bg="#0F1115")
-    w.pack(fill="x", padx=10, pady=8)
-    return canvas
-
-
-class MemoryPage(ctk.CTkFrame):
-    def __init__(self, master, **kwargs):
-        super().__init__(master, **kwargs)
+
+from ui.page import Page
+from ui._matplot_widget import LiveChart
+
+GB = 1024**3
+
+
+def _gb(v):
+    return "--" if v is None else f"{v / GB:.2f} GB"
+
+
+def _rate(v):
+    return "--" if v is None else f"{v:,.0f}/s"
+
+
+class MemoryPage(Page):
+    def __init__(self, master, collector, ui, **kwargs):
+        super().__init__(master, collector, ui, **kwargs)
         self.configure(fg_color="transparent")
 
         title = ctk.CTkLabel(self, text="💾 Memory", font=("Segoe UI", 22, "bold"),
@@ -46,24 +31,62 @@ class MemoryPage(ctk.CTkFrame):
         self.bar.set(0)
         self.bar.pack(fill="x", padx=12, pady=8)
 
+        # what "used" and "available" are made of, and how hard the kernel is working for it
+        self.breakdown = ctk.CTkLabel(self, text="", font=("Consolas", 13), justify="left",
+                                      fg_color="transparent", text_color="#C0C0C0")
+        self.breakdown.pack(pady=(0, 4))
+        self.psi = ctk.CTkLabel(self, text="", font=("Segoe UI", 13), fg_color="transparent",
+                                text_color="#A0A0A0")
+        self.psi.pack(pady=(0, 8))
+
         self.hist_len = 120
-        self.mem_hist = collections.deque([0]*self.hist_len, maxlen=self.hist_len)
-        fig = _make_fig()
-        self.ax = _add_axes(fig, ylabel="RAM %", ylim=(0, 100))
-        (self.line,) = self.ax.plot(range(self.hist_len), list(self.mem_hist))
-        self.canvas = _attach(fig, self)
-
-        threading.Thread(target=self._loop, daemon=True).start()
-
-    def _loop(self):
-        while True:
-            v = psutil.virtual_memory()
-            used_gb = (v.total - v.available) / (1024**3)
-            total_gb = v.total / (1024**3)
-            self.summary.configure(text=f"Used: {used_gb:.2f} / {total_gb:.2f} GB  ( {v.percent:.0f}% )")
-            self.bar.set(v.percent / 100)
-
-            self.mem_hist.append(v.percent)
-            self.line.set_ydata(list(self.mem_hist))
-            self.canvas.draw_idle()
-            time.sleep(1)
+        self.chart = LiveChart(self.hist_len, series=("used", "cache"), ylabel="RAM %", ylim=(0, 100))
+        self.chart.attach(self)
+        # stall time: the early warning that RAM % does not give
+        self.psi_chart = None
+        if self.collector.latest is None or self.collector.latest.get("pressure"):
+            self.psi_chart = LiveChart(self.hist_len, series=("mem some", "mem full", "io some"),
+                                       ylabel="stall %", ylim=(0, 10), autoscale=True)
+            self.psi_chart.attach(self)
+
+        self.collector.subscribe(self.on_snapshot)
+
+    def render(self, snap):
+        v = snap["memory"]
+        used_gb = (v["total"] - v["available"]) / GB
+        total_gb = v["total"] / GB
+        self.ui.configure(self.summary, text=f"Used: {used_gb:.2f} / {total_gb:.2f} GB  ( {v['percent']:.0f}% )")
+        self.ui.set(self.bar, v["percent"] / 100)
+
+        d, vm = v.get("detail") or {}, v.get("vm") or {}
+        lines = [
+            f"Cached {_gb(d.get('cached')):>10}   Buffers {_gb(d.get('buffers')):>10}   Shmem {_gb(d.get('shmem')):>10}",
+            f"Slab   {_gb(d.get('slab')):>10}   Dirty   {_gb(d.get('dirty')):>10}   Writeback {_gb(d.get('writeback'))}",
+            f"Faults {_rate(vm.get('faults_ps')):>10}   Major   {_rate(vm.get('major_faults_ps')):>10}   "
+            f"Swap in/out {_rate(vm.get('swap_in_ps'))} / {_rate(vm.get('swap_out_ps'))}",
+        ]
+        if d.get("hugepages_total"):
+            lines.append(f"HugePages {d['hugepages_total'] - d['hugepages_free']} / {d['hugepages_total']} used"
+                         f" ({_gb(d['hugepages_total'] * d['hugepage_size'])})")
+        self.ui.configure(self.breakdown, text="\n".join(lines))
+
+        psi = snap.get("pressure")
+        if psi:
+            parts = []
+            for resource in ("cpu", "memory", "io"):
+                kinds = psi.get(resource) or {}
+                if kinds:
+                    parts.append(f"{resource} " + " / ".join(f"{k} {a['avg10']:.1f}%" for k, a in kinds.items()))
+            text = "Pressure (10 s): " + " · ".join(parts)
+        else:
+            text = "Pressure stall info: not available on this system"
+        self.ui.configure(self.psi, text=text)
+
+        self.ui.call(self.chart, self._redraw)
+
+    def _redraw(self):
+        h, n = self.collector.history, self.hist_len
+        self.chart.update(h.series("mem.percent", n), h.series("mem.cache_percent", n))
+        if self.psi_chart is not None:
+            self.psi_chart.update(h.series("psi.memory_some", n), h.series("psi.memory_full", n),
+                                  h.series("psi.io_some", n))
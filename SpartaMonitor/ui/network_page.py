@@ -1,32 +1,22 @@
 import customtkinter as ctk
-import psutil, threading, time, collections, socket
-
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
-
-def _make_fig():
-    fig = Figure(figsize=(6, 2.2), dpi=100)
-    fig.patch.set_facecolor("#0F1115")
-    return fig
-
-def _add_axes(fig, ylabel="KB/s", ylim=(0, 10000)):
-    ax = fig.add_subplot(111)
-    ax.set_facecolor("#0F1115")
-    ax.tick_params(colors="#BFBFBF")
-    for s in ax.spines.values():
-        s.set_color("#444")
-    ax.set_ylim(*ylim)
-    ax.set_ylabel(ylabel, color="#E0E0E0")
-    ax.grid(True, alpha=0.15, color="#888", linestyle="--")
-    return ax
-
-def _attach(fig, parent):
-    canvas = FigureCanvasTkAgg(fig, master=parent)
-    canvas.draw()
-    w = canvas.get_tk_widget()
-    w.configure(highlightthickness=0, bd=0, bg="#0F1115")
-    w.pack(fill="x", padx=10, pady=8)
-    return canvas
+import socket, threading
+
+from ui.page import Page
+from ui._matplot_widget import LiveChart
+from utils.formatting import human_rate
+
+# per-interface table columns: (header, width in characters)
+NIC_COLUMNS = (("Interface", 14), ("⬆ Up", 13), ("⬇ Down", 13), ("Pkts/s", 14), ("Err/s", 8), ("Drop/s", 8))
+
+
+def _nic_table(per_nic):
+    rows = ["".join(h.ljust(w) for h, w in NIC_COLUMNS)]
+    for name, r in sorted(per_nic.items(), key=lambda kv: -(kv[1]["tx_bps"] + kv[1]["rx_bps"])):
+        cells = (name[:13], human_rate(r["tx_bps"]), human_rate(r["rx_bps"]),
+                 f"{r['tx_pps']:.0f}/{r['rx_pps']:.0f}", f"{r['errors_ps']:.0f}", f"{r['drops_ps']:.0f}")
+        rows.append("".join(c.ljust(w) for c, (_, w) in zip(cells, NIC_COLUMNS)))
+    return "\n".join(rows)
+
 
 def _get_ip():
     ip = "-"
@@ -40,45 +30,47 @@ def _get_ip():
     return ip
 
 
-class NetworkPage(ctk.CTkFrame):
-    def __init__(self, master, **kwargs):
-        super().__init__(master, **kwargs)
+class NetworkPage(Page):
+    def __init__(self, master, collector, ui, **kwargs):
+        super().__init__(master, collector, ui, **kwargs)
+        # the lookup opens a socket; keep it off the first paint
+        self.ip = "-"
+        threading.Thread(target=self._resolve_ip, daemon=True).start()
         self.configure(fg_color="transparent")
 
         title = ctk.CTkLabel(self, text="📶 Network", font=("Segoe UI", 22, "bold"),
                              fg_color="transparent", text_color="white")
         title.pack(pady=(10, 4))
 
-        self.summary = ctk.CTkLabel(self, text=f"IP: {_get_ip()} | ⬆ -- KB/s ⬇ -- KB/s",
+        self.summary = ctk.CTkLabel(self, text=f"IP: {self.ip} | ⬆ -- KB/s ⬇ -- KB/s",
                                     font=("Segoe UI", 16), fg_color="transparent", text_color="#E0E0E0")
         self.summary.pack(pady=4)
 
+        # Per-interface breakdown, busiest first
+        self.nics = ctk.CTkLabel(self, text="", font=("Courier New", 13), justify="left", anchor="w",
+                                 fg_color=("gray10", "gray15"), text_color="#E0E0E0", corner_radius=8)
+        self.nics.pack(fill="x", padx=10, pady=6, ipadx=8, ipady=6)
+
         self.hist_len = 120
-        self.up_hist = collections.deque([0]*self.hist_len, maxlen=self.hist_len)
-        self.down_hist = collections.deque([0]*self.hist_len, maxlen=self.hist_len)
-
-        fig = _make_fig()
-        self.ax = _add_axes(fig, ylabel="KB/s", ylim=(0, 100000))
-        (self.up_line,) = self.ax.plot(range(self.hist_len), list(self.up_hist), label="up")
-        (self.down_line,) = self.ax.plot(range(self.hist_len), list(self.down_hist), label="down")
-        self.ax.legend(facecolor="#0F1115", edgecolor="#444", labelcolor="#E0E0E0")
-        self.canvas = _attach(fig, self)
-
-        threading.Thread(target=self._loop, daemon=True).start()
-
-    def _loop(self):
-        old = psutil.net_io_counters()
-        ip = _get_ip()
-        while True:
-            time.sleep(1)
-            new = psutil.net_io_counters()
-            up = (new.bytes_sent - old.bytes_sent) / 1024
-            down = (new.bytes_recv - old.bytes_recv) / 1024
-            old = new
-
-            self.up_hist.append(up)
-            self.down_hist.append(down)
-            self.up_line.set_ydata(list(self.up_hist))
-            self.down_line.set_ydata(list(self.down_hist))
-            self.canvas.draw_idle()
-            self.summary.configure(text=f"IP: {ip} | ⬆ {up:.1f} KB/s ⬇ {down:.1f} KB/s")
+
+        self.chart = LiveChart(self.hist_len, series=("up", "down"), ylabel="Network",
+                               ylim=(0, 1e6), autoscale=True, yfmt=human_rate)
+        self.chart.attach(self)
+
+        self.collector.subscribe(self.on_snapshot)
+
+    def _resolve_ip(self):
+        self.ip = _get_ip()
+
+    def render(self, snap):
+        # collector reports bits per second; the summary shows KB/s
+        net = snap["network"]
+        up = net["tx_rate_bps"] / 8 / 1024
+        down = net["rx_rate_bps"] / 8 / 1024
+        self.ui.call(self.chart, self._redraw)
+        self.ui.configure(self.summary, text=f"IP: {self.ip} | ⬆ {up:.1f} KB/s ⬇ {down:.1f} KB/s")
+        self.ui.configure(self.nics, text=_nic_table(net.get("per_nic", {})))
+
+    def _redraw(self):
+        h = self.collector.history
+        self.chart.update(h.series("net.tx_bps", self.hist_len), h.series("net.rx_bps", self.hist_len))
@@ -0,0 +1,62 @@
+import collections, threading, time
+import customtkinter as ctk
+
+LEVEL_COLORS = {"critical": "#ff5555", "warning": "#ffb86c", "info": "#8be9fd"}
+
+
+# In-app alert tray: one overlay in the window corner with a fixed pool of
+# rows, reused for every alert instead of opening a window per alert. It is a
+# delivery sink (send(batch) runs on the sink thread) and redraws through the
+# dispatcher; it hides itself after a quiet period.
+class NotificationTray(ctk.CTkFrame):
+    name = "tray"
+
+    def __init__(self, master, ui, rows=5, hide_ms=8000, **kwargs):
+        super().__init__(master, corner_radius=12, fg_color="#1f1f1f", border_width=1,
+                         border_color="#333333", **kwargs)
+        self.ui = ui
+        self.hide_ms = hide_ms
+        self.recent = collections.deque(maxlen=rows)
+        self.total = 0
+        self._lock = threading.Lock()
+        self._hide_id = None
+
+        header = ctk.CTkFrame(self, fg_color="transparent")
+        header.pack(fill="x", padx=10, pady=(8, 2))
+        self.count_label = ctk.CTkLabel(header, text="🔔 Alerts", font=("Segoe UI", 14, "bold"),
+                                        text_color="white")
+        self.count_label.pack(side="left")
+        ctk.CTkButton(header, text="✕", width=24, height=24, fg_color="transparent",
+                      command=self.hide).pack(side="right")
+
+        self.rows = [ctk.CTkLabel(self, text="", font=("Segoe UI", 13), anchor="w", justify="left",
+                                  wraplength=360) for _ in range(rows)]
+        for row in self.rows:
+            row.pack(fill="x", padx=12, pady=1)
+
+    def send(self, batch):
+        with self._lock:
+            self.recent.extend(batch)
+            self.total += len(batch)
+        self.ui.call(self, self._refresh)
+
+    def _refresh(self):
+        with self._lock:
+            recent, total = list(self.recent)[::-1], self.total
+        self.count_label.configure(text=f"🔔 Alerts ({total})")
+        for row, alert in zip(self.rows, recent + [None] * len(self.rows)):
+            if alert is None:
+                row.configure(text="")
+                continue
+            stamp = time.strftime("%H:%M:%S", time.localtime(alert["t"]))
+            row.configure(text=f"{stamp}  {alert['message']}",
+                          text_color=LEVEL_COLORS.get(alert["level"], "white"))
+        self.place(relx=1.0, rely=1.0, x=-16, y=-16, anchor="se")
+        self.lift()
+        if self._hide_id is not None:
+            self.after_cancel(self._hide_id)
+        self._hide_id = self.after(self.hide_ms, self.hide)
+
+    def hide(self):
+        self._hide_id = None
+        self.place_forget()
@@ -0,0 +1,40 @@
+import customtkinter as ctk
+
+
+# Base for the sidebar pages. Every snapshot is ingested (cheap history appends)
+# but only the visible page renders labels and charts; show_frame flips pages
+# active/inactive and a page coming back into view catches up with one render.
+class Page(ctk.CTkFrame):
+    def __init__(self, master, collector, ui, **kwargs):
+        super().__init__(master, **kwargs)
+        self.collector = collector
+        self.ui = ui
+        self.active = False
+        self._last_snap = None
+        self._sampled = {}
+
+    def on_snapshot(self, snap):
+        self._last_snap = snap
+        self.ingest(snap)
+        if self.active:
+            self.render(snap)
+
+    def set_active(self, active: bool):
+        was_active, self.active = self.active, active
+        if active and not was_active and self._last_snap is not None:
+            self.render(self._last_snap)
+
+    def fresh(self, snap, key):
+        # True once per new reading of `key`; snapshots also carry keys over
+        # unchanged (see "sampled" in collector.py)
+        t = (snap.get("sampled") or {}).get(key, snap.get("t"))
+        if t == self._sampled.get(key):
+            return False
+        self._sampled[key] = t
+        return True
+
+    def ingest(self, snap):
+        pass
+
+    def render(self, snap):
+        pass
@@ -0,0 +1,110 @@
+import customtkinter as ctk
+
+from ui.page import Page
+from utils.formatting import human_bytes
+
+VISIBLE_ROWS = 20
+
+# (sort key, header text, column width in characters)
+COLUMNS = (
+    (None, "PID", 8),
+    (None, "Name", 26),
+    ("cpu_percent", "CPU %", 8),
+    ("rss", "RSS", 11),
+    ("io_rate", "IO/s", 11),
+    ("threads", "Threads", 8),
+)
+
+
+def _format_row(p):
+    cells = (
+        str(p["pid"]),
+        p["name"][:25],
+        f"{p['cpu_percent']:.1f}",
+        human_bytes(p["rss"]),
+        human_bytes(p["io_rate"]),
+        str(p["threads"]),
+    )
+    return "".join(c.ljust(w) for c, (_, _, w) in zip(cells, COLUMNS))
+
+
+class ProcessPage(Page):
+    def __init__(self, master, collector, ui, **kwargs):
+        super().__init__(master, collector, ui, **kwargs)
+        self.configure(fg_color="transparent")
+
+        title = ctk.CTkLabel(self, text="📋 Processes", font=("Segoe UI", 22, "bold"),
+                             fg_color="transparent", text_color="white")
+        title.pack(pady=(10, 4))
+
+        self.summary = ctk.CTkLabel(self, text="Processes: --", font=("Segoe UI", 16),
+                                    fg_color="transparent", text_color="#E0E0E0")
+        self.summary.pack(pady=4)
+
+        # Header: sortable columns are buttons
+        header = ctk.CTkFrame(self, fg_color="transparent")
+        header.pack(fill="x", padx=10)
+        for key, text, width in COLUMNS:
+            if key is None:
+                w = ctk.CTkLabel(header, text=text, width=width * 8, anchor="w",
+                                 font=("Courier New", 13, "bold"), text_color="lightgray")
+            else:
+                w = ctk.CTkButton(header, text=text, width=width * 8, height=24, anchor="w",
+                                  font=("Courier New", 13, "bold"), fg_color="#1a1a1a",
+                                  command=lambda k=key: self._sort_by(k))
+            w.pack(side="left")
+
+        # Fixed pool of row labels; scrolling re-labels them instead of creating
+        # a widget per process
+        body = ctk.CTkFrame(self, fg_color=("gray10", "gray15"))
+        body.pack(fill="both", expand=True, padx=10, pady=8)
+        self.scrollbar = ctk.CTkScrollbar(body, command=self._on_scroll)
+        self.scrollbar.pack(side="right", fill="y")
+        rows = ctk.CTkFrame(body, fg_color="transparent")
+        rows.pack(side="left", fill="both", expand=True)
+        self.row_labels = []
+        for _ in range(VISIBLE_ROWS):
+            lbl = ctk.CTkLabel(rows, text="", anchor="w", font=("Courier New", 13),
+                               fg_color="transparent", text_color="white")
+            lbl.pack(fill="x", padx=8)
+            # Windows/macOS send <MouseWheel>; X11 sends buttons 4 (up) and 5 (down)
+            for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+                lbl.bind(seq, self._on_wheel)
+            self.row_labels.append(lbl)
+        self.offset = 0
+
+        self.collector.subscribe(self.on_snapshot)
+
+    def _sort_by(self, key):
+        if hasattr(self.collector, "processes"):  # a replay's order was fixed when it was recorded
+            self.collector.processes.sort_key = key
+        self.offset = 0
+
+    def _on_scroll(self, *args):
+        # CTkScrollbar sends ("moveto", fraction) or ("scroll", n, "units")
+        total = len(self._last_snap["processes"]["top"]) if self._last_snap else 0
+        if args[0] == "moveto":
+            self.offset = int(float(args[1]) * total)
+        elif args[0] == "scroll":
+            self.offset += int(args[1])
+        self.offset = max(0, min(self.offset, max(0, total - VISIBLE_ROWS)))
+        if self._last_snap is not None:
+            self.render(self._last_snap)
+
+    def _on_wheel(self, event):
+        up = event.num == 4 if event.num in (4, 5) else event.delta > 0
+        self._on_scroll("scroll", -1 if up else 1, "units")
+
+    def render(self, snap):
+        procs = snap["processes"]
+        top = procs["top"]
+        self.ui.configure(self.summary, text=f"Processes: {procs['count']} | sorted by {procs['sort']}")
+
+        visible = top[self.offset:self.offset + VISIBLE_ROWS]
+        for i, lbl in enumerate(self.row_labels):
+            self.ui.configure(lbl, text=_format_row(visible[i]) if i < len(visible) else "")
+
+        if top:
+            first = self.offset / len(top)
+            last = min(1.0, (self.offset + VISIBLE_ROWS) / len(top))
+            self.ui.call(self.scrollbar, self.scrollbar.set, first, last)
@@ -25,6 +25,8 @@ class Sidebar(ctk.CTkFrame):
             ("Disk", "📀 Disk"),
             ("Network", "📶 Network"),
             ("GPU", "🎮 GPU"),
+            ("Processes", "📋 Processes"),
+            ("Diagnostics", "🩺 Diagnostics"),
         ]
 
         for key, label in items:
@@ -1,9 +1,11 @@
 import customtkinter as ctk
-import psutil, time, threading, datetime
+import time, datetime
 
 class TopBarFrame(ctk.CTkFrame):
-    def __init__(self, master, **kwargs):
+    def __init__(self, master, collector, ui, **kwargs):
         super().__init__(master, **kwargs)
+        self.collector = collector
+        self.ui = ui
         self.configure(fg_color="#1a1a1a")  # dark glass effect
 
         # Title
@@ -29,39 +31,36 @@ class TopBarFrame(ctk.CTkFrame):
         self.info_label.pack(side="right", padx=10)
 
         self.old_values = {"cpu": 0, "mem": 0}
-        threading.Thread(target=self._update_loop, daemon=True).start()
+        self.collector.subscribe(self.on_snapshot)
 
     def _flash_label(self, label: ctk.CTkLabel, color: str, ms: int = 300):
         orig = label.cget("text_color")
         label.configure(text_color=color)
         self.after(ms, lambda: label.configure(text_color=orig))
 
-    def _update_loop(self):
-        while True:
-            cpu = psutil.cpu_percent(interval=1)
-            mem = psutil.virtual_memory().percent
-            uptime = time.strftime("%H:%M:%S", time.gmtime(time.time() - psutil.boot_time()))
-            self.info_label.configure(text=f"🖥️ {cpu}% | 💾 {mem}% | ⏱️ {uptime}")
+    def on_snapshot(self, snap):
+        cpu = snap["cpu"]["percent"]
+        mem = snap["memory"]["percent"]
+        # system info is sampled slowly; derive uptime from this snapshot's time
+        uptime = time.strftime("%H:%M:%S", time.gmtime(max(0, snap["t"] - snap["system"]["boot_time"])))
+        self.ui.configure(self.info_label, text=f"🖥️ {cpu}% | 💾 {mem}% | ⏱️ {uptime}")
 
-            now = datetime.datetime.now().strftime("%H:%M:%S")
-            self.clock_label.configure(text=f"🕒 {now}")
+        now = datetime.datetime.now().strftime("%H:%M:%S")
+        self.ui.configure(self.clock_label, text=f"🕒 {now}")
 
-            try:
-                battery = psutil.sensors_battery()
-                if battery:
-                    percent = battery.percent
-                    plugged = " 🔌" if battery.power_plugged else ""
-                    self.battery_label.configure(text=f"🔋 {percent:.0f}%{plugged}")
-                    if percent < 20 and not battery.power_plugged:
-                        self._flash_label(self.battery_label, "red")
-                else:
-                    self.battery_label.configure(text="")
-            except Exception:
-                self.battery_label.configure(text="")
+        battery = snap["system"]["battery"]
+        if battery:
+            percent = battery["percent"]
+            plugged = " 🔌" if battery["plugged"] else ""
+            self.ui.configure(self.battery_label, text=f"🔋 {percent:.0f}%{plugged}")
+            if percent < 20 and not battery["plugged"]:
+                self.ui.call((self.battery_label, "flash"), self._flash_label, self.battery_label, "red")
+        else:
+            self.ui.configure(self.battery_label, text="")
 
-            # Flash on spikes
-            diffs = {"cpu": cpu - self.old_values["cpu"], "mem": mem - self.old_values["mem"]}
-            for k, d in diffs.items():
-                if abs(d) > 10:
-                    self._flash_label(self.info_label, "red" if d > 0 else "green")
-            self.old_values["cpu"], self.old_values["mem"] = cpu, mem
+        # Flash on spikes
+        diffs = {"cpu": cpu - self.old_values["cpu"], "mem": mem - self.old_values["mem"]}
+        for k, d in diffs.items():
+            if abs(d) > 10:
+                self.ui.call((self.info_label, "flash"), self._flash_label, self.info_label, "red" if d > 0 else "green")
+        self.old_values["cpu"], self.old_values["mem"] = cpu, mem